@@ -0,0 +1,8 @@
+"""Micro benchmarks of Kytos core hot paths.
+
+Each ``bench_*`` module has a ``run`` function returning the measured rates,
+in operations per second, indexed by benchmark name. Run a module directly
+to print its results, e.g. ``python -m benchmarks.bench_logs``, or run them
+all with ``python -m benchmarks`` (``make bench``) to compare the results
+with a saved baseline.
+"""
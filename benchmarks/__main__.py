@@ -0,0 +1,162 @@
+r"""Run the benchmarks and compare their results with a baseline.
+
+Examples of usage, also available as ``make bench`` and
+``make bench-baseline``:
+
+.. code-block:: shell
+
+    # Save the results of the current branch as the baseline
+    python3 -m benchmarks --output .benchmarks/baseline.json
+    # Compare the results of a change with the baseline
+    python3 -m benchmarks --output .benchmarks/results.json \
+        --baseline .benchmarks/baseline.json --threshold 0.1
+
+Results are saved as JSON with the rates of each benchmark, in operations
+per second, indexed by ``<module>.<benchmark>``. The exit status is 1 if any
+rate is lower than the baseline by more than the threshold. Baselines are
+only comparable on the same machine and Python version.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import import_module
+
+#: tuple: Benchmark modules run by default, taking a few seconds each.
+MODULES = ('bench_buffers', 'bench_dispatch', 'bench_events',
+           'bench_framing', 'bench_ingress', 'bench_logs',
+           'bench_topology')
+#: tuple: Benchmark modules that start processes, run with ``--all``.
+PROCESS_MODULES = ('bench_loops', 'bench_process_pool', 'bench_workers')
+
+
+def run_modules(modules):
+    """Run the benchmark modules and return their results.
+
+    Args:
+        modules (iterable): Names of the ``benchmarks`` modules to run.
+
+    Returns:
+        dict: Rates indexed by ``<module>.<benchmark>``.
+
+    """
+    results = {}
+    for module_name in modules:
+        module = import_module(f'benchmarks.{module_name}')
+        started_at = time.perf_counter()
+        for bench_name, rate in module.run().items():
+            results[f'{module_name}.{bench_name}'] = rate
+        print(f'{module_name} ({time.perf_counter() - started_at:.1f}s)',
+              file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compare rates with the baseline ones.
+
+    Args:
+        results (dict): Current rates indexed by benchmark name.
+        baseline (dict): Baseline rates indexed by benchmark name.
+        threshold (float): Relative slowdown considered a regression, e.g.
+            0.1 for 10% less operations per second.
+
+    Returns:
+        list: Tuples of benchmark name, baseline rate, current rate, change
+        relative to the baseline and whether it is a regression. Rates and
+        changes missing in one of the runs are None.
+
+    """
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        current, previous = results.get(name), baseline.get(name)
+        if current is None or not previous:
+            rows.append((name, previous, current, None, False))
+            continue
+        change = current / previous - 1
+        rows.append((name, previous, current, change, change < -threshold))
+    return rows
+
+
+def _format_rate(rate):
+    """Return a rate as text, or a dash if it is missing."""
+    return '-' if rate is None else f'{rate:,.0f}'
+
+
+def print_comparison(rows):
+    """Print the comparison table."""
+    print(f'{"benchmark":<40} {"baseline":>14} {"current":>14} change')
+    for name, previous, current, change, regression in rows:
+        change = '' if change is None else f'{change:+7.1%}'
+        mark = '  REGRESSION' if regression else ''
+        print(f'{name:<40} {_format_rate(previous):>14} '
+              f'{_format_rate(current):>14} {change}{mark}')
+
+
+def get_environment():
+    """Return the environment the results depend on."""
+    return {'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count()}
+
+
+def main(argv=None):
+    """Run the benchmarks, save the results and compare with the baseline.
+
+    Returns:
+        int: 1 if there is any regression, else 0.
+
+    """
+    parser = argparse.ArgumentParser(prog='python3 -m benchmarks',
+                                     description=__doc__.split('\n')[0])
+    parser.add_argument('modules', nargs='*',
+                        help=f'modules to run (default: {" ".join(MODULES)})')
+    parser.add_argument('--all', action='store_true',
+                        help='also run ' + ' and '.join(PROCESS_MODULES))
+    parser.add_argument('--output', help='JSON file to save the results')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    # KytosConfig, used by the core modules, parses the command line too
+    del sys.argv[1:]
+    modules = args.modules or MODULES + (PROCESS_MODULES if args.all else ())
+    baseline = None
+    if args.baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+        else:
+            print(f'Baseline {args.baseline} not found; run '
+                  '"make bench-baseline" to create it', file=sys.stderr)
+
+    environment = get_environment()
+    results = run_modules(modules)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as output_file:
+            json.dump({'created_at': datetime.now(timezone.utc).isoformat(),
+                       'environment': environment, 'results': results},
+                      output_file, indent=2, sort_keys=True)
+
+    if baseline is None:
+        print_comparison(compare(results, {}, args.threshold))
+        return 0
+    if baseline.get('environment') != environment:
+        print(f'Warning: baseline environment {baseline.get("environment")} '
+              f'differs from {environment}', file=sys.stderr)
+    # Only compare the modules that were run
+    previous = {name: rate for name, rate in baseline['results'].items()
+                if name.split('.')[0] in modules}
+    rows = compare(results, previous, args.threshold)
+    print_comparison(rows)
+    return int(any(row[-1] for row in rows))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
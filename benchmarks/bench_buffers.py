@@ -0,0 +1,60 @@
+"""Measure how fast events go through a KytosEventBuffer."""
+import asyncio
+import time
+
+from kytos.core.buffers import KytosEventBuffer
+from kytos.core.events import KytosEvent
+
+
+def _put_get(buffer, events):
+    """Put and get ``events`` with the methods used by threads."""
+    for event in events:
+        buffer.put(event)
+    for _ in events:
+        buffer.get()
+
+
+async def _aput_aget(buffer, events):
+    """Put and get ``events`` with the methods used by the event loop."""
+    for event in events:
+        await buffer.aput(event)
+    for _ in events:
+        await buffer.aget()
+
+
+def run(count=5000, repeat=3):
+    """Return events put and got per second.
+
+    Args:
+        count (int): Events put and got in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+
+    Returns:
+        dict: Events per second with the sync methods, used by the NApp
+        threads, and with the async ones, used by the event loop.
+
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        buffer = KytosEventBuffer('bench', loop=loop)
+        events = [KytosEvent('kytos/core.openflow.raw.in', {'new_data': b''})
+                  for _ in range(count)]
+        sync_best, async_best = float('inf'), float('inf')
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            _put_get(buffer, events)
+            sync_best = min(sync_best, time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            loop.run_until_complete(_aput_aget(buffer, events))
+            async_best = min(async_best, time.perf_counter() - started_at)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return {'put_get': count / sync_best, 'aput_aget': count / async_best}
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} events/s')
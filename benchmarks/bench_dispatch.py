@@ -0,0 +1,91 @@
+"""Measure how fast events are dispatched to their listeners."""
+import asyncio
+import timeit
+
+from kytos.core.events import EventListeners, KytosEvent
+from kytos.lib.helpers import get_controller_mock
+
+#: list: Patterns of the listeners of a typical set of NApps.
+PATTERNS = ['kytos/core.connection.new', 'kytos/core.openflow.raw.in',
+            'kytos/core.shutdown', 'kytos/core.shutdown.kytos/of_core',
+            'kytos/of_core.v0x0[14].messages.in.ofpt_features_reply',
+            'kytos/of_core.v0x04.messages.in.ofpt_packet_in',
+            'kytos/of_core.v0x0[14].messages.in.ofpt_echo_request',
+            'kytos/of_core.handshake.completed', 'kytos/of_core.switch.*',
+            'kytos/of_lldp.messages.in.ofpt_packet_in',
+            'kytos/topology.*', 'kytos/flow_manager.flows.(installed|removed)',
+            'kytos/mef_eline.*', '.*.switch.(new|reconnected)',
+            '.*.connection.lost', 'kytos/core.openflow.connection.error']
+
+#: list: Names of a typical event mix, mostly raw data and PacketIns.
+EVENT_MIX = (['kytos/core.openflow.raw.in'] * 8 +
+             ['kytos/of_core.v0x04.messages.in.ofpt_packet_in'] * 6 +
+             ['kytos/of_core.v0x04.messages.in.ofpt_echo_request',
+              'kytos/of_core.v0x04.messages.in.ofpt_port_status',
+              'kytos/of_core.switch.port.modified',
+              'kytos/topology.link_up'])
+
+
+def _match_all(events_listeners, name):
+    """Return the matching listeners without any cache, for comparison."""
+    return tuple(listeners for pattern, listeners in events_listeners.items()
+                 if EventListeners.match(pattern, name))
+
+
+def _listener(event):
+    """Do nothing, to measure the dispatch alone."""
+
+
+def _get_controller():
+    """Return a controller whose NApps listen to :data:`PATTERNS`."""
+    controller = get_controller_mock(asyncio.new_event_loop())
+    for pattern in PATTERNS:
+        controller.events_listeners.setdefault(pattern, []).append(_listener)
+    return controller
+
+
+def _notify_mix(controller, events):
+    """Send each event of the mix to its listeners."""
+    for event in events:
+        controller.notify_listeners(event)
+
+
+def run(count=100000, repeat=3):
+    """Return event names resolved to their listeners per second.
+
+    Args:
+        count (int): Names resolved in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+
+    Returns:
+        dict: Names per second with the cached routes and matching every
+        pattern, and events of :data:`EVENT_MIX` per second sent to their
+        listeners by the controller.
+
+    """
+    events_listeners = EventListeners(
+        (pattern, [object()]) for pattern in PATTERNS)
+    name = 'kytos/core.openflow.raw.in'
+    # Matching every pattern is about 100 times slower
+    benchmarks = {
+        'cached_routes': (lambda: events_listeners.get_listeners(name),
+                          count),
+        'regex_per_event': (lambda: _match_all(events_listeners, name),
+                            max(1, count // 10))}
+    results = {}
+    for bench_name, (function, number) in benchmarks.items():
+        best = min(timeit.repeat(function, number=number, repeat=repeat))
+        results[bench_name] = number / best
+
+    controller = _get_controller()
+    events = [KytosEvent(name) for name in EVENT_MIX]
+    number = max(1, count // len(events))
+    best = min(timeit.repeat(lambda: _notify_mix(controller, events),
+                             number=number, repeat=repeat))
+    results['notify_listeners_mix'] = number * len(events) / best
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} per second')
@@ -0,0 +1,33 @@
+"""Measure the cost of creating the events of received TCP segments."""
+import timeit
+
+from kytos.core.events import KytosEvent
+
+
+def run(count=100000, repeat=3):
+    """Return KytosEvent objects created per second.
+
+    Args:
+        count (int): Events created in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+
+    Returns:
+        dict: Events per second with content, as created for each TCP
+        segment, and without content.
+
+    """
+    content = {'source': None, 'new_data': b'\x04\x0a\x00\x08'}
+    name = 'kytos/core.openflow.raw.in'
+    benchmarks = {
+        'event_with_content': lambda: KytosEvent(name, content),
+        'event_without_content': lambda: KytosEvent(name)}
+    results = {}
+    for bench_name, function in benchmarks.items():
+        best = min(timeit.repeat(function, number=count, repeat=repeat))
+        results[bench_name] = count / best
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} events/s')
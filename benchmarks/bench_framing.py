@@ -0,0 +1,76 @@
+"""Measure TCP segments handled by ``KytosServerProtocol.data_received``.
+
+Each segment carries several OpenFlow messages, as sent by a switch under
+load, and goes through the protocol to the raw buffer, from where it is
+removed as the raw event handler does.
+"""
+import asyncio
+import struct
+import time
+from types import SimpleNamespace
+
+from kytos.core.atcp_server import KytosServerProtocol
+from kytos.core.buffers import KytosBuffers
+from kytos.core.connection import Connection
+
+#: bytes: OpenFlow 1.3 PacketIn with a 60-byte frame.
+PACKET_IN = (struct.pack('!BBHIIHBBQHHII6x', 4, 10, 102, 0, 0xffffffff, 60,
+                         0, 0, 0, 1, 12, 0x80000004, 1) + bytes(60))
+
+
+class _Protocol(KytosServerProtocol):
+    """Protocol of a server whose controller only has buffers."""
+
+    server = None
+
+
+async def _receive(protocol, buffer, segment, count):
+    """Receive ``count`` segments and remove their events from ``buffer``."""
+    for _ in range(count):
+        protocol.data_received(segment)
+    for _ in range(count):
+        await buffer.aget()
+
+
+def run(count=5000, repeat=3, messages=8):
+    """Return segments handled per second.
+
+    Args:
+        count (int): Segments received in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+        messages (int): OpenFlow messages in each segment.
+
+    Returns:
+        dict: Segments per second, from ``data_received`` to the raw buffer.
+
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        buffers = KytosBuffers(loop=loop)
+        _Protocol.server = SimpleNamespace(
+            controller=SimpleNamespace(buffers=buffers,
+                                       has_listeners=lambda name: True),
+            capture=None, flow_control=None)
+        protocol = _Protocol()
+        protocol.connection = Connection('127.0.0.1', 40000, None)
+        protocol.connection.protocol.name = 'openflow'
+        segment = PACKET_IN * messages
+        best = min(_measure(loop, protocol, buffers.raw, segment, count)
+                   for _ in range(repeat))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return {'data_received': count / best}
+
+
+def _measure(loop, protocol, buffer, segment, count):
+    """Return the seconds taken by :func:`_receive`."""
+    started_at = time.perf_counter()
+    loop.run_until_complete(_receive(protocol, buffer, segment, count))
+    return time.perf_counter() - started_at
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} segments/s')
@@ -0,0 +1,120 @@
+"""Measure the cost of moving received segments into the raw buffer.
+
+Segments of several connections, read in the same loop iteration, go
+through ``KytosServerProtocol.data_received``, which adds their events to
+the raw buffer with ``put_nowait``, and through the same protocol adding
+them with a task running ``aput`` per segment, as it used to. The tasks
+created and the CPU time per MB received are compared, and the events are
+removed from the buffer as the raw event handler does.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks.bench_framing import PACKET_IN
+from kytos.core.atcp_server import KytosServerProtocol
+from kytos.core.buffers import KytosBuffers
+from kytos.core.connection import Connection
+
+
+class _Protocol(KytosServerProtocol):
+    """Protocol of a server whose controller only has buffers."""
+
+    server = None
+
+
+async def _receive(protocols, buffer, segment, count):
+    """Receive ``count`` segments and remove their events from ``buffer``."""
+    for _ in range(count // len(protocols)):
+        for protocol in protocols:
+            protocol.data_received(segment)
+        # Let the loop run between reads, as it does between selects
+        await asyncio.sleep(0)
+    while buffer.qsize():
+        await buffer.aget()
+
+
+def measure(with_tasks, count=5000, connections=10, messages=8):
+    """Return the tasks and CPU seconds taken to receive ``count`` segments.
+
+    Args:
+        with_tasks (bool): Whether a task runs ``aput`` for each segment
+            instead of the event being added with ``put_nowait``.
+        count (int): Segments received.
+        connections (int): Connections read in each loop iteration.
+        messages (int): OpenFlow messages in each segment.
+
+    Returns:
+        dict: Megabytes received, tasks created and CPU seconds.
+
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    tasks = 0
+
+    def task_factory(task_loop, coro):
+        nonlocal tasks
+        tasks += 1
+        return asyncio.Task(coro, loop=task_loop)
+
+    loop.set_task_factory(task_factory)
+    try:
+        buffers = KytosBuffers(loop=loop)
+        if with_tasks:
+            aput = buffers.raw.aput
+            buffers.raw.put_nowait = lambda event: loop.create_task(
+                aput(event))
+        _Protocol.server = SimpleNamespace(
+            controller=SimpleNamespace(buffers=buffers,
+                                       has_listeners=lambda name: True),
+            capture=None, flow_control=None)
+        protocols = []
+        for index in range(connections):
+            protocol = _Protocol()
+            protocol.connection = Connection('127.0.0.1', 40000 + index,
+                                             None)
+            protocol.connection.protocol.name = 'openflow'
+            protocols.append(protocol)
+        segment = PACKET_IN * messages
+        main = loop.create_task(_receive(protocols, buffers.raw, segment,
+                                         count))
+        tasks = 0
+        started_at = time.process_time()
+        loop.run_until_complete(main)
+        cpu_seconds = time.process_time() - started_at
+        # Let janus finish notifying the queue waiters
+        loop.run_until_complete(asyncio.sleep(0.01))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return {'megabytes': count * len(segment) / 1e6, 'tasks': tasks,
+            'segments': count, 'cpu_seconds': cpu_seconds}
+
+
+def run(count=5000, repeat=3):
+    """Return megabytes received per CPU second by each ingress path.
+
+    Args:
+        count (int): Segments received in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+
+    Returns:
+        dict: Megabytes per CPU second adding the events directly and with
+        a task per segment.
+
+    """
+    results = {}
+    for bench_name, with_tasks in (('direct', False), ('task', True)):
+        best = min((measure(with_tasks, count) for _ in range(repeat)),
+                   key=lambda result: result['cpu_seconds'])
+        results[bench_name] = best['megabytes'] / best['cpu_seconds']
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, with_tasks in (('direct', False), ('task', True)):
+        result = measure(with_tasks)
+        print(f'{bench_name:<8} '
+              f'{result["tasks"] / result["segments"]:>6.2f} tasks/segment '
+              f'{result["cpu_seconds"] * 1000 / result["megabytes"]:>8.1f} '
+              f'CPU ms/MB')
@@ -0,0 +1,60 @@
+"""Measure the cost of NApp log calls when their level is disabled."""
+import logging
+import timeit
+
+from kytos.core.logs import NAppLog
+
+#: Source of a NApp method that logs at debug level ``depth`` frames below
+#: the NApp frame, as when a NApp logs from a helper called by a listener.
+NAPP_CODE = '''
+def nested(depth, log):
+    if depth:
+        return nested(depth - 1, log)
+    return log.debug("packet %s", None)
+
+def handler(count, depth, log):
+    for _ in range(count):
+        nested(depth, log)
+'''
+
+
+def _get_napp_handler(filename='/var/lib/kytos/napps/kytos/bench/main.py'):
+    """Return a function compiled as if it was in a NApp source file."""
+    namespace = {}
+    # pylint: disable=exec-used
+    exec(compile(NAPP_CODE, filename, 'exec'), namespace)
+    return namespace['handler']
+
+
+def run(count=100000, repeat=3, depth=10):
+    """Return log calls per second at DEBUG-disabled.
+
+    Args:
+        count (int): Log calls in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+        depth (int): Frames between the NApp handler and the log call.
+
+    Returns:
+        dict: Calls per second of ``NAppLog`` and of a plain ``Logger``.
+
+    """
+    handler = _get_napp_handler()
+    napps_logger = logging.getLogger('kytos.napps')
+    level = napps_logger.level
+    napps_logger.setLevel(logging.INFO)
+    try:
+        results = {}
+        for name, log in (('napplog_debug_disabled', NAppLog()),
+                          ('logger_debug_disabled', napps_logger)):
+            best = min(timeit.repeat(lambda log=log: handler(count, depth,
+                                                             log),
+                                     number=1, repeat=repeat))
+            results[name] = count / best
+    finally:
+        napps_logger.setLevel(level)
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} calls/s')
@@ -0,0 +1,133 @@
+"""Compare the event loops with switches emulated by the switch emulator.
+
+For each available loop, a server process runs a
+:class:`~kytos.core.atcp_server.KytosServer` and removes the events from the
+raw buffer, answering new connections with the OpenFlow hello and features
+request, as of_core does. The emulated switches, in this process, first
+connect to it without sending anything else, to measure the connections
+handshaken per second, and then connect again and send PacketIns, to
+measure the raw events handled per second by the server.
+"""
+import asyncio
+import multiprocessing
+import socket
+import time
+from types import SimpleNamespace
+
+from kytos.core.atcp_server import KytosServer, KytosServerProtocol
+from kytos.core.buffers import KytosBuffers
+from kytos.core.event_loop import available_loops, get_loop_policy
+from kytos.lib import switch_emulator
+from kytos.lib.switch_emulator import SwitchEmulator
+
+#: bytes: Messages sent by the server to each new connection.
+HANDSHAKE = (switch_emulator.hello() +
+             switch_emulator.message(switch_emulator.OFPT_FEATURES_REQUEST,
+                                     1))
+
+
+async def _handle_raw_events(buffers, counter):
+    """Count the raw events and start the handshake of new connections."""
+    while True:
+        event = await buffers.raw.aget()
+        if event.name.endswith('.connection.new'):
+            event.source.send(HANDSHAKE)
+        else:
+            counter.value += 1
+
+
+def _serve(loop_name, port, counter, ready):
+    """Run a server with ``loop_name`` until the process is terminated."""
+    asyncio.set_event_loop_policy(get_loop_policy(loop_name)[1])
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    buffers = KytosBuffers(loop=loop)
+
+    class Protocol(KytosServerProtocol):
+        """Protocol of a server whose controller only has buffers."""
+
+    server = KytosServer(('127.0.0.1', port), Protocol,
+                         SimpleNamespace(buffers=buffers,
+                                         has_listeners=lambda name: True),
+                         'openflow', loop=loop)
+    server.serve_forever()
+    loop.create_task(_handle_raw_events(buffers, counter))
+    loop.call_soon(ready.release)
+    loop.run_forever()
+
+
+def _wait_listening(port, timeout=10.0):
+    """Wait for the server task to listen on ``port``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def _get_free_port():
+    """Return a TCP port that is not in use."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure(loop_name, switches=100, packet_in_rate=500, seconds=3.0):
+    """Return connections and raw events per second of the ``loop_name``."""
+    context = multiprocessing.get_context('fork')
+    port = _get_free_port()
+    counter = context.Value('Q', 0, lock=False)
+    ready = context.Semaphore(0)
+    server = context.Process(target=_serve,
+                             args=(loop_name, port, counter, ready))
+    server.start()
+    ready.acquire()
+    _wait_listening(port)
+    loop = asyncio.new_event_loop()
+    try:
+        emulator = SwitchEmulator(port=port, switches=switches,
+                                  echo_interval=seconds)
+        handshakes = loop.run_until_complete(
+            emulator.run(1.0))['handshake_latency']
+        first = counter.value
+        emulator = SwitchEmulator(port=port, switches=switches,
+                                  packet_in_rate=packet_in_rate,
+                                  echo_interval=seconds)
+        report = loop.run_until_complete(emulator.run(seconds))
+    finally:
+        loop.close()
+        server.terminate()
+        server.join()
+    return {f'{loop_name}_connections':
+            handshakes['count'] / (handshakes['max_ms'] / 1000),
+            f'{loop_name}_raw_events':
+            (counter.value - first) / report['seconds']}
+
+
+def run(switches=100, packet_in_rate=500, seconds=3.0):
+    """Return connections and raw events per second of each loop.
+
+    Args:
+        switches (int): Emulated switches.
+        packet_in_rate (float): PacketIns per second of each switch.
+        seconds (float): Duration of each measurement.
+
+    Returns:
+        dict: Connections handshaken per second, from the first connection
+        to the last features reply, and raw events handled per second,
+        indexed by loop name.
+
+    """
+    results = {}
+    for loop_name in available_loops():
+        results.update(measure(loop_name, switches, packet_in_rate, seconds))
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} per second')
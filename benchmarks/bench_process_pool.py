@@ -0,0 +1,64 @@
+"""Measure CPU-bound calls run inline and in the process pool."""
+import time
+
+from kytos.core.helpers import run_in_process
+from kytos.core.process_pool import PROCESS_POOL
+
+
+def shortest_paths(size):
+    """Return the Floyd-Warshall distances of a ring of ``size`` nodes."""
+    infinity = float('inf')
+    distances = [[0 if row == column else infinity for column in range(size)]
+                 for row in range(size)]
+    for node in range(size):
+        distances[node][(node + 1) % size] = 1
+        distances[(node + 1) % size][node] = 1
+    for middle in range(size):
+        middle_row = distances[middle]
+        for row in distances:
+            through = row[middle]
+            for column in range(size):
+                if through + middle_row[column] < row[column]:
+                    row[column] = through + middle_row[column]
+    return distances[0][size // 2]
+
+
+#: Same function, run in the process pool.
+shortest_paths_in_process = run_in_process()(shortest_paths)
+
+
+def run(calls=16, size=60, max_workers=0):
+    """Return CPU-bound calls per second.
+
+    Args:
+        calls (int): Calls in each measurement.
+        size (int): Nodes of the graph of each call.
+        max_workers (int): Pool processes; 0 for one per CPU.
+
+    Returns:
+        dict: Calls per second made inline and in the process pool.
+
+    """
+    PROCESS_POOL.configure(None, max_workers)
+    try:
+        # Start the processes before measuring
+        shortest_paths_in_process(2).result()
+
+        started_at = time.perf_counter()
+        for _ in range(calls):
+            shortest_paths(size)
+        inline = calls / (time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        futures = [shortest_paths_in_process(size) for _ in range(calls)]
+        for future in futures:
+            future.result()
+        pool = calls / (time.perf_counter() - started_at)
+    finally:
+        PROCESS_POOL.shutdown()
+    return {'inline': inline, 'process_pool': pool}
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.1f} calls/s')
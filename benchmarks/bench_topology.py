@@ -0,0 +1,87 @@
+"""Measure the topology objects used by NApps on every topology change."""
+import timeit
+
+from kytos.core.interface import TAG, Interface, TAGType
+from kytos.core.link import Link
+from kytos.core.switch import Switch
+
+
+def get_topology(switches=8, ports=16):
+    """Return switches in a ring, with ``ports`` interfaces each, and links.
+
+    Args:
+        switches (int): Number of switches.
+        ports (int): Interfaces of each switch; port 1 links to the next
+            switch and port 2 to the previous one.
+
+    Returns:
+        tuple: List of :class:`~kytos.core.switch.Switch` and list of
+        :class:`~kytos.core.link.Link`.
+
+    """
+    topology = []
+    for index in range(1, switches + 1):
+        switch = Switch(f'00:00:00:00:00:00:00:{index:02x}')
+        for port in range(1, ports + 1):
+            # 10 Gbps, as switches without features have no speed
+            switch.update_interface(Interface(f's{index}-eth{port}', port,
+                                              switch, speed=1250000000))
+        topology.append(switch)
+    links = [Link(switch.interfaces[1],
+                  topology[(index + 1) % switches].interfaces[2])
+             for index, switch in enumerate(topology)]
+    return topology, links
+
+
+def _link_ids(links):
+    """Return the id of each link."""
+    return [link.id for link in links]
+
+
+def _tags(interface, tags):
+    """Use and release VLAN tags, as when circuits are created."""
+    for tag in tags:
+        interface.is_tag_available(tag)
+        interface.use_tag(tag)
+    for tag in tags:
+        interface.make_tag_available(tag)
+    for _ in tags:
+        interface.make_tag_available(interface.get_next_available_tag())
+
+
+def run(count=200, repeat=3, switches=8, ports=16):
+    """Return topology operations per second.
+
+    Args:
+        count (int): Repetitions in each measurement.
+        repeat (int): Measurements taken; the fastest one is used.
+        switches (int): Switches of the ring topology.
+        ports (int): Interfaces of each switch.
+
+    Returns:
+        dict: ``Link.id`` and ``Switch.as_dict`` calls per second, VLAN tags
+        used and released per second and interfaces created per second.
+
+    """
+    topology, links = get_topology(switches, ports)
+    switch = topology[0]
+    interface = switch.interfaces[1]
+    tags = [TAG(TAGType.VLAN, vlan) for vlan in range(100, 120)]
+    # Each interface creates and each tag operation scans 4095 tags
+    benchmarks = {
+        'link_id': (lambda: _link_ids(links), 50 * count, len(links)),
+        'switch_as_dict': (switch.as_dict, 5 * count, 1),
+        'interface_tags': (lambda: _tags(interface, tags),
+                           max(1, count // 20), 2 * len(tags)),
+        'interface_init': (lambda: Interface('eth', 1, switch),
+                           max(1, count // 20), 1)}
+    results = {}
+    for bench_name, (function, number, operations) in benchmarks.items():
+        best = min(timeit.repeat(function, number=number, repeat=repeat))
+        results[bench_name] = number * operations / best
+    return results
+
+
+if __name__ == '__main__':
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} operations/s')
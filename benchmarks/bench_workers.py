@@ -0,0 +1,128 @@
+"""Measure OpenFlow messages per second handled by 1, 2, 4... processes.
+
+Each server process listens on the same port with ``SO_REUSEPORT``, as Kytos
+worker processes do, splits the received bytes into OpenFlow messages and
+creates and dispatches a :class:`~kytos.core.events.KytosEvent` for each one.
+Client processes send ``OFPT_ECHO_REQUEST`` messages as fast as they can.
+The rate should grow with the number of processes up to the number of cores
+not used by the clients. It measures the reading of the switches, which is
+spread among the Kytos processes; the NApps only run in the first one.
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+import struct
+import time
+
+from benchmarks.bench_dispatch import PATTERNS
+from kytos.core.events import EventListeners, KytosEvent
+
+#: bytes: OpenFlow 1.3 echo request header.
+ECHO_REQUEST = struct.pack('!BBHI', 4, 2, 8, 0)
+EVENT_NAME = 'kytos/core.openflow.raw.in'
+
+
+def _serve(port, counter, ready):
+    """Count the messages received until the process is terminated."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    events_listeners = EventListeners(
+        (pattern, []) for pattern in PATTERNS)
+
+    class Protocol(asyncio.Protocol):
+        """Split the received data into OpenFlow messages."""
+
+        rest = b''
+
+        def data_received(self, data):
+            data = self.rest + data
+            offset, count = 0, 0
+            while len(data) - offset >= 8:
+                length = struct.unpack_from('!H', data, offset + 2)[0]
+                if len(data) - offset < length:
+                    break
+                event = KytosEvent(EVENT_NAME,
+                                   {'new_data': data[offset:offset + length]})
+                for listeners in events_listeners.get_listeners(event.name):
+                    for listener in listeners:
+                        listener(event)
+                offset += length
+                count += 1
+            self.rest = data[offset:]
+            counter.value += count
+
+    server = loop.run_until_complete(
+        loop.create_server(Protocol, '127.0.0.1', port, reuse_port=True))
+    ready.release()
+    try:
+        loop.run_forever()
+    finally:
+        server.close()
+
+
+def _send(port):
+    """Send echo requests until the process is terminated."""
+    batch = ECHO_REQUEST * 4096
+    with socket.create_connection(('127.0.0.1', port)) as client:
+        while True:
+            client.sendall(batch)
+
+
+def _get_free_port():
+    """Return a TCP port that is not in use."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure(processes, clients=16, seconds=3.0):
+    """Return messages per second handled by ``processes`` servers."""
+    context = multiprocessing.get_context('fork')
+    port = _get_free_port()
+    counters = [context.Value('Q', 0, lock=False) for _ in range(processes)]
+    ready = context.Semaphore(0)
+    servers = [context.Process(target=_serve, args=(port, counter, ready))
+               for counter in counters]
+    for server in servers:
+        server.start()
+    for _ in servers:
+        ready.acquire()
+    senders = [context.Process(target=_send, args=(port,))
+               for _ in range(clients)]
+    for sender in senders:
+        sender.start()
+    try:
+        time.sleep(min(1.0, seconds))
+        started_at = time.perf_counter()
+        first = sum(counter.value for counter in counters)
+        time.sleep(seconds)
+        last = sum(counter.value for counter in counters)
+        return (last - first) / (time.perf_counter() - started_at)
+    finally:
+        for process in senders + servers:
+            process.terminate()
+        for process in senders + servers:
+            process.join()
+
+
+def run(processes=(1, 2, 4), clients=16, seconds=3.0):
+    """Return messages per second for each number of server processes.
+
+    Args:
+        processes (iterable): Numbers of server processes to measure.
+        clients (int): Client processes, each with one connection.
+        seconds (float): Duration of each measurement.
+
+    Returns:
+        dict: Messages per second indexed by ``processes_<n>``.
+
+    """
+    return {f'processes_{count}': measure(count, clients, seconds)
+            for count in processes}
+
+
+if __name__ == '__main__':
+    print(f'{os.cpu_count()} CPUs')
+    for bench_name, rate in run().items():
+        print(f'{bench_name:<28} {rate:>14,.0f} messages/s')
@@ -2,23 +2,23 @@
 import json
 import logging
 import os
-import shutil
 import sys
+import time
 import warnings
-import zipfile
-from datetime import datetime
-from glob import glob
 from http import HTTPStatus
 from urllib.error import HTTPError, URLError
-from urllib.request import urlopen, urlretrieve
+from urllib.request import urlopen
 
-from flask import Blueprint, Flask, jsonify, request, send_file
+from flask import (Blueprint, Flask, Response, g, has_request_context,
+                   jsonify, request)
 from flask_cors import CORS
 from flask_socketio import SocketIO, join_room, leave_room
 from werkzeug.exceptions import HTTPException
 
 from kytos.core.auth import authenticated
 from kytos.core.config import KytosConfig
+from kytos.core.metrics import REGISTRY
+from kytos.core.web_ui import UIAssets, WebUIUpdater
 
 
 class APIServer:
@@ -28,10 +28,20 @@ class APIServer:
     DEFAULT_METHODS = ('GET',)
     _NAPP_PREFIX = "/api/{napp.username}/{napp.name}/"
     _CORE_PREFIX = "/api/kytos/core/"
+    #: str: Cache-Control of NApps UI files. Browsers revalidate them with
+    #: their ETag once they expire.
+    UI_CACHE_CONTROL = 'public, max-age=86400'
+    #: str: Cache-Control of the web UI bundle files, whose names change
+    #: with their content.
+    DIST_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+    #: str: Cache-Control of the web UI index page, which must always be
+    #: revalidated because it points to the current UI bundle files.
+    INDEX_CACHE_CONTROL = 'no-cache'
 
     # pylint: disable=too-many-arguments
     def __init__(self, app_name, listen='0.0.0.0', port=8181,
-                 napps_manager=None, napps_dir=None):
+                 napps_manager=None, napps_dir=None, workdir=None,
+                 install_web_ui=True):
         """Start a Flask+SocketIO server.
 
         Require controller to get NApps dir and NAppsManager
@@ -41,6 +51,12 @@ class APIServer:
             listen (string): host name used by api server instance
             port (int): Port number used by api server instance
             controller(kytos.core.controller): A controller instance.
+            workdir (string): Kytos working directory, where downloaded web
+                UI bundles are cached and local bundles can be installed
+                from.
+            install_web_ui (bool): Whether to install the web UI in
+                background if it is not installed. Worker processes leave it
+                to the coordinator.
         """
         dirname = os.path.dirname(os.path.abspath(__file__))
         self.napps_manager = napps_manager
@@ -52,8 +68,9 @@ class APIServer:
         self.listen = listen
         self.port = port
 
+        # Files of the web UI bundle are served by static_dist
         self.app = Flask(app_name, root_path=self.flask_dir,
-                         static_folder="dist", static_url_path="/dist")
+                         static_folder=None)
         self.server = SocketIO(self.app, async_mode='threading')
         self._enable_websocket_rooms()
         # ENABLE CROSS ORIGIN RESOURCE SHARING
@@ -62,8 +79,21 @@ class APIServer:
         # Disable trailing slash
         self.app.url_map.strict_slashes = False
 
-        # Update web-ui if necessary
-        self.update_web_ui(force=False)
+        self._request_seconds = REGISTRY.histogram(
+            'kytos_rest_request_seconds', 'REST requests latency.',
+            ['method', 'rule', 'status'])
+        self.app.before_request(self._start_request_timer)
+        self.app.after_request(self._observe_request)
+
+        #: UIAssets: Manifest of the web UI and NApps UI files.
+        self.ui_assets = UIAssets(self.flask_dir, napps_dir)
+        cache_dir = os.path.join(workdir, 'web-ui-cache') if workdir else None
+        self.web_ui_updater = WebUIUpdater(self.flask_dir, cache_dir,
+                                           self.ui_assets.invalidate,
+                                           bundles_dir=workdir)
+        # Install web-ui in background if necessary
+        if install_web_ui and not os.path.exists(self.flask_dir):
+            self.web_ui_updater.start(force=False)
 
         @self.app.errorhandler(HTTPException)
         def handle_exception(exception):
@@ -117,6 +147,8 @@ class APIServer:
         self.register_core_endpoint('web/update/',
                                     self.update_web_ui,
                                     methods=['POST'])
+        self.register_core_endpoint('web/status/', self.web_ui_status)
+        self.register_core_endpoint('metrics/', self.metrics_endpoint)
 
         self.register_core_napp_services()
 
@@ -134,12 +166,35 @@ class APIServer:
         """Register routes to the admin-ui homepage."""
         self.app.add_url_rule('/', self.web_ui.__name__, self.web_ui)
         self.app.add_url_rule('/index.html', self.web_ui.__name__, self.web_ui)
+        self.app.add_url_rule('/dist/<path:filename>',
+                              self.static_dist.__name__, self.static_dist)
         self.app.add_url_rule('/ui/<username>/<napp_name>/<path:filename>',
                               self.static_web_ui.__name__, self.static_web_ui)
         self.app.add_url_rule('/ui/<path:section_name>',
                               self.get_ui_components.__name__,
                               self.get_ui_components)
 
+    @staticmethod
+    def _start_request_timer():
+        """Record when the request started being handled."""
+        g.request_started_at = time.perf_counter()
+
+    def _observe_request(self, response):
+        """Add the request latency to the REST requests histogram."""
+        started_at = g.get('request_started_at')
+        if started_at is not None:
+            rule = request.url_rule.rule if request.url_rule else 'unknown'
+            self._request_seconds.labels(
+                request.method, rule, response.status_code).observe(
+                    time.perf_counter() - started_at)
+        return response
+
+    @staticmethod
+    def metrics_endpoint():
+        """Return the core and NApps metrics in Prometheus text format."""
+        return Response(REGISTRY.to_prometheus(),
+                        mimetype='text/plain; version=0.0.4')
+
     @staticmethod
     def status_api():
         """Display kytos status using the route ``/kytos/status/``."""
@@ -168,12 +223,40 @@ class APIServer:
 
         return 'Server shutting down...', HTTPStatus.OK.value
 
+    @staticmethod
+    def _send_asset(asset, cache_control):
+        """Return a response with the best encoding of a UI asset.
+
+        The response is empty with status 304 if the client already has the
+        same representation, according to the ``If-None-Match`` header.
+        """
+        encodings = [encoding for encoding in ('br', 'gzip')
+                     if request.accept_encodings[encoding]]
+        content, encoding, etag = asset.get(encodings)
+        if request.if_none_match.contains(etag):
+            response = Response(status=HTTPStatus.NOT_MODIFIED.value)
+        else:
+            response = Response(content, mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
     def static_web_ui(self, username, napp_name, filename):
         """Serve static files from installed napps."""
-        path = f"{self.napps_dir}/{username}/{napp_name}/ui/{filename}"
-        if os.path.exists(path):
-            return send_file(path)
-        return "", HTTPStatus.NOT_FOUND.value
+        asset = self.ui_assets.get(f"{username}/{napp_name}/{filename}")
+        if asset is None:
+            return "", HTTPStatus.NOT_FOUND.value
+        return self._send_asset(asset, self.UI_CACHE_CONTROL)
+
+    def static_dist(self, filename):
+        """Serve the files of the web UI bundle."""
+        asset = self.ui_assets.get(f"dist/{filename}")
+        if asset is None:
+            return "", HTTPStatus.NOT_FOUND.value
+        return self._send_asset(asset, self.DIST_CACHE_CONTROL)
 
     def get_ui_components(self, section_name):
         """Return all napps ui components from an specific section.
@@ -188,72 +271,55 @@ class APIServer:
             str: Json with a list of all components found.
 
         """
-        section_name = '*' if section_name == "all" else section_name
-        path = f"{self.napps_dir}/*/*/ui/{section_name}/*.kytos"
-        components = []
-        for name in glob(path):
-            dirs_name = name.split('/')
-            dirs_name.remove('ui')
-
-            component_name = '-'.join(dirs_name[-4:]).replace('.kytos', '')
-            url = f'ui/{"/".join(dirs_name[-4:])}'
-            component = {'name': component_name, 'url': url}
-            components.append(component)
-        return jsonify(components)
+        return jsonify(self.ui_assets.get_components(section_name))
 
     def web_ui(self):
         """Serve the index.html page for the admin-ui."""
-        index_path = f"{self.flask_dir}/index.html"
-        if os.path.exists(index_path):
-            return send_file(index_path)
-        return f"File '{index_path}' not found.", HTTPStatus.NOT_FOUND.value
+        asset = self.ui_assets.get('index.html')
+        if asset is None:
+            index_path = f"{self.flask_dir}/index.html"
+            return (f"File '{index_path}' not found.",
+                    HTTPStatus.NOT_FOUND.value)
+        return self._send_asset(asset, self.INDEX_CACHE_CONTROL)
+
+    def update_web_ui(self, version='latest', force=True, bundle=None):
+        """Start updating the static files for the Web UI in background.
+
+        Download the files of a release from the UI github repository, or
+        install them from a local bundle, and update them in the ui folder.
+        The update runs in a background thread and its progress can be
+        checked in ``/api/kytos/core/web/status/``.
+
+        When called through the REST API, the path of a local bundle in the
+        Kytos working directory and its SHA-256 checksum can be given in the
+        JSON body as ``{"bundle": "/path/to/latest.zip", "sha256": "..."}``.
 
-    def update_web_ui(self, version='latest', force=True):
-        """Update the static files for the Web UI.
+        Args:
+            version (str): UI release to be installed.
+            force (bool): Whether to replace an already installed UI.
+            bundle (str): Path of a local bundle to be installed.
+
+        Returns:
+            tuple: JSON with the update status and the HTTP status code.
 
-        Download the latest files from the UI github repository and update them
-        in the ui folder.
-        The repository link is currently hardcoded here.
         """
-        if version == 'latest':
-            try:
-                url = 'https://api.github.com/repos/kytos/ui/releases/latest'
-                response = urlopen(url)
-                data = response.readlines()[0]
-                version = json.loads(data)['tag_name']
-            except URLError:
-                version = '1.1.1'
-
-        repository = "https://github.com/kytos/ui"
-        uri = repository + f"/releases/download/{version}/latest.zip"
-
-        if not os.path.exists(self.flask_dir) or force:
-            # download from github
-            try:
-                package = urlretrieve(uri)[0]
-            except HTTPError:
-                return f"Uri not found {uri}."
-            except URLError:
-                self.log.warning("Error accessing URL %s.", uri)
-                return f"Error accessing URL {uri}."
-
-            # test downloaded zip file
-            zip_ref = zipfile.ZipFile(package, 'r')
-
-            if zip_ref.testzip() is not None:
-                return f'Zip file from {uri} is corrupted.'
-
-            # backup the old web-ui files and create a new web-ui folder
-            if os.path.exists(self.flask_dir):
-                date = datetime.now().strftime("%Y%m%d%H%M%S")
-                shutil.move(self.flask_dir, f"{self.flask_dir}-{date}")
-                os.mkdir(self.flask_dir)
-
-            # unzip and extract files to web-ui/*
-            zip_ref.extractall(self.flask_dir)
-            zip_ref.close()
-
-        return "updated the web ui"
+        sha256 = None
+        if bundle is None and has_request_context():
+            body = request.get_json(silent=True) or {}
+            bundle, sha256 = body.get('bundle'), body.get('sha256')
+            if bundle:
+                error = self.web_ui_updater.check_bundle(bundle, sha256)
+                if error:
+                    return (jsonify({'message': error}),
+                            HTTPStatus.BAD_REQUEST.value)
+
+        if not self.web_ui_updater.start(version, force, bundle, sha256):
+            return self.web_ui_status()[0], HTTPStatus.CONFLICT.value
+        return self.web_ui_status()[0], HTTPStatus.ACCEPTED.value
+
+    def web_ui_status(self):
+        """Return the status of the last web UI update."""
+        return jsonify(self.web_ui_updater.status), HTTPStatus.OK.value
 
     # BEGIN decorator methods
 
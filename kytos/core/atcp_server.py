@@ -3,11 +3,38 @@
 import asyncio
 import errno
 import logging
+import sys
+import time
 
 from kytos.core.connection import Connection
 from kytos.core.events import KytosEvent
+from kytos.core.logs import LevelGuard
+from kytos.core.metrics import REGISTRY
 
 LOG = logging.getLogger(__name__)
+LOG_LEVELS = LevelGuard(LOG)
+
+CONNECTIONS = REGISTRY.gauge('kytos_connections',
+                             'Open southbound connections.', ['protocol'])
+CONNECTIONS_TOTAL = REGISTRY.counter('kytos_connections_total',
+                                     'Southbound connections accepted.',
+                                     ['protocol'])
+RECEIVED_BYTES = REGISTRY.counter('kytos_received_bytes_total',
+                                  'Bytes received from southbound '
+                                  'connections.', ['protocol'])
+UNHANDLED_BYTES = REGISTRY.counter('kytos_unhandled_received_bytes_total',
+                                   'Bytes received from southbound '
+                                   'connections while no NApp listened to '
+                                   'their raw events.', ['protocol'])
+CONNECTIONS_PAUSED = REGISTRY.gauge('kytos_connections_paused',
+                                    'Southbound connections not being read '
+                                    'because the raw buffer is full.')
+PAUSES = REGISTRY.counter('kytos_connection_pauses_total',
+                          'Times a southbound connection stopped being read '
+                          'because the raw buffer was full.')
+PAUSED_SECONDS = REGISTRY.counter('kytos_connection_paused_seconds_total',
+                                  'Seconds southbound connections were not '
+                                  'read because the raw buffer was full.')
 
 
 def exception_handler(loop, context):
@@ -23,6 +50,97 @@ def exception_handler(loop, context):
         loop.default_exception_handler(context)
 
 
+class FlowControl:
+    """Stop reading the noisiest connections while the raw buffer is full.
+
+    When the events waiting in the buffer reach the high watermark, the
+    connections that sent most of the data since the last check stop
+    being read, so that TCP pushes back on their switches. All of them are
+    read again when the events are below the low watermark.
+    """
+
+    #: float: Seconds between two checks of the low watermark while paused.
+    INTERVAL = 0.01
+
+    def __init__(self, buffer, high_watermark, low_watermark, loop=None):
+        """Create the flow control of a buffer.
+
+        Args:
+            buffer (:class:`~kytos.core.buffers.KytosEventBuffer`): Buffer
+                receiving the events of the data read.
+            high_watermark (int): Events waiting that pause the noisiest
+                connections.
+            low_watermark (int): Events waiting that resume all of them.
+        """
+        self.buffer = buffer
+        self.high_watermark = high_watermark
+        self.low_watermark = min(low_watermark, high_watermark)
+        self._loop = loop or asyncio.get_event_loop()
+        #: dict: Bytes received from each protocol since the last pause.
+        self._recent = {}
+        #: dict: Time each paused protocol was paused.
+        self._paused = {}
+        self._timer = None
+
+    def received(self, protocol, size):
+        """Account for data received by ``protocol``.
+
+        Args:
+            protocol (:class:`KytosServerProtocol`): Protocol that received
+                the data.
+            size (int): Bytes received, whose event is in the buffer.
+        """
+        self._recent[protocol] = self._recent.get(protocol, 0) + size
+        if self.buffer.qsize() >= self.high_watermark:
+            self._pause_noisiest()
+
+    def _pause_noisiest(self):
+        """Pause the connections that sent half of the recent data."""
+        recent, self._recent = self._recent, {}
+        remaining = sum(recent.values()) / 2
+        for protocol, size in sorted(recent.items(), key=lambda item: item[1],
+                                     reverse=True):
+            if remaining <= 0:
+                break
+            remaining -= size
+            if protocol not in self._paused:
+                protocol.pause_reading('buffer')
+                self._paused[protocol] = time.monotonic()
+                PAUSES.inc()
+                LOG.warning('Raw buffer full; pausing %s',
+                            protocol.connection)
+        CONNECTIONS_PAUSED.set(len(self._paused))
+        if self._paused and self._timer is None:
+            self._timer = self._loop.call_later(self.INTERVAL, self._check)
+
+    def _check(self):
+        """Resume the connections if the buffer is below the low mark."""
+        self._timer = None
+        if self.buffer.qsize() > self.low_watermark:
+            self._timer = self._loop.call_later(self.INTERVAL, self._check)
+            return
+        LOG.info('Raw buffer drained; resuming %s connections',
+                 len(self._paused))
+        for protocol in list(self._paused):
+            protocol.resume_reading('buffer')
+            self._resumed(protocol)
+
+    def _resumed(self, protocol):
+        """Account for the time ``protocol`` was paused."""
+        PAUSED_SECONDS.inc(time.monotonic() - self._paused.pop(protocol))
+        CONNECTIONS_PAUSED.set(len(self._paused))
+
+    def remove(self, protocol):
+        """Forget a protocol whose connection was lost."""
+        self._recent.pop(protocol, None)
+        if protocol in self._paused:
+            self._resumed(protocol)
+
+    def is_paused(self, protocol):
+        """Return whether ``protocol`` is not being read."""
+        return protocol in self._paused
+
+
 class KytosServer:
     """Abstraction of a TCP Server to listen to packages from the network.
 
@@ -34,7 +152,8 @@ class KytosServer:
 
     def __init__(self,  # pylint: disable=too-many-arguments
                  server_address, server_protocol, controller,
-                 protocol_name, loop=None):
+                 protocol_name, loop=None, reuse_port=False, capture=None,
+                 flow_control=None, rate_limits=None):
         """Create the object without starting the server.
 
         Args:
@@ -45,15 +164,30 @@ class KytosServer:
             controller (:class:`~kytos.core.controller.Controller`):
                 An instance of Kytos Controller class.
             protocol_name (str): Southbound protocol name that will be used
+            reuse_port (bool): Whether other processes may listen on the same
+                port, with ``SO_REUSEPORT``, e.g. Kytos worker processes.
+            capture (:class:`~kytos.core.capture.CaptureWriter`): Writer of
+                the received bytes, if they are captured.
+            flow_control (:class:`FlowControl`): Flow control of the raw
+                buffer, if any.
+            rate_limits (:class:`~kytos.core.rate_limit.RateLimits`): Rate
+                limits of each connection, if any.
         """
         self.server_address = server_address
         self.server_protocol = server_protocol
         self.controller = controller
         self.protocol_name = protocol_name
+        self.reuse_port = reuse_port
+        self.capture = capture
+        self.flow_control = flow_control
+        self.rate_limits = rate_limits
+        #: set: Protocols of the open connections.
+        self.protocols = set()
 
         # This will be an `asyncio.Server` instance after `serve_forever` is
         # called
         self._server = None
+        self._serve_task = None
 
         # Here we compose the received `server_protocol` class with a `server`
         # object pointing to this instance
@@ -66,17 +200,33 @@ class KytosServer:
         """Handle requests until an explicit shutdown() is called."""
         addr, port = self.server_address[0], self.server_address[1]
 
-        self._server = self.loop.create_server(self.server_protocol,
-                                               addr, port)
+        # reuse_port=None keeps the default of platforms without it
+        self._server = self.loop.create_server(
+            self.server_protocol, addr, port,
+            reuse_port=self.reuse_port or None)
 
         try:
             task = self.loop.create_task(self._server)
+            self._serve_task = task
             LOG.info("Kytos listening at %s:%s", addr, port)
         except Exception:
             LOG.error('Failed to start Kytos TCP Server at %s:%s', addr, port)
             task.close()
             raise
 
+    def stop_reading(self):
+        """Stop accepting connections and reading the open ones.
+
+        The connections stay open, so that the controller can still send
+        the messages queued before it stops.
+        """
+        task = self._serve_task
+        if task is not None and task.done() and not task.cancelled() \
+                and task.exception() is None:
+            task.result().close()
+        for protocol in list(self.protocols):
+            protocol.pause_reading('shutdown')
+
     def shutdown(self):
         """Call .close() on underlying TCP server, closing client sockets."""
         self._server.close()
@@ -106,6 +256,16 @@ class KytosServerProtocol(asyncio.Protocol):
         self.connection = None
         self.transport = None
         self._rest = b''
+        self._received_bytes = None
+        self._unhandled_bytes = None
+        self._raw_in_name = None
+        self._discarded = False
+        #: int: Raw events created from the received data.
+        self.raw_events = 0
+        self._capture_id = None
+        self._rate_limiter = None
+        #: set: Reasons the transport is not being read.
+        self._paused_by = set()
 
         # server attribute is set outside this class, in KytosServer.init()
         # Here we initialize it to None to avoid pylint warnings
@@ -130,7 +290,7 @@ class KytosServerProtocol(asyncio.Protocol):
 
         LOG.info("New connection from %s:%s", addr, port)
 
-        self.connection = Connection(addr, port, socket)
+        self.connection = Connection(addr, port, socket, transport=transport)
 
         # This allows someone to inherit from KytosServer and start a server
         # on another port to handle a different protocol.
@@ -142,12 +302,22 @@ class KytosServerProtocol(asyncio.Protocol):
         else:
             protocol_name = f'{server_port:04d}'
         self.connection.protocol.name = protocol_name
+        if self.server.capture is not None:
+            self._capture_id = self.server.capture.connection_made(
+                addr, port, server_port)
+        if self.server.rate_limits is not None:
+            self._rate_limiter = self.server.rate_limits.limiter()
+        self.server.protocols.add(self)
+        CONNECTIONS.labels(protocol_name).inc()
+        CONNECTIONS_TOTAL.labels(protocol_name).inc()
 
         event_name = f'kytos/core.{protocol_name}.connection.new'
+        if not self.server.controller.has_listeners(event_name):
+            return
         event = KytosEvent(name=event_name,
                            content={'source': self.connection})
 
-        self._loop.create_task(self.server.controller.buffers.raw.aput(event))
+        self.server.controller.buffers.raw.put_nowait(event)
 
     def data_received(self, data):
         """Handle each request and place its data in the raw event buffer.
@@ -158,19 +328,96 @@ class KytosServerProtocol(asyncio.Protocol):
         # max_size = 2**16
         # new_data = self.request.recv(max_size)
 
+        if self._received_bytes is None:
+            protocol_name = self.connection.protocol.name
+            self._received_bytes = RECEIVED_BYTES.labels(protocol_name)
+            self._unhandled_bytes = UNHANDLED_BYTES.labels(protocol_name)
+            # Built once per connection; interned to be the routing key of
+            # the event
+            self._raw_in_name = sys.intern(
+                f'kytos/core.{protocol_name}.raw.in')
+        self._received_bytes.inc(len(data))
+        if self._capture_id is not None:
+            self.server.capture.data(self._capture_id, data)
+        if self._rate_limiter is not None:
+            data = self._rate_limiter.filter(data)
+            self._rate_limited()
+            if not data:
+                return
+        # Events nobody listens to are not created
+        if not self.server.controller.has_listeners(self._raw_in_name):
+            self._discard(data)
+            return
         data = self._rest + data
 
-        LOG.debug("New data from %s:%s (%s bytes)",
-                  self.connection.address, self.connection.port, len(data))
+        if LOG_LEVELS.debug:
+            LOG.debug("New data from %s:%s (%s bytes)",
+                      self.connection.address, self.connection.port,
+                      len(data))
 
         # LOG.debug("New data from %s:%s (%s bytes): %s", self.addr, self.port,
         #           len(data), binascii.hexlify(data))
 
         content = {'source': self.connection, 'new_data': data}
-        event_name = f'kytos/core.{self.connection.protocol.name}.raw.in'
-        event = KytosEvent(name=event_name, content=content)
+        event = KytosEvent(name=self._raw_in_name, content=content)
+
+        self.server.controller.buffers.raw.put_nowait(event)
+        self.raw_events += 1
+        if self.server.flow_control is not None:
+            self.server.flow_control.received(self, len(data))
+
+    def _discard(self, data):
+        """Count the data nobody listens to, logging it once per connection.
 
-        self._loop.create_task(self.server.controller.buffers.raw.aput(event))
+        A NApp loaded later receives the data of this connection from then
+        on, possibly starting in the middle of a message.
+        """
+        if not self._discarded:
+            self._discarded = True
+            LOG.debug('No listeners of %s; discarding the data from %s:%s',
+                      self._raw_in_name, self.connection.address,
+                      self.connection.port)
+        self._unhandled_bytes.inc(len(data))
+
+    def pause_reading(self, reason):
+        """Stop reading the transport until ``reason`` is resumed.
+
+        Args:
+            reason (str): Why the connection is paused, e.g. ``buffer`` or
+                ``rate_limit``. It is read again when every reason resumes.
+        """
+        if not self._paused_by:
+            self.transport.pause_reading()
+        self._paused_by.add(reason)
+
+    def resume_reading(self, reason):
+        """Read the transport again if it was paused only by ``reason``."""
+        if reason not in self._paused_by:
+            return
+        self._paused_by.discard(reason)
+        if not self._paused_by and not self.transport.is_closing():
+            self.transport.resume_reading()
+
+    def _rate_limited(self):
+        """Pause the connection and report it if over its rate limit."""
+        limiter = self._rate_limiter
+        if limiter.delay and 'rate_limit' not in self._paused_by:
+            self.pause_reading('rate_limit')
+            self._loop.call_later(limiter.delay, self.resume_reading,
+                                  'rate_limit')
+        limited = limiter.pop_report()
+        if limited is None:
+            return
+        LOG.warning('Rate limit of %s:%s exceeded: %s messages by type',
+                    self.connection.address, self.connection.port, limited)
+        if not self.server.controller.has_listeners(
+                'kytos/core.connection.rate_limited'):
+            return
+        event = KytosEvent(name='kytos/core.connection.rate_limited',
+                           content={'source': self.connection,
+                                    'action': limiter.limits.action,
+                                    'limited': limited})
+        self.server.controller.buffers.app.put_nowait(event)
 
     def connection_lost(self, exc):
         """Close the connection socket and generate connection lost event.
@@ -183,12 +430,20 @@ class KytosServerProtocol(asyncio.Protocol):
                  self.connection.address, self.connection.port, reason)
 
         self.connection.close()
+        CONNECTIONS.labels(self.connection.protocol.name).dec()
+        if self._capture_id is not None:
+            self.server.capture.connection_lost(self._capture_id)
+        if self.server.flow_control is not None:
+            self.server.flow_control.remove(self)
+        self.server.protocols.discard(self)
 
         content = {'source': self.connection}
         if exc:
             content['exception'] = exc
         event_name = \
             f'kytos/core.{self.connection.protocol.name}.connection.lost'
+        if not self.server.controller.has_listeners(event_name):
+            return
         event = KytosEvent(name=event_name, content=content)
 
-        self._loop.create_task(self.server.controller.buffers.app.aput(event))
+        self.server.controller.buffers.app.put_nowait(event)
@@ -1,14 +1,31 @@
 """Kytos Buffer Classes, based on Python Queue."""
+import asyncio
 import logging
+from collections import deque
+from queue import Empty
 
 # from queue import Queue
 from janus import Queue
 
 from kytos.core.events import KytosEvent
+from kytos.core.logs import LevelGuard
+from kytos.core.metrics import REGISTRY
+from kytos.core.tracing import TRACER
 
 __all__ = ('KytosBuffers', )
 
 LOG = logging.getLogger(__name__)
+LOG_LEVELS = LevelGuard(LOG)
+
+EVENTS_IN = REGISTRY.counter('kytos_buffer_events_in_total',
+                             'Events added to each buffer.', ['buffer'])
+EVENTS_OUT = REGISTRY.counter('kytos_buffer_events_out_total',
+                              'Events removed from each buffer.', ['buffer'])
+EVENTS_REJECTED = REGISTRY.counter('kytos_buffer_events_rejected_total',
+                                   'Events rejected by each buffer after a '
+                                   'shutdown event.', ['buffer'])
+QUEUE_SIZE = REGISTRY.gauge('kytos_buffer_queue_size',
+                            'Events waiting in each buffer.', ['buffer'])
 
 
 class KytosEventBuffer:
@@ -26,6 +43,13 @@ class KytosEventBuffer:
         self._loop = loop
         self._queue = Queue(loop=self._loop)
         self._reject_new_events = False
+        #: deque: Events added by put_nowait, not yet in the queue.
+        self._pending = deque()
+        self._flush_task = None
+        self._events_in = EVENTS_IN.labels(name)
+        self._events_out = EVENTS_OUT.labels(name)
+        self._events_rejected = EVENTS_REJECTED.labels(name)
+        QUEUE_SIZE.labels(name).set_function(self.qsize)
 
     def put(self, event):
         """Insert an event in KytosEventBuffer if reject_new_events is False.
@@ -38,8 +62,14 @@ class KytosEventBuffer:
                 KytosEvent sent to queue.
         """
         if not self._reject_new_events:
+            if TRACER.enabled:
+                TRACER.enqueued(event, self.name)
             self._queue.sync_q.put(event)
-            LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
+            self._events_in.inc()
+            if LOG_LEVELS.debug:
+                LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
+        else:
+            self._events_rejected.inc()
 
         if event.name == "kytos/core.shutdown":
             LOG.info('[buffer: %s] Stop mode enabled. Rejecting new events.',
@@ -59,8 +89,14 @@ class KytosEventBuffer:
         # qsize = self._queue.async_q.qsize()
         # print('qsize before:', qsize)
         if not self._reject_new_events:
+            if TRACER.enabled:
+                TRACER.enqueued(event, self.name)
             await self._queue.async_q.put(event)
-            LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
+            self._events_in.inc()
+            if LOG_LEVELS.debug:
+                LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
+        else:
+            self._events_rejected.inc()
 
         # qsize = self._queue.async_q.qsize()
         # print('qsize after:', qsize)
@@ -70,6 +106,54 @@ class KytosEventBuffer:
                      self.name)
             self._reject_new_events = True
 
+    def put_nowait(self, event):
+        """Insert an event without blocking, from the event loop thread.
+
+        Unlike :meth:`aput`, no task is created for each event: the events
+        added during a loop iteration are moved to the queue together by a
+        single task, so protocols can add the event of each received
+        segment directly.
+
+        The event is always accepted, even if the buffer is :meth:`full`:
+        the pending events wait to be moved until the queue has room, so
+        callers must limit them themselves, as the server does with
+        :class:`~kytos.core.atcp_server.FlowControl`.
+
+        Args:
+            event (:class:`~kytos.core.events.KytosEvent`):
+                KytosEvent sent to queue.
+        """
+        if not self._reject_new_events:
+            if TRACER.enabled:
+                TRACER.enqueued(event, self.name)
+            self._pending.append(event)
+            if self._flush_task is None:
+                self._flush_task = asyncio.ensure_future(self._flush(),
+                                                         loop=self._loop)
+            self._events_in.inc()
+            if LOG_LEVELS.debug:
+                LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
+        else:
+            self._events_rejected.inc()
+
+        if event.name == "kytos/core.shutdown":
+            LOG.info('[buffer: %s] Stop mode enabled. Rejecting new events.',
+                     self.name)
+            self._reject_new_events = True
+
+    async def _flush(self):
+        """Move the events added by :meth:`put_nowait` to the queue."""
+        try:
+            while True:
+                try:
+                    event = self._pending.popleft()
+                except IndexError:
+                    # Also removed by get_nowait, e.g. at shutdown
+                    break
+                await self._queue.async_q.put(event)
+        finally:
+            self._flush_task = None
+
     def get(self):
         """Remove and return a event from top of queue.
 
@@ -79,8 +163,39 @@ class KytosEventBuffer:
 
         """
         event = self._queue.sync_q.get()
+        self._events_out.inc()
+        if TRACER.enabled:
+            TRACER.dequeued(event, self.name)
 
-        LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
+        if LOG_LEVELS.debug:
+            LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
+
+        return event
+
+    def get_nowait(self):
+        """Remove and return an event without blocking.
+
+        Events added by :meth:`put_nowait` and not yet moved to the queue
+        are returned after the queued ones.
+
+        Returns:
+            :class:`~kytos.core.events.KytosEvent`: Event removed from top
+            of queue, or None if there are no events.
+
+        """
+        try:
+            event = self._queue.sync_q.get_nowait()
+        except Empty:
+            try:
+                event = self._pending.popleft()
+            except IndexError:
+                return None
+        self._events_out.inc()
+        if TRACER.enabled:
+            TRACER.dequeued(event, self.name)
+
+        if LOG_LEVELS.debug:
+            LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
 
         return event
 
@@ -93,8 +208,12 @@ class KytosEventBuffer:
 
         """
         event = await self._queue.async_q.get()
+        self._events_out.inc()
+        if TRACER.enabled:
+            TRACER.dequeued(event, self.name)
 
-        LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
+        if LOG_LEVELS.debug:
+            LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
 
         return event
 
@@ -116,16 +235,31 @@ class KytosEventBuffer:
         self._queue.sync_q.join()
 
     def qsize(self):
-        """Return the size of KytosEventBuffer."""
-        return self._queue.sync_q.qsize()
+        """Return the size of KytosEventBuffer.
+
+        Events added by :meth:`put_nowait` and not yet moved to the queue
+        are included.
+        """
+        return self._queue.sync_q.qsize() + len(self._pending)
 
     def empty(self):
-        """Return True if KytosEventBuffer is empty."""
-        return self._queue.sync_q.empty()
+        """Return True if KytosEventBuffer is empty.
+
+        Events added by :meth:`put_nowait` and not yet moved to the queue
+        are included.
+        """
+        return self._queue.sync_q.empty() and not self._pending
 
     def full(self):
-        """Return True if KytosEventBuffer is full of KytosEvent."""
-        return self._queue.sync_q.full()
+        """Return True if KytosEventBuffer is full of KytosEvent.
+
+        Events added by :meth:`put_nowait` and not yet moved to the queue
+        are included.
+        """
+        if self._queue.sync_q.full():
+            return True
+        maxsize = self._queue.sync_q.maxsize
+        return 0 < maxsize <= self.qsize()
 
 
 class KytosBuffers:
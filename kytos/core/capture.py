@@ -0,0 +1,346 @@
+"""Capture and replay of the bytes received from the switches.
+
+With ``capture_file`` set in kytos.conf, or ``--capture-file``, every byte
+received by :class:`~kytos.core.atcp_server.KytosServerProtocol` is appended
+to that file, with the connections being opened and closed, so that a
+production session can be replayed later. Workers write to the file name
+followed by their index.
+
+The file starts with :data:`MAGIC` and is followed by records: a
+:data:`RECORD` header (kind, connection number, nanoseconds since the
+session start and payload length) and the payload. Each controller start
+appends a :data:`SESSION` record, so the file is only ever appended to.
+Each record is written to the file as soon as it is received, with a single
+unbuffered write, so a crash loses at most the record being written, which
+is ignored by the reader. It is read with
+``mmap``, without copying the payloads until they are replayed.
+
+With ``replay_file``, or ``--replay-file``, the controller feeds the
+captured bytes to new :class:`~kytos.core.atcp_server.KytosServerProtocol`
+instances after the NApps are loaded, at the original speed multiplied by
+``replay_speed``, or as fast as possible with a speed of 0. Replayed
+connections discard what the controller sends to them. The replay checks
+that every captured segment reached the listeners as an event and logs a
+report:
+
+.. code-block:: shell
+
+    kytosd -f --capture-file /tmp/incident.kcap
+    kytosd -f --replay-file /tmp/incident.kcap --replay-speed 0
+"""
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+from threading import Lock
+
+__all__ = ('CaptureReader', 'CaptureWriter', 'Replayer')
+
+LOG = logging.getLogger(__name__)
+
+#: bytes: Beginning of capture files, followed by the format version.
+MAGIC = b'KYTOSCAP'
+HEADER = struct.Struct('!8sH')
+VERSION = 1
+#: struct.Struct: Kind, connection, nanoseconds and payload length.
+RECORD = struct.Struct('!BIQI')
+#: struct.Struct: Peer port and server port of a connection record.
+CONNECTION = struct.Struct('!HH')
+
+#: int: Record kinds.
+SESSION = 0
+CONNECT = 1
+DATA = 2
+CLOSE = 3
+
+#: Record read from a capture file. ``data`` is a memoryview of the file.
+Record = namedtuple('Record', 'kind connection timestamp data')
+
+
+def _now_ns():
+    """Return monotonic nanoseconds."""
+    return int(time.monotonic() * 1e9)
+
+
+class CaptureWriter:
+    """Append the received bytes of each connection to a capture file."""
+
+    def __init__(self, filename):
+        """Open ``filename`` for appending and start a new session.
+
+        Args:
+            filename (str): Capture file, created if it does not exist.
+        """
+        self.filename = filename
+        # Unbuffered, so the records are not lost if the controller crashes
+        self._file = open(filename, 'ab', buffering=0)
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._lock = Lock()
+        self._connections = 0
+        self._started_at = _now_ns()
+        self._write(SESSION, 0, b'')
+
+    def _write(self, kind, connection, data):
+        """Append a record."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(RECORD.pack(kind, connection,
+                                         _now_ns() - self._started_at,
+                                         len(data)) + data)
+
+    def connection_made(self, address, port, server_port):
+        """Record a new connection and return its number.
+
+        Args:
+            address (str): Switch address.
+            port (int): Switch port.
+            server_port (int): Port the switch connected to.
+
+        Returns:
+            int: Connection number used by :meth:`data` and
+            :meth:`connection_lost`.
+
+        """
+        self._connections += 1
+        self._write(CONNECT, self._connections,
+                    CONNECTION.pack(port, server_port) + address.encode())
+        return self._connections
+
+    def data(self, connection, data):
+        """Record bytes received from a connection."""
+        self._write(DATA, connection, data)
+
+    def connection_lost(self, connection):
+        """Record the end of a connection."""
+        self._write(CLOSE, connection, b'')
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CaptureReader:
+    """Records of a capture file, read with ``mmap``."""
+
+    def __init__(self, filename):
+        """Map ``filename`` to memory.
+
+        Raises:
+            ValueError: If it is not a capture file.
+
+        """
+        self.filename = filename
+        with open(filename, 'rb') as capture_file:
+            if not os.fstat(capture_file.fileno()).st_size:
+                raise ValueError(f'{filename} is empty')
+            self._mmap = mmap.mmap(capture_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{filename} is not a capture file')
+
+    def __iter__(self):
+        """Yield the records of all sessions.
+
+        The timestamps of each session continue from the last one of the
+        previous session, so sessions are replayed one after the other.
+        Connection numbers are unique among sessions.
+        """
+        view = memoryview(self._mmap)
+        offset, size = HEADER.size, len(self._mmap)
+        session, offset_ns, last_ns = 0, 0, 0
+        while offset + RECORD.size <= size:
+            kind, connection, timestamp, length = RECORD.unpack_from(
+                self._mmap, offset)
+            offset += RECORD.size
+            if offset + length > size:
+                LOG.warning('Truncated record at the end of %s',
+                            self.filename)
+                break
+            if kind == SESSION:
+                session += 1
+                offset_ns = last_ns
+                continue
+            last_ns = offset_ns + timestamp
+            yield Record(kind, (session << 32) | connection, last_ns,
+                         view[offset:offset + length])
+            offset += length
+
+    def close(self):
+        """Unmap the file."""
+        self._mmap.close()
+
+
+class _ReplaySocket:
+    """Socket of a replayed connection, discarding the bytes sent to it."""
+
+    def __init__(self):
+        self.sent_bytes = 0
+
+    def sendall(self, data):
+        """Discard ``data``."""
+        self.sent_bytes += len(data)
+
+    def shutdown(self, how):
+        """Do nothing, as there is no connection to shut down."""
+
+    def close(self):
+        """Do nothing, as there is no connection to close."""
+
+
+class _ReplayTransport(asyncio.Transport):
+    """Transport of a replayed connection."""
+
+    def __init__(self, address, port, server_port):
+        super().__init__({'peername': (address, port),
+                          'sockname': ('0.0.0.0', server_port),
+                          'socket': _ReplaySocket()})
+        self._reading = True
+
+    def is_reading(self):
+        """Return whether the flow control lets the replay feed data."""
+        return self._reading
+
+    def pause_reading(self):
+        """Hold the data of this connection until reading is resumed."""
+        self._reading = False
+
+    def resume_reading(self):
+        """Feed the data of this connection again."""
+        self._reading = True
+
+    def write(self, data):
+        """Discard ``data``."""
+
+    def is_closing(self):
+        """Return False, as the replay closes the connection."""
+        return False
+
+    def close(self):
+        """Do nothing, as the replay closes the connection."""
+
+
+class Replayer:
+    """Feed a capture file to a controller and check the resulting events."""
+
+    #: str: Events created by the server protocol.
+    EVENTS_PATTERN = r'kytos/core\.[^.]+\.(raw\.in|connection\.(new|lost))'
+
+    def __init__(self, controller, filename, speed=1.0, timeout=10.0):
+        """Prepare the replay of a capture file.
+
+        Args:
+            controller (:class:`~kytos.core.controller.Controller`): Kytos
+                controller with a server.
+            filename (str): Capture file written by :class:`CaptureWriter`.
+            speed (float): Multiplier of the original speed; 0 to replay as
+                fast as possible.
+            timeout (float): Seconds to wait for the events after the last
+                record is replayed.
+        """
+        self.controller = controller
+        self.filename = filename
+        self.speed = speed
+        self.timeout = timeout
+        self._sources = set()
+        self._events = 0
+        self._suppressed = 0
+
+    def _count(self, event):
+        """Count the events of the replayed connections."""
+        if event.source in self._sources:
+            self._events += 1
+
+    async def run(self):
+        """Replay the capture file.
+
+        Returns:
+            dict: Connections, segments and bytes replayed, segments that
+            created no event, seconds taken, events expected and received by
+            the listeners, and whether they are the same.
+
+        """
+        listeners = self.controller.events_listeners.setdefault(
+            self.EVENTS_PATTERN, [])
+        listeners.append(self._count)
+        reader = CaptureReader(self.filename)
+        try:
+            report = await self._replay(reader)
+        finally:
+            reader.close()
+            listeners.remove(self._count)
+        LOG.info('Replay of %s: %s', self.filename, report)
+        return report
+
+    async def _replay(self, reader):
+        """Feed the records to new protocol instances."""
+        protocols = {}
+        expected, segments, data_bytes = 0, 0, 0
+        started_at = time.monotonic()
+        for record in reader:
+            if self.speed:
+                delay = (record.timestamp / 1e9 / self.speed -
+                         (time.monotonic() - started_at))
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if record.kind == CONNECT:
+                port, server_port = CONNECTION.unpack_from(record.data)
+                address = bytes(record.data[CONNECTION.size:]).decode()
+                protocol = self.controller.server.server_protocol()
+                protocol.connection_made(
+                    _ReplayTransport(address, port, server_port))
+                protocols[record.connection] = protocol
+                self._sources.add(protocol.connection)
+                expected += 1
+            elif record.connection not in protocols:
+                continue
+            elif record.kind == DATA:
+                segments += 1
+                data_bytes += len(record.data)
+                expected += await self._replay_data(
+                    protocols[record.connection], record.data)
+            else:
+                protocols.pop(record.connection).connection_lost(None)
+                expected += 1
+            if not self.speed:
+                # Let the buffer handlers run, as a switch would
+                await asyncio.sleep(0)
+        for protocol in protocols.values():
+            protocol.connection_lost(None)
+            expected += 1
+        replayed_at = time.monotonic()
+        while self._events < expected:
+            if time.monotonic() - replayed_at > self.timeout:
+                break
+            await asyncio.sleep(0.01)
+        return {'connections': len(self._sources), 'segments': segments,
+                'suppressed_segments': self._suppressed, 'bytes': data_bytes,
+                'seconds': time.monotonic() - started_at,
+                'expected_events': expected, 'events': self._events,
+                'verified': self._events == expected}
+
+    async def _replay_data(self, protocol, data):
+        """Feed a segment to ``protocol`` once it is read.
+
+        Returns:
+            int: Events created by the segment, 0 if it was over the rate
+            limits or nobody listens to it.
+
+        """
+        while not protocol.transport.is_reading():
+            await asyncio.sleep(0.001)
+        raw_events = protocol.raw_events
+        protocol.data_received(bytes(data))
+        events = protocol.raw_events - raw_events
+        if not events:
+            self._suppressed += 1
+        return events
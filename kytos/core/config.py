@@ -15,6 +15,7 @@ from pathlib import Path
 
 from jinja2 import Template
 
+from kytos.core.event_loop import LOOPS
 from kytos.core.metadata import __version__
 
 BASE_ENV = os.environ.get('VIRTUAL_ENV', None) or '/'
@@ -88,6 +89,31 @@ class KytosConfig():
                             action='store_true',
                             help="Create a kytos superuser.")
 
+        parser.add_argument('--profile-startup',
+                            action='store_true',
+                            help="Log the time spent in each startup phase.")
+
+        parser.add_argument('--event-loop',
+                            action='store',
+                            choices=LOOPS,
+                            help="Event loop implementation.")
+
+        parser.add_argument('--capture-file',
+                            action='store',
+                            help="Append the bytes received from the "
+                                 "switches to this file.",
+                            metavar="FILE")
+
+        parser.add_argument('--replay-file',
+                            action='store',
+                            help="Replay a capture file after starting.",
+                            metavar="FILE")
+
+        parser.add_argument('--replay-speed',
+                            action='store',
+                            help="Multiplier of the original speed of the "
+                                 "replay; 0 for as fast as possible.")
+
         self.conf_parser, self.parser = conf_parser, parser
         self.parse_args()
 
@@ -109,6 +135,28 @@ class KytosConfig():
                         'protocol_name': '',
                         'enable_entities_by_default': False,
                         'token_expiration_minutes': 180,
+                        'napps_load_workers': 1,
+                        'profile_startup': False,
+                        'profile_listeners': False,
+                        'json_logs': '',
+                        'trace_sample_rate': 0.0,
+                        'trace_file': '',
+                        'trace_format': 'chrome',
+                        'workers': 1,
+                        'process_pool_workers': 0,
+                        'capture_file': '',
+                        'replay_file': '',
+                        'replay_speed': 1.0,
+                        'event_loop': 'asyncio',
+                        'ingress_high_watermark': 10000,
+                        'ingress_low_watermark': 5000,
+                        'ingress_rate_limit': 0,
+                        'ingress_rate_burst': 0,
+                        'ingress_message_rate_limits': {},
+                        'ingress_rate_limit_action': 'drop',
+                        'ingress_rate_limit_sample': 0.1,
+                        'shutdown_drain_timeout': 10.0,
+                        'napp_reload_max_events': 10000,
                         'debug': False}
 
         """
@@ -131,6 +179,28 @@ class KytosConfig():
                     'authenticate_urls': [],
                     'vlan_pool': {},
                     'token_expiration_minutes': 180,
+                    'napps_load_workers': 1,
+                    'profile_startup': False,
+                    'profile_listeners': False,
+                    'json_logs': '',
+                    'trace_sample_rate': 0.0,
+                    'trace_file': '',
+                    'trace_format': 'chrome',
+                    'workers': 1,
+                    'process_pool_workers': 0,
+                    'capture_file': '',
+                    'replay_file': '',
+                    'replay_speed': 1.0,
+                    'event_loop': 'asyncio',
+                    'ingress_high_watermark': 10000,
+                    'ingress_low_watermark': 5000,
+                    'ingress_rate_limit': 0,
+                    'ingress_rate_burst': 0,
+                    'ingress_message_rate_limits': {},
+                    'ingress_rate_limit_action': 'drop',
+                    'ingress_rate_limit_sample': 0.1,
+                    'shutdown_drain_timeout': 10.0,
+                    'napp_reload_max_events': 10000,
                     'debug': False}
 
         options, argv = self.conf_parser.parse_known_args()
@@ -173,6 +243,22 @@ class KytosConfig():
         options.protocol_name = str(options.protocol_name)
         options.token_expiration_minutes = int(options.
                                                token_expiration_minutes)
+        options.napps_load_workers = int(options.napps_load_workers)
+        options.profile_startup = options.profile_startup in ['True', True]
+        options.profile_listeners = options.profile_listeners in ['True',
+                                                                  True]
+        options.trace_sample_rate = float(options.trace_sample_rate)
+        options.workers = int(options.workers)
+        options.process_pool_workers = int(options.process_pool_workers)
+        options.replay_speed = float(options.replay_speed)
+        options.ingress_high_watermark = int(options.ingress_high_watermark)
+        options.ingress_low_watermark = int(options.ingress_low_watermark)
+        options.ingress_rate_limit = float(options.ingress_rate_limit)
+        options.ingress_rate_burst = float(options.ingress_rate_burst)
+        options.ingress_rate_limit_sample = float(
+            options.ingress_rate_limit_sample)
+        options.shutdown_drain_timeout = float(options.shutdown_drain_timeout)
+        options.napp_reload_max_events = int(options.napp_reload_max_events)
         result = options.enable_entities_by_default in ['True', True]
         options.enable_entities_by_default = result
 
@@ -185,6 +271,8 @@ class KytosConfig():
         options.napps_pre_installed = _parse_json(options.napps_pre_installed)
         options.vlan_pool = _parse_json(options.vlan_pool)
         options.authenticate_urls = _parse_json(options.authenticate_urls)
+        options.ingress_message_rate_limits = _parse_json(
+            options.ingress_message_rate_limits)
 
         return options
 
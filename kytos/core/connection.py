@@ -1,14 +1,24 @@
 """Module with main classes related to Connections."""
+import asyncio
 import logging
+import threading
 from enum import Enum
 from errno import EBADF, ENOTCONN
 from socket import SHUT_RDWR
 from socket import error as SocketError
 
+from kytos.core.metrics import REGISTRY
+
 __all__ = ('Connection', 'ConnectionProtocol', 'ConnectionState')
 
 LOG = logging.getLogger(__name__)
 
+SENT_BYTES = REGISTRY.counter('kytos_sent_bytes_total',
+                              'Bytes sent to southbound connections.')
+SEND_ERRORS = REGISTRY.counter('kytos_send_errors_total',
+                               'Southbound messages that could not be '
+                               'sent.')
+
 
 class ConnectionState(Enum):
     """Enum of possible general connections states."""
@@ -33,7 +43,7 @@ class ConnectionProtocol:
 class Connection:
     """Connection class to abstract a network connections."""
 
-    def __init__(self, address, port, socket, switch=None):
+    def __init__(self, address, port, socket, switch=None, transport=None):
         """Assign parameters to instance variables.
 
         Args:
@@ -41,11 +51,18 @@ class Connection:
             port (int): Port number.
             socket (socket): socket.
             switch (:class:`~.Switch`): switch with this connection.
+            transport (asyncio.Transport): Transport used to send and close
+                instead of the socket, which does not support it in all
+                event loops. It must be given in the thread of its loop.
         """
         self.address = address
         self.port = port
         self.socket = socket
         self.switch = switch
+        self.transport = transport
+        if transport is not None:
+            self._loop = asyncio.get_event_loop()
+            self._loop_thread = threading.get_ident()
         self.state = ConnectionState.NEW
         self.protocol = ConnectionProtocol()
         self.remaining_data = b''
@@ -90,11 +107,23 @@ class Connection:
         """
         try:
             if self.is_alive():
-                self.socket.sendall(buffer)
+                if self.transport is None:
+                    self.socket.sendall(buffer)
+                else:
+                    self._call_in_loop(self.transport.write, buffer)
+                SENT_BYTES.inc(len(buffer))
         except (OSError, SocketError) as exception:
+            SEND_ERRORS.inc()
             LOG.debug('Could not send packet. Exception: %s', exception)
             self.close()
 
+    def _call_in_loop(self, function, *args):
+        """Call a transport method in the thread of its loop."""
+        if threading.get_ident() == self._loop_thread:
+            function(*args)
+        else:
+            self._loop.call_soon_threadsafe(function, *args)
+
     def close(self):
         """Close the socket from connection instance."""
         self.state = ConnectionState.FINISHED
@@ -103,6 +132,12 @@ class Connection:
 
         LOG.debug('Shutting down Connection %s', self.id)
 
+        if self.transport is not None:
+            self._call_in_loop(self.transport.close)
+            self.socket = None
+            LOG.debug('Connection Closed: %s', self.id)
+            return
+
         try:
             self.socket.shutdown(SHUT_RDWR)
             self.socket.close()
@@ -21,6 +21,7 @@ import os
 import re
 import sys
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 from importlib import reload as reload_module
@@ -29,22 +30,52 @@ from pathlib import Path
 
 from kytos.core.api_server import APIServer
 # from kytos.core.tcp_server import KytosRequestHandler, KytosServer
-from kytos.core.atcp_server import KytosServer, KytosServerProtocol
+from kytos.core.atcp_server import (FlowControl, KytosServer,
+                                    KytosServerProtocol)
 from kytos.core.auth import Auth
 from kytos.core.buffers import KytosBuffers
+from kytos.core.capture import CaptureWriter, Replayer
 from kytos.core.config import KytosConfig
 from kytos.core.connection import ConnectionState
-from kytos.core.events import KytosEvent
-from kytos.core.helpers import now
+from kytos.core.events import EventHolder, EventListeners, KytosEvent
+from kytos.core.helpers import now, running_handlers
 from kytos.core.interface import Interface
-from kytos.core.logs import LogManager
+from kytos.core.logs import LevelGuard, LogManager
+from kytos.core.metrics import REGISTRY
 from kytos.core.napps.base import NApp
 from kytos.core.napps.manager import NAppsManager
 from kytos.core.napps.napp_dir_listener import NAppDirListener
+from kytos.core.process_pool import PROCESS_POOL
+from kytos.core.profiling import ListenerProfiler, StartupProfiler
+from kytos.core.rate_limit import RateLimits
 from kytos.core.switch import Switch
+from kytos.core.tracing import FORMATS as TRACE_FORMATS
+from kytos.core.tracing import TRACER
 
 __all__ = ('Controller',)
 
+#: LevelGuard: Cached levels of ``Controller.log`` for the event handlers.
+LOG_LEVELS = LevelGuard(logging.getLogger(__name__))
+
+NOTIFY_SECONDS = REGISTRY.histogram('kytos_notify_listeners_seconds',
+                                    'Time spent matching an event and '
+                                    'calling its listeners.')
+LISTENER_CALLS = REGISTRY.counter('kytos_listener_calls_total',
+                                  'Listeners called by notify_listeners.')
+RELOAD_REPLAYED = REGISTRY.counter('kytos_napp_reload_replayed_events_total',
+                                   'Events held while a NApp was reloaded '
+                                   'and replayed to the new instance.',
+                                   ['napp'])
+RELOAD_DROPPED = REGISTRY.counter('kytos_napp_reload_dropped_events_total',
+                                  'Events of a NApp being reloaded that '
+                                  'could not be replayed.', ['napp'])
+RELOAD_PAUSED = REGISTRY.counter('kytos_napp_reload_paused_seconds_total',
+                                 'Seconds the events of a NApp were held '
+                                 'while it was reloaded.', ['napp'])
+DROPPED_AT_SHUTDOWN = REGISTRY.counter('kytos_shutdown_dropped_events_total',
+                                       'Events left in each buffer when the '
+                                       'controller stopped.', ['buffer'])
+
 
 class Controller:
     """Main class of Kytos.
@@ -59,17 +90,32 @@ class Controller:
 
     # Created issue #568 for the disabled checks.
     # pylint: disable=too-many-instance-attributes,too-many-public-methods
-    def __init__(self, options=None, loop=None):
+    def __init__(self, options=None, loop=None, profiler=None, workers=None):
         """Init method of Controller class takes the parameters below.
 
         Args:
             options (:attr:`ParseArgs.args`): :attr:`options` attribute from an
                 instance of :class:`~kytos.core.config.KytosConfig` class.
+            profiler (:class:`~kytos.core.profiling.StartupProfiler`):
+                Profiler that records the startup phases, if any.
+            workers: :class:`~kytos.core.workers.WorkerPool` in the
+                coordinator or :class:`~kytos.core.workers.WorkerChannel` in
+                a worker, when running more than one process.
         """
         if options is None:
             options = KytosConfig().options['daemon']
 
+        #: WorkerPool or WorkerChannel: Other processes, if any.
+        self.workers = workers
+        #: int: 0 in the coordinator or single process, else the worker index.
+        self.worker_index = workers.index if workers else 0
+
+        #: StartupProfiler: Time spent in each startup phase.
+        self.startup_profiler = profiler or StartupProfiler(enabled=False)
+
         self._loop = loop or asyncio.get_event_loop()
+        #: int: Identifier of the thread running the loop, once started.
+        self._loop_thread = None
         self._pool = ThreadPoolExecutor(max_workers=1)
 
         #: dict: keep the main threads of the controller (buffers and handler)
@@ -82,11 +128,7 @@ class Controller:
         #: switches. The key for this dict is a tuple (ip, port). The content
         #: is another dict with the connection information.
         self.connections = {}
-        #: dict: mapping of events and event listeners.
-        #:
-        #: The key of the dict is a KytosEvent (or a string that represent a
-        #: regex to match against KytosEvents) and the value is a list of
-        #: methods that will receive the referenced event
+        self._events_listeners = None
         self.events_listeners = {'kytos/core.connection.new':
                                  [self.new_connection]}
 
@@ -95,6 +137,26 @@ class Controller:
         #: The key is the napp name (string), while the value is the napp
         #: instance itself.
         self.napps = {}
+        #: dict: Seconds spent loading each NApp, indexed by NApp id.
+        self.napps_load_times = {}
+        #: Lock: Serializes the NApp imports, which change ``sys.modules``.
+        self._napps_import_lock = threading.Lock()
+        #: dict: Events held and replayed by the last reload of each NApp,
+        #: indexed by NApp id.
+        self.napps_reload_reports = {}
+        #: MetricsRegistry: Core metrics, also available for NApps to
+        #: register their own ones.
+        self.metrics = REGISTRY
+        #: ListenerProfiler: Calls and latency of each listener, recorded
+        #: while listener profiling is enabled.
+        self.listener_profiler = ListenerProfiler()
+        #: EventTracer: Trace points of the sampled events.
+        self.tracer = TRACER
+        #: ProcessPool: Processes running the ``run_in_process`` functions.
+        self.process_pool = PROCESS_POOL
+        #: CaptureWriter: Writer of the bytes received from the switches,
+        #: if ``capture_file`` is set.
+        self.capture = None
         #: Object generated by ParseArgs on config.py file
         self.options = options
         #: KytosServer: Instance of KytosServer that will be listening to TCP
@@ -116,14 +178,18 @@ class Controller:
 
         self.napps_manager = NAppsManager(self)
 
-        #: API Server used to expose rest endpoints.
-        self.api_server = APIServer(__name__, self.options.listen,
-                                    self.options.api_port,
-                                    self.napps_manager, self.options.napps)
+        with self.startup_profiler.phase('api_server'):
+            #: API Server used to expose rest endpoints.
+            self.api_server = APIServer(__name__, self.options.listen,
+                                        self.options.api_port,
+                                        self.napps_manager,
+                                        self.options.napps,
+                                        self.options.workdir,
+                                        not self.worker_index)
 
-        self.auth = Auth(self)
+            self.auth = Auth(self)
 
-        self._register_endpoints()
+            self._register_endpoints()
         #: Adding the napps 'enabled' directory into the PATH
         #: Now you can access the enabled napps with:
         #: from napps.<username>.<napp_name> import ?....
@@ -133,6 +199,8 @@ class Controller:
         """Register kytos log and enable the logs."""
         LogManager.load_config_file(self.options.logging, self.options.debug)
         LogManager.enable_websocket(self.api_server.server)
+        if self.options.json_logs:
+            LogManager.enable_json_logs(self.options.json_logs)
         self.log = logging.getLogger(__name__)
 
     @staticmethod
@@ -154,6 +222,8 @@ class Controller:
         logger level.
         Obs: To disable the debug the logging will be set to NOTSET
 
+        Only logger levels are changed; handlers are not rebuilt.
+
         Args:
             name(text): Full hierarchy Logger name. Ex: "kytos.core.controller"
         """
@@ -168,24 +238,26 @@ class Controller:
             enable_debug = level != logging.DEBUG
 
             # Enable/disable default Loggers
-            LogManager.load_config_file(self.options.logging, enable_debug)
+            LogManager.set_debug(enable_debug)
             return
 
         # Get effective logger level for the name
         level = logging.getLogger(name).getEffectiveLevel()
-        logger = logging.getLogger(name)
 
         if level == logging.DEBUG:
             # disable debug
-            logger.setLevel(logging.NOTSET)
+            LogManager.set_level(name, logging.NOTSET)
         else:
             # enable debug
-            logger.setLevel(logging.DEBUG)
+            LogManager.set_level(name, logging.DEBUG)
 
     def start(self, restart=False):
         """Create pidfile and call start_controller method."""
-        self.enable_logs()
-        if not restart:
+        # Called in the thread running the loop
+        self._loop_thread = threading.get_ident()
+        with self.startup_profiler.phase('logging'):
+            self.enable_logs()
+        if not restart and not self.worker_index:
             self.create_pidfile()
         self.start_controller()
 
@@ -245,14 +317,35 @@ class Controller:
         Load the installed apps.
         """
         self.log.info("Starting Kytos - Kytos Controller")
-        self.server = KytosServer((self.options.listen,
-                                   int(self.options.port)),
-                                  KytosServerProtocol,
-                                  self,
-                                  self.options.protocol_name)
-
-        self.log.info("Starting TCP server: %s", self.server)
-        self.server.serve_forever()
+        self.log.info("Event loop: %s.%s", type(self._loop).__module__,
+                      type(self._loop).__name__)
+        if self.options.capture_file:
+            filename = self.options.capture_file
+            if self.worker_index:
+                filename = f'{filename}.{self.worker_index}'
+            self.capture = CaptureWriter(filename)
+            self.log.info("Capturing southbound traffic to %s", filename)
+        flow_control = None
+        if self.options.ingress_high_watermark > 0:
+            flow_control = FlowControl(self.buffers.raw,
+                                       self.options.ingress_high_watermark,
+                                       self.options.ingress_low_watermark,
+                                       loop=self._loop)
+        rate_limits = RateLimits.from_options(self.options)
+        with self.startup_profiler.phase('tcp_listen'):
+            self.server = KytosServer((self.options.listen,
+                                       int(self.options.port)),
+                                      KytosServerProtocol,
+                                      self,
+                                      self.options.protocol_name,
+                                      loop=self._loop,
+                                      reuse_port=self.workers is not None,
+                                      capture=self.capture,
+                                      flow_control=flow_control,
+                                      rate_limits=rate_limits)
+
+            self.log.info("Starting TCP server: %s", self.server)
+            self.server.serve_forever()
 
         def _stop_loop(_):
             loop = asyncio.get_event_loop()
@@ -281,8 +374,10 @@ class Controller:
         task = self._loop.create_task(self.msg_in_event_handler())
         task = self._loop.create_task(self.msg_out_event_handler())
         task = self._loop.create_task(self.app_event_handler())
-        task = self._loop.create_task(_run_api_server_thread(self._pool))
-        task.add_done_callback(_stop_loop)
+        # Only the coordinator serves the REST API
+        if not self.worker_index:
+            task = self._loop.create_task(_run_api_server_thread(self._pool))
+            task.add_done_callback(_stop_loop)
 
         self.log.info("ThreadPool started: %s", self._pool)
 
@@ -290,13 +385,46 @@ class Controller:
         # This is critical, if any of them failed starting we should exit.
         # sys.exit(error_msg.format(thread, exception))
 
-        self.log.info("Loading Kytos NApps...")
-        self.napp_dir_listener.start()
-        self.pre_install_napps(self.options.napps_pre_installed)
-        self.load_napps()
+        if self.options.profile_listeners:
+            self.listener_profiler.enable(self.events_listeners)
+        self.tracer.set_sample_rate(self.options.trace_sample_rate)
+        self.process_pool.configure(self, self.options.process_pool_workers)
+        if self.workers:
+            self.workers.attach(self)
+
+        # Workers only handle the connections of their switches and forward
+        # their events to the coordinator, which runs the NApps
+        if not self.worker_index:
+            self._start_napps()
 
         self.started_at = now()
 
+        if self.options.replay_file and not self.worker_index:
+            replayer = Replayer(self, self.options.replay_file,
+                                self.options.replay_speed)
+            self._loop.create_task(replayer.run())
+
+        if self.startup_profiler.enabled:
+            self._report_startup_profile()
+
+    def _start_napps(self):
+        """Install and load the NApps, starting the workers in between."""
+        self.log.info("Loading Kytos NApps...")
+        with self.startup_profiler.phase('napps'):
+            self.napp_dir_listener.start()
+            self.pre_install_napps(self.options.napps_pre_installed)
+            if self.workers:
+                self.workers.start(self.options)
+            self.load_napps()
+
+    def _report_startup_profile(self):
+        """Log the startup profile and save it in the working directory."""
+        self.startup_profiler.napps.update(self.napps_load_times)
+        self.log.info(self.startup_profiler.report())
+        filename = os.path.join(self.options.workdir, 'startup_profile.json')
+        if self.startup_profiler.save(filename):
+            self.log.info("Startup profile saved to %s", filename)
+
     def _register_endpoints(self):
         """Register all rest endpoint served by kytos.
 
@@ -315,6 +443,15 @@ class Controller:
             self.rest_reload_napp)
         self.api_server.register_core_endpoint('reload/all',
                                                self.rest_reload_all_napps)
+        self.api_server.register_core_endpoint(
+            'profiling/listeners/', self.rest_listeners_profile)
+        self.api_server.register_core_endpoint(
+            'profiling/listeners/<action>', self.rest_listeners_profile,
+            methods=['POST'])
+        self.api_server.register_core_endpoint('tracing/',
+                                               self.rest_traces)
+        self.api_server.register_core_endpoint('tracing/<trace_format>',
+                                               self.rest_traces)
         self.auth.register_core_auth_services()
 
     def register_rest_endpoint(self, url, function, methods):
@@ -366,7 +503,25 @@ class Controller:
         if self.started_at:
             self.stop_controller(graceful)
 
-    def stop_controller(self, graceful=True):
+    async def stop_async(self, graceful=True):
+        """Stop the controller from a task of its event loop.
+
+        Unlike :meth:`stop`, the buffers are drained without blocking the
+        loop, so the messages that handler threads send while draining are
+        written before the connections are closed. Signal handlers and
+        other code running in the loop must use this method.
+
+        Args:
+            graceful(bool): Whether the buffers are drained first.
+        """
+        if not self.started_at:
+            return
+        if graceful and self.options.shutdown_drain_timeout > 0:
+            self.server.stop_reading()
+            await self.drain_buffers(self.options.shutdown_drain_timeout)
+        self.stop_controller(graceful, drain=False)
+
+    def stop_controller(self, graceful=True, drain=True):
         """Stop the controller.
 
         This method should:
@@ -377,12 +532,26 @@ class Controller:
             - stop each running handler;
             - stop all running threads;
             - stop the KytosServer;
+
+        Args:
+            graceful(bool): Whether the buffers are drained and the pools
+                waited for.
+            drain(bool): Whether the buffers are drained here. They cannot
+                be from the thread of the running loop; see
+                :meth:`stop_async`.
         """
         self.log.info("Stopping Kytos")
 
+        if drain and graceful and self.options.shutdown_drain_timeout > 0:
+            self.server.stop_reading()
+            self._wait_drain(self.options.shutdown_drain_timeout)
+        self._report_dropped_events()
         self.buffers.send_stop_signal()
-        self.api_server.stop_api_server()
+        if not self.worker_index:
+            self.api_server.stop_api_server()
         self.napp_dir_listener.stop()
+        if self.workers:
+            self.workers.stop()
 
         self.log.info("Stopping threadpool: %s", self._pool)
 
@@ -391,6 +560,7 @@ class Controller:
                        len(threads), threads)
 
         self._pool.shutdown(wait=graceful)
+        self.process_pool.shutdown(wait=graceful)
 
         # self.server.socket.shutdown()
         # self.server.socket.close()
@@ -406,13 +576,97 @@ class Controller:
 
         self.started_at = None
         self.unload_napps()
-        self.buffers = KytosBuffers()
+        if self.options.trace_file:
+            self.tracer.export(self.options.trace_file,
+                               self.options.trace_format)
+        self.buffers = KytosBuffers(loop=self._loop)
 
         # ASYNC TODO: close connections
         # self.server.server_close()
 
         # Shutdown the TCP server and the main asyncio loop
         self.server.shutdown()
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+        if self.worker_index:
+            # Workers have no API server thread whose end stops the loop
+            self._loop.stop()
+
+    def _wait_drain(self, timeout):
+        """Drain the buffers in the event loop and wait for it to finish."""
+        if not self._loop.is_running():
+            self._loop.run_until_complete(self.drain_buffers(timeout))
+        elif threading.get_ident() != self._loop_thread:
+            asyncio.run_coroutine_threadsafe(self.drain_buffers(timeout),
+                                             self._loop).result()
+        else:
+            self.log.warning("Buffers not drained: the controller was "
+                             "stopped in the event loop without stop_async")
+
+    async def drain_buffers(self, timeout):
+        """Dispatch the queued events before stopping.
+
+        The events of all buffers, and the ones created by their listeners,
+        are dispatched until the buffers are empty and the
+        :func:`~kytos.core.helpers.run_on_thread` handlers have finished, or
+        until ``timeout``. Messages queued to be sent to the switches, such
+        as FlowMods, are sent first. The loop runs between events, so the
+        messages sent by handler threads are written too.
+
+        Args:
+            timeout (float): Maximum seconds to drain the buffers.
+
+        Returns:
+            dict: Events dispatched, seconds taken, events left by buffer
+            name and handlers still running.
+
+        """
+        started_at = time.monotonic()
+        deadline = started_at + timeout
+        buffers = ((self.buffers.msg_out, self._send_message),
+                   (self.buffers.app, self.notify_listeners),
+                   (self.buffers.msg_in, self.notify_listeners),
+                   (self.buffers.raw, self.notify_listeners))
+        dispatched = 0
+        while time.monotonic() < deadline:
+            for buffer, dispatch in buffers:
+                event = buffer.get_nowait()
+                if event is not None:
+                    dispatch(event)
+                    dispatched += 1
+                    break
+            else:
+                if not running_handlers():
+                    break
+                await asyncio.sleep(0.01)
+                continue
+            await asyncio.sleep(0)
+        # Write the messages the last handlers sent
+        await asyncio.sleep(0)
+        report = {'events': dispatched,
+                  'seconds': time.monotonic() - started_at,
+                  'left': {buffer.name: buffer.qsize()
+                           for buffer, _ in buffers if buffer.qsize()},
+                  'handlers': len(running_handlers())}
+        if report['left'] or report['handlers']:
+            self.log.warning("Buffers not drained in %ss: %s", timeout,
+                             report)
+        else:
+            self.log.info("Buffers drained: %s", report)
+        return report
+
+    def _report_dropped_events(self):
+        """Count and log the events still queued when stopping."""
+        dropped = {}
+        for buffer in (self.buffers.raw, self.buffers.msg_in,
+                       self.buffers.msg_out, self.buffers.app):
+            events = buffer.qsize()
+            if events:
+                dropped[buffer.name] = events
+                DROPPED_AT_SHUTDOWN.labels(buffer.name).inc(events)
+        if dropped:
+            self.log.warning("Events dropped at shutdown: %s", dropped)
 
     def status(self):
         """Return status of Kytos Server.
@@ -441,28 +695,59 @@ class Controller:
         """
         return now() - self.started_at if self.started_at else 0
 
+    @property
+    def events_listeners(self):
+        """EventListeners: mapping of events and event listeners.
+
+        The key of the dict is a KytosEvent name (or a string that represent a
+        regex to match against KytosEvents) and the value is a list of
+        methods that will receive the referenced event. A plain dict may be
+        assigned; it is converted to an
+        :class:`~kytos.core.events.EventListeners`.
+        """
+        return self._events_listeners
+
+    @events_listeners.setter
+    def events_listeners(self, events_listeners):
+        self._events_listeners = EventListeners(events_listeners)
+
+    def has_listeners(self, name):
+        """Return whether an event named ``name`` would reach any listener.
+
+        Producers of frequent events, such as the server protocol, check it
+        to skip creating and queueing the events nobody listens to. NApp
+        listeners are seen as soon as they are loaded or unloaded.
+
+        Args:
+            name (str): Event name.
+        """
+        return self._events_listeners.has_listeners(name)
+
     def notify_listeners(self, event):
         """Send the event to the specified listeners.
 
-        Loops over self.events_listeners matching (by regexp) the attribute
-        name of the event with the keys of events_listeners. If a match occurs,
-        then send the event to each registered listener.
+        Gets from self.events_listeners the listeners of the patterns (regexps)
+        matching the event name, which are matched once per event name and
+        then cached, and sends the event to each of them.
 
         Args:
             event (~kytos.core.KytosEvent): An instance of a KytosEvent.
         """
-        self.log.debug("looking for listeners for %s", event)
-        for event_regex, listeners in dict(self.events_listeners).items():
-            # self.log.debug("listeners found for %s: %r => %s", event,
-            #                event_regex, [l.__qualname__ for l in listeners])
-            # Do not match if the event has more characters
-            # e.g. "shutdown" won't match "shutdown.kytos/of_core"
-            if event_regex[-1] != '$' or event_regex[-2] == '\\':
-                event_regex += '$'
-            if re.match(event_regex, event.name):
-                # self.log.debug('Calling listeners for %s', event)
+        if LOG_LEVELS.debug:
+            self.log.debug("looking for listeners for %s", event)
+        started_at = time.perf_counter()
+        calls = 0
+        trace = getattr(event, 'trace', None) if TRACER.enabled else None
+        for listeners in self._events_listeners.get_listeners(event.name):
+            if trace is None:
                 for listener in listeners:
                     listener(event)
+            else:
+                for listener in listeners:
+                    TRACER.dispatch(listener, event)
+            calls += len(listeners)
+        LISTENER_CALLS.inc(calls)
+        NOTIFY_SECONDS.observe(time.perf_counter() - started_at)
 
     async def raw_event_handler(self):
         """Handle raw events.
@@ -474,7 +759,8 @@ class Controller:
         while True:
             event = await self.buffers.raw.aget()
             self.notify_listeners(event)
-            self.log.debug("Raw Event handler called")
+            if LOG_LEVELS.debug:
+                self.log.debug("Raw Event handler called")
 
             if event.name == "kytos/core.shutdown":
                 self.log.debug("Raw Event handler stopped")
@@ -490,7 +776,8 @@ class Controller:
         while True:
             event = await self.buffers.msg_in.aget()
             self.notify_listeners(event)
-            self.log.debug("Message In Event handler called")
+            if LOG_LEVELS.debug:
+                self.log.debug("Message In Event handler called")
 
             if event.name == "kytos/core.shutdown":
                 self.log.debug("Message In Event handler stopped")
@@ -510,12 +797,17 @@ class Controller:
                 self.log.debug("Message Out Event handler stopped")
                 break
 
-            message = triggered_event.content['message']
-            destination = triggered_event.destination
-            if (destination and
-                    not destination.state == ConnectionState.FINISHED):
-                packet = message.pack()
-                destination.send(packet)
+            self._send_message(triggered_event)
+
+    def _send_message(self, triggered_event):
+        """Send the message of a msg_out event and notify its listeners."""
+        message = triggered_event.content['message']
+        destination = triggered_event.destination
+        if (destination and
+                not destination.state == ConnectionState.FINISHED):
+            packet = message.pack()
+            destination.send(packet)
+            if LOG_LEVELS.debug:
                 self.log.debug('Connection %s: OUT OFP, '
                                'version: %s, type: %s, xid: %s - %s',
                                destination.id,
@@ -523,10 +815,11 @@ class Controller:
                                message.header.message_type,
                                message.header.xid,
                                packet.hex())
-                self.notify_listeners(triggered_event)
+            self.notify_listeners(triggered_event)
+            if LOG_LEVELS.debug:
                 self.log.debug("Message Out Event handler called")
-            else:
-                self.log.info("connection closed. Cannot send message")
+        else:
+            self.log.info("connection closed. Cannot send message")
 
     async def app_event_handler(self):
         """Handle app events.
@@ -538,7 +831,8 @@ class Controller:
         while True:
             event = await self.buffers.app.aget()
             self.notify_listeners(event)
-            self.log.debug("App Event handler called")
+            if LOG_LEVELS.debug:
+                self.log.debug("App Event handler called")
 
             if event.name == "kytos/core.shutdown":
                 self.log.debug("App Event handler stopped")
@@ -604,7 +898,6 @@ class Controller:
             event_name += 'reconnected'
 
         self.set_switch_options(dpid=dpid)
-        event = KytosEvent(name=event_name, content={'switch': switch})
 
         old_connection = switch.connection
         switch.update_connection(connection)
@@ -612,7 +905,9 @@ class Controller:
         if old_connection is not connection:
             self.remove_connection(old_connection)
 
-        self.buffers.app.put(event)
+        if self.has_listeners(event_name):
+            self.buffers.app.put(KytosEvent(name=event_name,
+                                            content={'switch': switch}))
 
         return switch
 
@@ -762,34 +1057,69 @@ class Controller:
             self.log.warning(message, username, napp_name)
             return
 
+        napp = self._create_napp(username, napp_name)
+        if napp is not None:
+            self._activate_napp(username, napp_name, napp)
+
+    def _create_napp(self, username, napp_name):
+        """Import a NApp module and instantiate its Main class.
+
+        This runs the NApp ``setup()``, but does not register the NApp in the
+        controller. It can be called from a worker thread.
+
+        Returns:
+            KytosNApp: NApp instance or None if it could not be created.
+
+        """
         try:
-            napp_module = self._import_napp(username, napp_name)
+            with self._napps_import_lock:
+                napp_module = self._import_napp(username, napp_name)
         except ModuleNotFoundError as err:
             self.log.error("Error loading NApp '%s/%s': %s",
                            username, napp_name, err)
-            return
+            return None
         except FileNotFoundError as err:
             msg = "NApp module not found, assuming it's a meta-napp: %s"
             self.log.warning(msg, err.filename)
-            return
+            return None
 
         try:
-            napp = napp_module.Main(controller=self)
+            return napp_module.Main(controller=self)
         except:  # noqa pylint: disable=bare-except
             self.log.critical("NApp initialization failed: %s/%s",
                               username, napp_name, exc_info=True)
-            return
+            return None
 
+    def _activate_napp(self, username, napp_name, napp,
+                       register_listeners=True):
+        """Start a NApp and register its endpoints and listeners."""
         self.napps[(username, napp_name)] = napp
 
         napp.start()
         self.api_server.authenticate_endpoints(napp)
         self.api_server.register_napp_endpoints(napp)
+        self.api_server.ui_assets.invalidate()
+
+        if register_listeners:
+            self._register_listeners(napp)
 
+    def _register_listeners(self, napp):
+        """Add the listeners of a NApp to the events listeners.
+
+        Returns:
+            dict: Listeners added, indexed by pattern.
+
+        """
+        registered = {}
         # pylint: disable=protected-access
         for event, listeners in napp._listeners.items():
+            if self.listener_profiler.enabled:
+                listeners = [self.listener_profiler.wrap(listener, event)
+                             for listener in listeners]
             self.events_listeners.setdefault(event, []).extend(listeners)
+            registered[event] = listeners
         # pylint: enable=protected-access
+        return registered
 
     def pre_install_napps(self, napps, enable=True):
         """Pre install and enable NApps.
@@ -806,14 +1136,104 @@ class Controller:
             self.napps_manager.install(napp, enable=enable)
 
     def load_napps(self):
-        """Load all NApps enabled on the NApps dir."""
-        for napp in self.napps_manager.get_enabled_napps():
-            try:
-                self.log.info("Loading NApp %s", napp.id)
-                self.load_napp(napp.username, napp.name)
-            except FileNotFoundError as exception:
-                self.log.error("Could not load NApp %s: %s",
-                               napp.id, exception)
+        """Load all NApps enabled on the NApps dir.
+
+        NApps are loaded in stages built from their ``napp_dependencies``, so
+        a NApp is only created after all of its dependencies were loaded.
+        NApps in the same stage are instantiated concurrently by up to
+        ``napps_load_workers`` threads, 1 by default, which use the
+        controller event loop. Their modules are imported one at a time.
+        They are started and their listeners are registered afterwards, one
+        at a time and sorted by id, so the listeners order does not depend on
+        thread scheduling.
+        """
+        started_at = time.monotonic()
+        stages = self._get_napps_load_stages(
+            self.napps_manager.get_enabled_napps())
+        workers = max(self.options.napps_load_workers, 1)
+
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='napps_loader') as pool:
+            for stage in stages:
+                stage = [napp for napp in stage
+                         if (napp.username, napp.name) not in self.napps]
+                for napp in stage:
+                    self.log.info("Loading NApp %s", napp.id)
+                if workers > 1 and len(stage) > 1:
+                    created = list(pool.map(self._create_napp_in_worker,
+                                            stage))
+                else:
+                    created = [self._create_napp_timed(napp)
+                               for napp in stage]
+
+                for napp, (instance, elapsed) in zip(stage, created):
+                    if instance is None:
+                        continue
+                    activation_start = time.monotonic()
+                    try:
+                        self._activate_napp(napp.username, napp.name,
+                                            instance)
+                    except FileNotFoundError as exception:
+                        self.log.error("Could not load NApp %s: %s",
+                                       napp.id, exception)
+                        continue
+                    elapsed += time.monotonic() - activation_start
+                    self.napps_load_times[napp.id] = elapsed
+                    self.log.info("NApp %s loaded in %.3f s", napp.id,
+                                  elapsed)
+
+        self.api_server.ui_assets.build()
+        self.log.info("%d NApps loaded in %.3f s", len(self.napps),
+                      time.monotonic() - started_at)
+
+    def _create_napp_in_worker(self, napp):
+        """Create a NApp in a loader thread, with the controller loop."""
+        asyncio.set_event_loop(self._loop)
+        return self._create_napp_timed(napp)
+
+    def _create_napp_timed(self, napp):
+        """Return a NApp instance and the seconds spent creating it."""
+        started_at = time.monotonic()
+        try:
+            instance = self._create_napp(napp.username, napp.name)
+        except FileNotFoundError as exception:
+            self.log.error("Could not load NApp %s: %s", napp.id, exception)
+            instance = None
+        return instance, time.monotonic() - started_at
+
+    def _get_napps_load_stages(self, napps):
+        """Group NApps in stages that can be loaded concurrently.
+
+        A NApp is placed in the stage right after the last one holding any of
+        its dependencies. Dependencies that are not enabled are ignored.
+        NApps with circular dependencies are placed in a last stage.
+
+        Args:
+            napps (list): :class:`~kytos.core.napps.base.NApp` instances.
+
+        Returns:
+            list: Lists of NApps sorted by id, one list for each stage.
+
+        """
+        pending = {napp.id: napp for napp in napps}
+        dependencies = {}
+        for napp_id, napp in pending.items():
+            dependencies[napp_id] = {
+                '/'.join(NAppsManager.get_napp_fullname_from_uri(uri))
+                for uri in napp.napp_dependencies
+            }.intersection(pending).difference([napp_id])
+
+        stages, loaded = [], set()
+        while pending:
+            ready = sorted(napp_id for napp_id in pending
+                           if dependencies[napp_id] <= loaded)
+            if not ready:
+                ready = sorted(pending)
+                self.log.warning("Circular dependencies between NApps: %s",
+                                 ', '.join(ready))
+            stages.append([pending.pop(napp_id) for napp_id in ready])
+            loaded.update(ready)
+        return stages
 
     def unload_napp(self, username, napp_name):
         """Unload a specific NApp.
@@ -836,13 +1256,16 @@ class Controller:
 
             # Remove rest endpoints from that napp
             self.api_server.remove_napp_endpoints(napp)
+            self.api_server.ui_assets.invalidate()
 
             # Removing listeners from that napp
             # pylint: disable=protected-access
             for event_type, napp_listeners in napp._listeners.items():
                 event_listeners = self.events_listeners[event_type]
                 for listener in napp_listeners:
-                    event_listeners.remove(listener)
+                    # Already replaced if the NApp is being reloaded
+                    if listener in event_listeners:
+                        event_listeners.remove(listener)
                 if not event_listeners:
                     del self.events_listeners[event_type]
             # pylint: enable=protected-access
@@ -872,18 +1295,90 @@ class Controller:
             raise
 
     def reload_napp(self, username, napp_name):
-        """Reload a NApp."""
+        """Reload a NApp.
+
+        While the NApp is reloaded, its listeners are replaced by ones
+        holding their events, up to ``napp_reload_max_events``, which are
+        replayed to the new instance before it receives new events.
+        """
+        napp = self.napps.get((username, napp_name))
+        holder = None
+        if napp is not None:
+            holder = EventHolder(self.options.napp_reload_max_events)
+            shutdown_pattern = ('kytos/core.shutdown.' +
+                                NApp(username, napp_name).id)
+            # pylint: disable=protected-access
+            for pattern, napp_listeners in napp._listeners.items():
+                if pattern == shutdown_pattern:
+                    continue
+                pattern_listeners = self.events_listeners[pattern]
+                # Replaced at once, so no event reaches both
+                pattern_listeners[:] = [
+                    listener for listener in pattern_listeners
+                    if listener not in napp_listeners
+                ] + [holder.listener(pattern)]
+            # pylint: enable=protected-access
         self.unload_napp(username, napp_name)
         try:
             self.reload_napp_module(username, napp_name, 'settings')
             self.reload_napp_module(username, napp_name, 'main')
         except (ModuleNotFoundError, ImportError):
+            if holder is not None:
+                self._release_held_events(username, napp_name, holder, None)
             return 400
         self.log.info("NApp '%s/%s' successfully reloaded",
                       username, napp_name)
-        self.load_napp(username, napp_name)
+        if holder is None:
+            self.load_napp(username, napp_name)
+            return 200
+        napp = self._create_napp(username, napp_name)
+        if napp is not None:
+            self._activate_napp(username, napp_name, napp,
+                                register_listeners=False)
+        self._release_held_events(username, napp_name, holder, napp)
         return 200
 
+    def _release_held_events(self, username, napp_name, holder, napp):
+        """Replace the holding listeners and replay the held events.
+
+        Args:
+            holder (:class:`~kytos.core.events.EventHolder`): Events held
+                while the NApp was reloaded.
+            napp (KytosNApp): New instance, or None if it failed to load.
+        """
+        listeners = {}
+        unhandled = 0
+
+        def swap():
+            nonlocal listeners
+            for pattern, listener in holder.listeners.items():
+                pattern_listeners = self.events_listeners[pattern]
+                pattern_listeners.remove(listener)
+                if not pattern_listeners:
+                    del self.events_listeners[pattern]
+            if napp is not None:
+                listeners = self._register_listeners(napp)
+
+        def deliver(pattern, event):
+            nonlocal unhandled
+            if pattern not in listeners:
+                unhandled += 1
+            for listener in listeners.get(pattern, ()):
+                listener(event)
+
+        report = holder.release(deliver, swap)
+        report['replayed'] -= unhandled
+        report['dropped'] += unhandled
+        napp_id = NApp(username, napp_name).id
+        self.napps_reload_reports[napp_id] = report
+        RELOAD_REPLAYED.labels(napp_id).inc(report['replayed'])
+        RELOAD_DROPPED.labels(napp_id).inc(report['dropped'])
+        RELOAD_PAUSED.labels(napp_id).inc(report['paused_seconds'])
+        log = self.log.warning if report['dropped'] else self.log.info
+        log("Events of NApp '%s' held for %.3fs while reloading: %s "
+            "replayed, %s dropped", napp_id, report['paused_seconds'],
+            report['replayed'], report['dropped'])
+
     def rest_reload_napp(self, username, napp_name):
         """Request reload a NApp."""
         res = self.reload_napp(username, napp_name)
@@ -894,3 +1389,41 @@ class Controller:
         for napp in self.napps:
             self.reload_napp(*napp)
         return 'reloaded', 200
+
+    def rest_listeners_profile(self, action=None):
+        """Return, enable, disable or reset the listeners profile.
+
+        Args:
+            action (str): ``enable``, ``disable`` or ``reset``. If None, only
+                return the profile.
+
+        Returns:
+            tuple: JSON with the profile and the HTTP status code.
+
+        """
+        profiler = self.listener_profiler
+        if action == 'enable':
+            profiler.enable(self.events_listeners)
+        elif action == 'disable':
+            profiler.disable(self.events_listeners)
+        elif action == 'reset':
+            profiler.reset()
+        elif action is not None:
+            return json.dumps({'response': f'Invalid action {action}'}), 400
+        return json.dumps(profiler.as_dict()), 200
+
+    def rest_traces(self, trace_format='chrome'):
+        """Return the spans of the sampled events.
+
+        Args:
+            trace_format (str): ``chrome`` or ``otlp``.
+
+        Returns:
+            tuple: JSON with the spans and the HTTP status code.
+
+        """
+        if trace_format not in TRACE_FORMATS:
+            response = {'response': f'Invalid format {trace_format}'}
+            return json.dumps(response), 400
+        content = getattr(self.tracer, f'to_{trace_format}')()
+        return json.dumps(content), 200
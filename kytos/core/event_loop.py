@@ -0,0 +1,85 @@
+"""Selection of the asyncio event loop implementation.
+
+The ``event_loop`` option chooses the loop used by kytosd and its workers:
+
+- ``asyncio``: the default selector loop of the standard library;
+- ``uvloop``: the libuv based loop of the `uvloop` package, which handles
+  connections and reads faster (``pip install uvloop``);
+- ``auto``: uvloop if it is installed, else asyncio.
+
+The policy is set before any loop is created, so the controller, its
+buffers and their janus queues and the TCP server all use the same loop.
+"""
+import asyncio
+import logging
+
+__all__ = ('LOOPS', 'available_loops', 'get_loop_policy',
+           'select_event_loop')
+
+LOG = logging.getLogger(__name__)
+
+#: tuple: Valid values of the ``event_loop`` option.
+LOOPS = ('asyncio', 'uvloop', 'auto')
+
+
+def _import_uvloop():
+    """Return the uvloop module, or None if it is not installed."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def available_loops():
+    """Return the names of the loop implementations that can be used."""
+    if _import_uvloop() is None:
+        return ['asyncio']
+    return ['asyncio', 'uvloop']
+
+
+def get_loop_policy(name):
+    """Return the loop implementation name and its event loop policy.
+
+    Args:
+        name (str): One of :data:`LOOPS`. If uvloop is not installed,
+            asyncio is used instead.
+
+    Returns:
+        tuple: Name of the implementation used and a new
+        :class:`asyncio.AbstractEventLoopPolicy`.
+
+    Raises:
+        ValueError: If ``name`` is not one of :data:`LOOPS`.
+
+    """
+    if name not in LOOPS:
+        raise ValueError(f'Unknown event loop {name!r}; use one of '
+                         f'{", ".join(LOOPS)}')
+    if name != 'asyncio':
+        uvloop = _import_uvloop()
+        if uvloop is not None:
+            return 'uvloop', uvloop.EventLoopPolicy()
+        if name == 'uvloop':
+            LOG.warning('uvloop is not installed; using the asyncio event '
+                        'loop')
+    return 'asyncio', asyncio.DefaultEventLoopPolicy()
+
+
+def select_event_loop(name):
+    """Set the event loop policy, before any loop is created.
+
+    The current policy is kept if it is already of the selected type.
+
+    Args:
+        name (str): One of :data:`LOOPS`.
+
+    Returns:
+        str: Name of the implementation used.
+
+    """
+    loop_name, policy = get_loop_policy(name)
+    if type(asyncio.get_event_loop_policy()) is not type(policy):
+        asyncio.set_event_loop_policy(policy)
+    return loop_name
@@ -1,6 +1,44 @@
 """Module with Kytos Events."""
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from threading import Lock
 
-from kytos.core.helpers import now
+__all__ = ('EventHolder', 'EventListeners', 'KytosEvent')
+
+# time.monotonic_ns() is not available before Python 3.7
+_monotonic_ns = getattr(time, 'monotonic_ns',
+                        lambda: int(time.monotonic() * 1e9))
+
+
+class _WallOffset:
+    """Seconds to add to the monotonic clock to get the Unix time.
+
+    The offset is measured again once a minute, so that timestamps follow
+    the adjustments of the wall clock, e.g. by NTP, a minute later at most.
+    """
+
+    #: int: Nanoseconds between two measures of the offset.
+    TTL_NS = 60 * 10 ** 9
+
+    def __init__(self):
+        """Measure the offset on the first call."""
+        self.seconds = 0.0
+        self.measured_ns = None
+
+    def __call__(self):
+        """Return the offset, measured again if it is older than a minute."""
+        now_ns = _monotonic_ns()
+        if (self.measured_ns is None
+                or now_ns - self.measured_ns >= self.TTL_NS):
+            self.seconds = time.time() - now_ns / 1e9
+            self.measured_ns = now_ns
+        return self.seconds
+
+
+_wall_offset = _WallOffset()
 
 
 class KytosEvent:
@@ -8,8 +46,17 @@ class KytosEvent:
 
     The event data will be passed in the `content` attribute, which should be a
     dictionary.
+
+    Events are created for every message received from the network, so their
+    construction is kept cheap: attributes are slotted, names are interned
+    and the creation time is a monotonic clock reading, in nanoseconds,
+    converted to a :class:`~datetime.datetime` only when :attr:`timestamp` is
+    read. Other attributes may still be set, e.g. by NApps.
     """
 
+    __slots__ = ('name', 'content', 'created_ns', 'trace', '_timestamp',
+                 '__dict__')
+
     def __init__(self, name=None, content=None):
         """Create an event to be published.
 
@@ -18,9 +65,34 @@ class KytosEvent:
                            the name of the napp.
             content (dict): Dictionary with any extra data for the event.
         """
-        self.name = name
+        # pylint: disable=unidiomatic-typecheck
+        # sys.intern() does not accept str subclasses
+        self.name = sys.intern(name) if type(name) is str else name
         self.content = content if content is not None else {}
-        self.timestamp = now()
+        #: int: Monotonic clock reading, in nanoseconds, when the event was
+        #: created. Use it to measure how long ago the event was created.
+        self.created_ns = _monotonic_ns()
+        #: Trace context, set by :mod:`kytos.core.tracing` when the event
+        #: is sampled.
+        self.trace = None
+        self._timestamp = None
+
+    @property
+    def timestamp(self):
+        """Return the UTC :class:`~datetime.datetime` of the event creation.
+
+        It is computed from :attr:`created_ns` on the first access, so it is
+        approximate: it may be off by the wall clock adjustments of the last
+        minute or made since the event was created.
+        """
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(
+                _wall_offset() + self.created_ns / 1e9, timezone.utc)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
 
     def __str__(self):
         return self.name
@@ -69,3 +141,174 @@ class KytosEvent:
             return self.content['message']
         except KeyError:
             return None
+
+
+class EventListeners(dict):
+    """Lists of listeners indexed by event name pattern.
+
+    Patterns are regular expressions matched against the whole event name.
+    The lists of listeners that match each event name are cached, so the
+    patterns are only matched the first time an event name is dispatched.
+    Adding or removing a pattern clears the cache; listeners added to or
+    removed from an existing list are seen without clearing it.
+    """
+
+    #: int: Event names cached before the cache is cleared.
+    MAX_ROUTES = 4096
+
+    def __init__(self, *args, **kwargs):
+        """Create the listeners dict and an empty cache."""
+        super().__init__(*args, **kwargs)
+        self._routes = {}
+
+    @staticmethod
+    def match(pattern, name):
+        """Return whether the event ``name`` matches ``pattern``."""
+        # Do not match if the event has more characters
+        # e.g. "shutdown" won't match "shutdown.kytos/of_core"
+        if pattern[-1] != '$' or pattern[-2] == '\\':
+            pattern += '$'
+        return re.match(pattern, name) is not None
+
+    def get_listeners(self, name):
+        """Return the lists of listeners of the patterns matching ``name``.
+
+        Returns:
+            tuple: Lists of listeners, in the order their patterns were
+            added.
+
+        """
+        routes = self._routes
+        try:
+            return routes[name]
+        except KeyError:
+            pass
+        listeners = tuple(pattern_listeners for pattern, pattern_listeners
+                          in list(self.items())
+                          if self.match(pattern, name))
+        # A new cache may have replaced ``routes`` in the meantime, so stale
+        # results are never stored in the current one.
+        if len(routes) >= self.MAX_ROUTES:
+            routes.clear()
+        routes[name] = listeners
+        return listeners
+
+    def has_listeners(self, name):
+        """Return whether an event named ``name`` would reach any listener.
+
+        It is answered from the same cache as :meth:`get_listeners`, so
+        producers can check it for each event they would create. Listeners
+        added to or removed from the matching patterns are seen at once.
+        """
+        return any(self.get_listeners(name))
+
+    def _clear_routes(self):
+        """Replace the cache after a pattern was added or removed."""
+        self._routes = {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._clear_routes()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._clear_routes()
+
+    def setdefault(self, key, default=None):
+        """Add ``key`` with ``default`` if missing and return its value."""
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, *args):
+        """Remove a pattern and return its listeners."""
+        result = super().pop(*args)
+        self._clear_routes()
+        return result
+
+    def popitem(self):
+        """Remove the last added pattern and its listeners."""
+        result = super().popitem()
+        self._clear_routes()
+        return result
+
+    def update(self, *args, **kwargs):
+        """Add or replace patterns and their listeners."""
+        super().update(*args, **kwargs)
+        self._clear_routes()
+
+    def clear(self):
+        """Remove all patterns."""
+        super().clear()
+        self._clear_routes()
+
+
+class EventHolder:
+    """Hold the events of some patterns while their listeners are replaced.
+
+    The listeners returned by :meth:`listener` are added to the patterns of
+    a NApp being reloaded. They keep the events, up to ``max_events``, until
+    :meth:`release` replays them to the listeners of the new instance.
+    Events received afterwards by the holding listeners, e.g. by a handler
+    that got the listeners before they were replaced, are delivered
+    directly.
+    """
+
+    def __init__(self, max_events):
+        """Start holding events.
+
+        Args:
+            max_events (int): Events held; the next ones are dropped.
+        """
+        self.max_events = max_events
+        #: dict: Holding listener of each pattern.
+        self.listeners = {}
+        #: int: Events dropped because ``max_events`` were held.
+        self.dropped = 0
+        self.started_at = time.monotonic()
+        self._events = []
+        self._deliver = None
+        self._lock = Lock()
+
+    def listener(self, pattern):
+        """Return the listener holding the events of ``pattern``."""
+        if pattern not in self.listeners:
+            self.listeners[pattern] = partial(self._hold, pattern)
+        return self.listeners[pattern]
+
+    def _hold(self, pattern, event):
+        """Keep an event, or deliver it if the events were released."""
+        with self._lock:
+            if self._deliver is None:
+                if len(self._events) < self.max_events:
+                    self._events.append((pattern, event))
+                else:
+                    self.dropped += 1
+                return
+        self._deliver(pattern, event)
+
+    def release(self, deliver, swap=None):
+        """Replay the held events and deliver the next ones directly.
+
+        Args:
+            deliver (callable): Function called with the pattern and each
+                event, in the order they were received.
+            swap (callable): Function replacing the holding listeners by
+                the new ones, called before the events are replayed and
+                while no event can be held.
+
+        Returns:
+            dict: Seconds the events were held, events replayed and
+            events dropped.
+
+        """
+        with self._lock:
+            if swap is not None:
+                swap()
+            for pattern, event in self._events:
+                deliver(pattern, event)
+            self._deliver = deliver
+            replayed, self._events = len(self._events), []
+        return {'paused_seconds': time.monotonic() - self.started_at,
+                'replayed': replayed, 'dropped': self.dropped}
@@ -1,8 +1,16 @@
 """Utilities functions used in Kytos."""
 from datetime import datetime, timezone
+from functools import partial, wraps
 from threading import Thread
+from weakref import WeakSet
 
-__all__ = ['listen_to', 'now', 'run_on_thread', 'get_time']
+from kytos.core.process_pool import PROCESS_POOL, register
+
+__all__ = ['listen_to', 'now', 'run_on_thread', 'run_in_process',
+           'get_thread_target', 'get_time', 'running_handlers']
+
+#: WeakSet: Threads started by :func:`run_on_thread` handlers.
+_HANDLER_THREADS = WeakSet()
 
 
 # APP_MSG = "[App %s] %s | ID: %02d | R: %02d | P: %02d | F: %s"
@@ -65,6 +73,7 @@ def listen_to(event, *events):
 
         """
         @run_on_thread
+        @wraps(handler)
         def threaded_handler(*args):
             """Decorate the handler to run from a new thread."""
             handler(*args)
@@ -98,9 +107,11 @@ def run_on_thread(method):
     Returns:
         Decorated method that will run inside a new thread.
         When the decorated method is called, it will not return the created
-        thread to the caller.
+        thread to the caller. The original method is kept in its
+        ``__wrapped__`` attribute and its name is preserved.
 
     """
+    @wraps(method)
     def threaded_method(*args):
         """Ensure the handler method runs inside a new thread."""
         thread = Thread(target=method, args=args)
@@ -109,9 +120,74 @@ def run_on_thread(method):
         # to finish when exiting Kytos
         thread.daemon = True
         thread.start()
+        _HANDLER_THREADS.add(thread)
+    threaded_method.thread_target = method
     return threaded_method
 
 
+def running_handlers():
+    """Return the threads of :func:`run_on_thread` handlers still running.
+
+    The controller waits for them when draining the buffers at shutdown.
+    """
+    return [thread for thread in list(_HANDLER_THREADS) if thread.is_alive()]
+
+
+def run_in_process(result_event=None):
+    """Decorate a CPU-bound function to run in the Kytos process pool.
+
+    The decorated function must be defined at module level or be a static
+    method, and its arguments and result must be picklable. See
+    :mod:`kytos.core.process_pool`.
+
+    Args:
+        result_event (str): Name of the event sent to the app buffer with
+            the result, if any.
+
+    Returns:
+        A function that returns a :class:`~concurrent.futures.Future` of the
+        result when called. The original function is kept in its
+        ``__wrapped__`` attribute.
+
+    """
+    def decorator(function):
+        """Register the function to be called by name in the pool."""
+        register(function)
+
+        @wraps(function)
+        def process_method(*args, **kwargs):
+            """Submit the call to the process pool."""
+            return PROCESS_POOL.submit(function, args, kwargs,
+                                       result_event=result_event)
+        return process_method
+
+    return decorator
+
+
+def get_thread_target(listener):
+    """Return the function run in a new thread by a threaded listener.
+
+    Listener wrappers, like the ones used for profiling, may provide their
+    own ``get_thread_target`` method.
+
+    Args:
+        listener (callable): Function or bound method, usually decorated with
+            :func:`run_on_thread` or :func:`listen_to`.
+
+    Returns:
+        callable: Function that runs the listener body in the calling thread,
+        or None if the listener does not start a new thread.
+
+    """
+    if hasattr(type(listener), 'get_thread_target'):
+        return listener.get_thread_target()
+    function = getattr(listener, '__func__', listener)
+    target = getattr(function, '__dict__', {}).get('thread_target')
+    if target is not None and hasattr(listener, '__self__'):
+        return partial(target, listener.__self__)
+    return target
+
+
 def get_time(data=None):
     """Receive a dictionary or a string and return a datatime instance.
 
@@ -2,29 +2,44 @@
 """Start Kytos SDN Platform core."""
 import asyncio
 import functools
+import logging
 import os
 import signal
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import daemon
-from IPython.terminal.embed import InteractiveShellEmbed
-from IPython.terminal.prompts import Prompts, Token
-from traitlets.config.loader import Config
 
 from kytos.core import Controller
 from kytos.core.config import KytosConfig
+from kytos.core.event_loop import select_event_loop
 from kytos.core.metadata import __version__
+from kytos.core.profiling import StartupProfiler
+from kytos.core.workers import WorkerPool, reuse_port_supported
 
 BASE_ENV = Path(os.environ.get('VIRTUAL_ENV', '/'))
 
+LOG = logging.getLogger(__name__)
 
-class KytosPrompt(Prompts):
-    """Configure Kytos prompt for interactive shell."""
 
-    def in_prompt_tokens(self):
-        """Kytos IPython prompt."""
-        return [(Token.Prompt, 'kytos $> ')]
+def _get_prompt_class():
+    """Return the Kytos prompt class for the interactive shell.
+
+    IPython is only imported when the shell is started, which is not the
+    case when running as a daemon.
+    """
+    # pylint: disable=import-outside-toplevel
+    from IPython.terminal.prompts import Prompts, Token
+
+    class KytosPrompt(Prompts):
+        """Configure Kytos prompt for interactive shell."""
+
+        def in_prompt_tokens(self):
+            """Kytos IPython prompt."""
+            return [(Token.Prompt, 'kytos $> ')]
+
+    return KytosPrompt
 
 
 def _create_pid_dir():
@@ -36,7 +51,14 @@ def _create_pid_dir():
 
 
 def start_shell(controller=None):
-    """Load Kytos interactive shell."""
+    """Load Kytos interactive shell.
+
+    IPython is imported here so that it is not loaded in daemon mode.
+    """
+    # pylint: disable=import-outside-toplevel
+    from IPython.terminal.embed import InteractiveShellEmbed
+    from traitlets.config.loader import Config
+
     kytos_ascii = r"""
       _          _
      | |        | |
@@ -83,7 +105,7 @@ def start_shell(controller=None):
     ipshell = InteractiveShellEmbed(config=cfg,
                                     banner1=banner1,
                                     exit_msg=exit_msg)
-    ipshell.prompts = KytosPrompt(ipshell)
+    ipshell.prompts = _get_prompt_class()(ipshell)
 
     ipshell()
 
@@ -94,23 +116,72 @@ def start_shell(controller=None):
 #     from concurrent.futures import thread, ThreadPoolExecutor
 #     atexit.unregister(thread._python_exit)
 
-def main():
-    """Read config and start Kytos in foreground or daemon mode."""
+def main(imports_started_at=None):
+    """Read config and start Kytos in foreground or daemon mode.
+
+    Args:
+        imports_started_at (float): :func:`time.perf_counter` value taken
+            before importing Kytos, used to profile the imports phase.
+    """
     # data_files is not enough when installing from PyPI
 
     _create_pid_dir()
 
-    config = KytosConfig().options['daemon']
+    profiler = StartupProfiler()
+    if imports_started_at is not None:
+        profiler.add('imports', time.perf_counter() - imports_started_at)
+    with profiler.phase('config'):
+        config = KytosConfig().options['daemon']
+    profiler.enabled = config.profile_startup
+    # Set before any loop is created, including the ones of the workers
+    config.event_loop = select_event_loop(config.event_loop)
 
     if config.foreground or not config.daemon:
-        async_main(config)
+        async_main(config, profiler)
     else:
         with daemon.DaemonContext():
-            async_main(config)
+            async_main(config, profiler)
+
+
+def _create_workers(config):
+    """Return the worker processes if more than one process is configured.
+
+    They are started by the controller, once the NApps are installed.
 
+    Returns:
+        :class:`~kytos.core.workers.WorkerPool`: Workers or None.
+
+    """
+    if config.workers <= 1:
+        return None
+    if not reuse_port_supported():
+        LOG.warning('SO_REUSEPORT is not supported; starting a single '
+                    'process.')
+        return None
+    return WorkerPool(config.workers, _run_worker)
+
+
+def _run_worker(config, channel):
+    """Run the controller of a worker process in a new event loop."""
+    select_event_loop(config.event_loop)
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    async_main(config, workers=channel)
+
+
+def async_main(config, profiler=None, workers=None):
+    """Start main Kytos Daemon with asyncio loop.
+
+    Args:
+        config: Options parsed by :class:`~kytos.core.config.KytosConfig`.
+        profiler (:class:`~kytos.core.profiling.StartupProfiler`):
+            Profiler to record the startup phases, if any.
+        workers: :class:`~kytos.core.workers.WorkerChannel` when running
+            in a worker process. Otherwise, the worker processes are created
+            here, if configured.
+    """
+    if workers is None:
+        workers = _create_workers(config)
 
-def async_main(config):
-    """Start main Kytos Daemon with asyncio loop."""
     def stop_controller(controller):
         """Stop the controller before quitting."""
         loop = asyncio.get_event_loop()
@@ -122,22 +193,26 @@ def async_main(config):
         # disable_threadpool_exit()
 
         controller.log.info("Stopping Kytos controller...")
-        controller.stop()
+        return loop.create_task(controller.stop_async())
 
     async def start_shell_async():
         """Run the shell inside a thread and stop controller when done."""
         _start_shell = functools.partial(start_shell, controller)
         data = await loop.run_in_executor(executor, _start_shell)
         executor.shutdown()
-        stop_controller(controller)
+        await stop_controller(controller)
         return data
 
     loop = asyncio.get_event_loop()
 
-    controller = Controller(config)
+    controller = Controller(config, profiler=profiler, workers=workers)
 
     kill_handler = functools.partial(stop_controller, controller)
-    loop.add_signal_handler(signal.SIGINT, kill_handler)
+    if controller.worker_index:
+        # Workers are stopped by the coordinator, with SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    else:
+        loop.add_signal_handler(signal.SIGINT, kill_handler)
     loop.add_signal_handler(signal.SIGTERM, kill_handler)
 
     if controller.options.debug:
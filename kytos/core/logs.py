@@ -1,25 +1,40 @@
 """Handle logs displayed by Kytos SDN Platform."""
-import inspect
+import atexit
+import copy
+import json
 import logging
 import re
+import sys
 from configparser import RawConfigParser
 # noqa so it does not conflict with grouped imports
 # pylint: disable=ungrouped-imports
 from logging import Formatter, config, getLogger
+from logging.handlers import QueueHandler, QueueListener
 # pylint: enable=ungrouped-imports
 from pathlib import Path
+from queue import Queue
+from weakref import WeakSet
 
 from kytos.core.websocket import WebSocketHandler
 
-__all__ = ('LogManager', 'NAppLog')
+__all__ = ('JSONFormatter', 'LevelGuard', 'LogManager', 'NAppLog')
 LOG = getLogger(__name__)
 
+#: WeakSet: LevelGuard instances refreshed when levels are changed.
+_GUARDS = WeakSet()
+
 
 class LogManager:
     """Manage handlers for all loggers."""
 
     _PARSER = RawConfigParser()
     _DEFAULT_FMT = 'formatter_console'
+    #: tuple: Sections of the loggers set to DEBUG in debug mode.
+    _DEBUG_SECTIONS = ('logger_root', 'logger_kytos', 'logger_api_server')
+    #: dict: Levels of the debug mode loggers in the config file.
+    _CONFIG_LEVELS = {}
+    _json_listener = None
+    _json_handler = None
 
     @classmethod
     def load_config_file(cls, config_file, debug='False'):
@@ -34,8 +49,13 @@ class LogManager:
         """
         if Path(config_file).exists():
             cls._PARSER.read(config_file)
+            cls._CONFIG_LEVELS = {
+                section: cls._PARSER.get(section, 'level', fallback='NOTSET')
+                for section in cls._DEBUG_SECTIONS
+                if cls._PARSER.has_section(section)}
             cls._set_debug_mode(debug)
             cls._use_config_file(config_file)
+            cls.refresh_guards()
         else:
             LOG.warning('Log config file "%s" does not exist. Using default '
                         'Python logging configuration.',
@@ -49,6 +69,102 @@ class LogManager:
             cls._PARSER.set('logger_api_server', 'level', 'DEBUG')
             LOG.info('Setting log configuration with debug mode.')
 
+    @classmethod
+    def set_debug(cls, debug=True):
+        """Enable or disable debug mode without reloading the config file.
+
+        Only the levels of the debug mode loggers are changed, so handlers
+        added after the config file was loaded, e.g. the web socket one,
+        are kept.
+
+        Args:
+            debug (bool): True to set the loggers to DEBUG, False to restore
+                the levels from the config file.
+        """
+        sections = cls._CONFIG_LEVELS or {'logger_kytos': 'NOTSET'}
+        for section, level in sections.items():
+            if section == 'logger_root':
+                name = None
+            else:
+                name = cls._PARSER.get(section, 'qualname', fallback='kytos')
+            cls.set_level(name, 'DEBUG' if debug else level)
+        LOG.info('Debug mode %s.', 'enabled' if debug else 'disabled')
+
+    @classmethod
+    def set_level(cls, name, level):
+        """Set the level of a logger and refresh the level guards.
+
+        Use this method instead of ``Logger.setLevel`` so the cached levels
+        of :class:`LevelGuard` instances are kept up to date.
+
+        Args:
+            name (str): Logger name or None for the root logger.
+            level (int, str): New logger level.
+        """
+        getLogger(name).setLevel(level)
+        cls.refresh_guards()
+
+    @staticmethod
+    def add_guard(guard):
+        """Keep ``guard`` levels updated when loggers levels change."""
+        _GUARDS.add(guard)
+
+    @staticmethod
+    def refresh_guards():
+        """Update the cached levels of all :class:`LevelGuard` instances."""
+        for guard in list(_GUARDS):
+            guard.refresh()
+
+    @classmethod
+    def enable_json_logs(cls, filename):
+        """Write logs as JSON lines to ``filename`` from a background thread.
+
+        Logging threads only put records in a queue. Formatting and writing
+        are done by a :class:`logging.handlers.QueueListener` thread.
+
+        Args:
+            filename (str): File to append the JSON records to.
+
+        Returns:
+            logging.handlers.QueueHandler: Handler added to the loggers.
+
+        """
+        cls.disable_json_logs()
+        file_handler = logging.FileHandler(filename)
+        file_handler.setFormatter(JSONFormatter())
+        records = Queue()
+        cls._json_handler = _StructuredQueueHandler(records)
+        cls._json_listener = QueueListener(records, file_handler)
+        cls._json_listener.start()
+        atexit.register(cls.disable_json_logs)
+        for logger in cls._get_top_loggers():
+            logger.addHandler(cls._json_handler)
+        return cls._json_handler
+
+    @staticmethod
+    def _get_top_loggers():
+        """Return the root logger and the kytos one if it doesn't propagate.
+
+        In the default logging.ini, kytos loggers do not propagate to the
+        root one.
+        """
+        kytos_logger = getLogger('kytos')
+        if kytos_logger.propagate:
+            return [getLogger()]
+        return [getLogger(), kytos_logger]
+
+    @classmethod
+    def disable_json_logs(cls):
+        """Stop writing JSON logs, flushing the queued records."""
+        listener, cls._json_listener = cls._json_listener, None
+        if listener is None:
+            return
+        for logger in (getLogger(), getLogger('kytos')):
+            logger.removeHandler(cls._json_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
     @classmethod
     def _use_config_file(cls, config_file):
         """Use parsed logging configuration."""
@@ -123,6 +239,86 @@ for root_handler in logging.root.handlers:
         root_handler.addFilter(HANDLER_FILTER)
 
 
+class LevelGuard:
+    """Cached level checks of a logger for hot code paths.
+
+    ``Logger.debug`` looks up the effective level on every call, even when
+    the message is discarded. Hot paths can check a plain attribute instead:
+
+    .. code-block:: python3
+
+        LOG = logging.getLogger(__name__)
+        LOG_LEVELS = LevelGuard(LOG)
+
+        if LOG_LEVELS.debug:
+            LOG.debug('Event %s received', event.name)
+
+    The attributes are refreshed by :class:`LogManager` whenever it changes
+    levels, e.g. by :meth:`LogManager.set_level` or when toggling debug.
+    """
+
+    __slots__ = ('logger', 'debug', 'info', '__weakref__')
+
+    def __init__(self, logger):
+        """Cache the enabled levels of ``logger``.
+
+        Args:
+            logger (logging.Logger): Logger to be checked.
+        """
+        self.logger = logger
+        self.debug = self.info = False
+        self.refresh()
+        LogManager.add_guard(self)
+
+    def refresh(self):
+        """Check the logger levels again."""
+        self.debug = self.logger.isEnabledFor(logging.DEBUG)
+        self.info = self.logger.isEnabledFor(logging.INFO)
+
+
+class JSONFormatter(Formatter):
+    """Format records as one JSON object per line.
+
+    Besides time, level, logger, thread and message, the object has the
+    attributes given in the ``extra`` argument of the logging call, e.g.
+    ``log.info('Flow added', extra={'dpid': dpid})``.
+    """
+
+    #: frozenset: Attributes of every LogRecord, not copied as extra fields.
+    RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (),
+                                                    None))) | {'message'}
+
+    def format(self, record):
+        """Return the record as a JSON string."""
+        data = {'time': record.created,
+                'level': record.levelname,
+                'logger': record.name,
+                'thread': record.threadName,
+                'message': record.getMessage()}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc_info'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in self.RECORD_ATTRS:
+                data[key] = value
+        return json.dumps(data, default=str)
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """Queue records without formatting them in the logging thread."""
+
+    def prepare(self, record):
+        """Merge args and traceback into the record so it can be queued."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class NAppLog:
     """High-level logger for NApp devs.
 
@@ -136,23 +332,59 @@ class NAppLog:
     NApp is found, use the root logger.
 
     As any NApp can use this logger, its name is detected in every call by
-    inspecting the caller's stack. If no NApp is found, use the root logger.
+    walking the caller's frames. If no NApp is found, use the root logger.
+    Logging methods of disabled levels return a function that does nothing,
+    so e.g. ``log.debug(...)`` costs little more than the NApp detection.
     """
 
     def __getattribute__(self, name):
         """Detect NApp ID and use its logger."""
-        napp_id = _detect_napp_id()
-        logger = getLogger(f"kytos.napps")
+        logger = _get_logger(_detect_napp_id())
+        level = _METHOD_LEVELS.get(name)
+        if level is not None and not logger.isEnabledFor(level):
+            return _disabled
+        return getattr(logger, name)
+
+
+#: Detect NApp ID from filename
+NAPP_ID_RE = re.compile(r'.*napps/(.*?)/(.*?)/')
+
+#: Levels of the logging methods that can be skipped when disabled.
+_METHOD_LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO,
+                  'warning': logging.WARNING, 'warn': logging.WARNING,
+                  'error': logging.ERROR, 'exception': logging.ERROR,
+                  'critical': logging.CRITICAL, 'fatal': logging.CRITICAL}
+
+#: dict: NApp ID, or None, of each source file seen in the callers' frames.
+_NAPP_IDS = {__file__: None}
+#: dict: NApp loggers indexed by NApp ID. None is the ``kytos.napps`` one.
+_LOGGERS = {}
 
-        # if napp_id is detected, get the napp logger.
+
+def _disabled(*_args, **_kwargs):
+    """Replace logging methods of disabled levels."""
+
+
+def _get_logger(napp_id):
+    """Return the logger of a NApp, or ``kytos.napps`` if napp_id is None."""
+    try:
+        return _LOGGERS[napp_id]
+    except KeyError:
+        logger = getLogger("kytos.napps")
         if napp_id:
             logger = logger.getChild(napp_id)
-
-        return logger.__getattribute__(name)
+        return _LOGGERS.setdefault(napp_id, logger)
 
 
-#: Detect NApp ID from filename
-NAPP_ID_RE = re.compile(r'.*napps/(.*?)/(.*?)/')
+def _get_napp_id(filename):
+    """Return the NApp ID of a source file or None if it is not a NApp's."""
+    try:
+        return _NAPP_IDS[filename]
+    except KeyError:
+        match = NAPP_ID_RE.match(filename)
+        napp_id = '/'.join(match.groups()) if match else None
+        _NAPP_IDS[filename] = napp_id
+        return napp_id
 
 
 def _detect_napp_id():
@@ -161,13 +393,19 @@ def _detect_napp_id():
     We use the last innermost NApp because a NApp *A* may call a NApp *B* and,
     when *B* uses the logger, the logger's name should be *B*.
 
+    Frames are walked from the innermost one and the NApp ID of each source
+    file is cached, so the stack is neither copied nor matched against
+    :data:`NAPP_ID_RE` more than once per file.
+
     Returns:
         str, None: NApp ID or None if no NApp is found in the caller's stack.
 
     """
-    for frame in inspect.stack():
-        if not frame.filename == __file__:
-            match = NAPP_ID_RE.match(frame.filename)
-            if match:
-                return '/'.join(match.groups())
+    # pylint: disable=protected-access
+    frame = sys._getframe(1)
+    while frame is not None:
+        napp_id = _get_napp_id(frame.f_code.co_filename)
+        if napp_id:
+            return napp_id
+        frame = frame.f_back
     return None
@@ -0,0 +1,386 @@
+"""Lightweight metrics exported in the Prometheus text format.
+
+Kytos core and NApps create metrics in :data:`REGISTRY`, which is also
+available as ``controller.metrics``. Metrics are kept in memory and
+rendered by the ``/api/kytos/core/metrics`` endpoint.
+
+Example of usage in a NApp:
+
+.. code-block:: python3
+
+    flows = self.controller.metrics.counter(
+        'flow_manager_flows_sent_total', 'Flows sent to switches.',
+        ['dpid'])
+    flows.labels(switch.dpid).inc()
+
+Updating a metric does not take any lock: each thread adds to its own cell
+and the cells are summed when the metrics are collected.
+"""
+import math
+import re
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
+from threading import Lock, get_ident
+
+__all__ = ('Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'REGISTRY')
+
+NAME_RE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+
+
+class _Cells:
+    """Per-thread values summed on read."""
+
+    __slots__ = ('_cells',)
+
+    def __init__(self):
+        self._cells = {}
+
+    def add(self, amount):
+        """Add ``amount`` to the cell of the current thread."""
+        # Only the current thread writes to its own key, so no lock is needed
+        cells = self._cells
+        ident = get_ident()
+        cells[ident] = cells.get(ident, 0) + amount
+
+    def get(self):
+        """Return the sum of all cells."""
+        return sum(list(self._cells.values()))
+
+
+class _Metric(metaclass=ABCMeta):
+    """Base class of metrics with optional labels."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Validate the metric name and labels.
+
+        Args:
+            name (str): Metric name, e.g. ``kytos_buffer_events_total``.
+            documentation (str): Help text.
+            labelnames (iterable): Names of the labels, if any.
+
+        Raises:
+            ValueError: If the name or a label name is invalid.
+
+        """
+        for metric_name in (name, *labelnames):
+            if not NAME_RE.match(metric_name):
+                raise ValueError(f'Invalid metric or label name: '
+                                 f'{metric_name}')
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = Lock()
+        self._unlabeled = None
+
+    def labels(self, *values):
+        """Return the child metric with the given label values.
+
+        Keep the returned child to update it in hot code paths, so the label
+        values are not looked up every time.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}')
+        values = tuple(str(value) for value in values)
+        try:
+            return self._children[values]
+        except KeyError:
+            with self._lock:
+                return self._children.setdefault(values, self._new_child())
+
+    def remove(self, *values):
+        """Remove the child with the given label values, if any."""
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in values), None)
+
+    @abstractmethod
+    def _new_child(self):
+        """Return a new child metric."""
+
+    def _default(self):
+        """Return the child of a metric without labels."""
+        child = self._unlabeled
+        if child is None:
+            if self.labelnames:
+                raise ValueError(f'{self.name} has labels; use labels() '
+                                 f'first')
+            child = self._unlabeled = self.labels()
+        return child
+
+    def samples(self):
+        """Yield ``(suffix, labels, value)`` tuples of all children."""
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            for suffix, extra_labels, value in child.samples():
+                yield suffix, {**labels, **extra_labels}, value
+
+
+class _CounterChild:
+    """Counter value of a set of label values."""
+
+    __slots__ = ('_value',)
+
+    def __init__(self):
+        self._value = _Cells()
+
+    def inc(self, amount=1):
+        """Increment the counter by a non-negative amount."""
+        if amount < 0:
+            raise ValueError('Counters can only be incremented')
+        self._value.add(amount)
+
+    def get(self):
+        """Return the counter value."""
+        return self._value.get()
+
+    def samples(self):
+        """Yield the counter sample."""
+        yield '', {}, self.get()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value, e.g. events or bytes."""
+
+    type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Increment a counter without labels."""
+        self._default().inc(amount)
+
+    def get(self):
+        """Return the value of a counter without labels."""
+        return self._default().get()
+
+
+class _GaugeChild:
+    """Gauge value of a set of label values."""
+
+    __slots__ = ('_value', '_function')
+
+    def __init__(self):
+        self._value = _Cells()
+        self._function = None
+
+    def inc(self, amount=1):
+        """Increment the gauge."""
+        self._value.add(amount)
+
+    def dec(self, amount=1):
+        """Decrement the gauge."""
+        self._value.add(-amount)
+
+    def set(self, value):
+        """Set the gauge value."""
+        cells = _Cells()
+        cells.add(value)
+        self._value = cells
+
+    def set_function(self, function):
+        """Read the gauge value from ``function`` when it is collected."""
+        self._function = function
+
+    def get(self):
+        """Return the gauge value."""
+        if self._function is not None:
+            return self._function()
+        return self._value.get()
+
+    def samples(self):
+        """Yield the gauge sample."""
+        yield '', {}, self.get()
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. queue sizes or connections."""
+
+    type = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount=1):
+        """Increment a gauge without labels."""
+        self._default().inc(amount)
+
+    def dec(self, amount=1):
+        """Decrement a gauge without labels."""
+        self._default().dec(amount)
+
+    def set(self, value):
+        """Set the value of a gauge without labels."""
+        self._default().set(value)
+
+    def set_function(self, function):
+        """Read the value of a gauge without labels from ``function``."""
+        self._default().set_function(function)
+
+    def get(self):
+        """Return the value of a gauge without labels."""
+        return self._default().get()
+
+
+class _HistogramChild:
+    """Histogram buckets of a set of label values."""
+
+    __slots__ = ('_upper_bounds', '_cells')
+
+    def __init__(self, upper_bounds):
+        self._upper_bounds = upper_bounds
+        self._cells = {}
+
+    def observe(self, value):
+        """Count ``value`` in its bucket and add it to the sum."""
+        cells = self._cells
+        ident = get_ident()
+        cell = cells.get(ident)
+        if cell is None:
+            # buckets counts followed by the sum of the observed values
+            cell = cells[ident] = [0] * (len(self._upper_bounds) + 1)
+        cell[bisect_left(self._upper_bounds, value)] += 1
+        cell[-1] += value
+
+    def get(self):
+        """Return non-cumulative bucket counts, sum and count."""
+        buckets = [0] * len(self._upper_bounds)
+        total = 0
+        for cell in list(self._cells.values()):
+            for index, count in enumerate(cell[:-1]):
+                buckets[index] += count
+            total += cell[-1]
+        return buckets, total, sum(buckets)
+
+    def samples(self):
+        """Yield cumulative bucket samples, sum and count."""
+        buckets, total, count = self.get()
+        cumulative = 0
+        for upper_bound, bucket in zip(self._upper_bounds, buckets):
+            cumulative += bucket
+            yield '_bucket', {'le': _format_value(upper_bound)}, cumulative
+        yield '_sum', {}, total
+        yield '_count', {}, count
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. latencies in seconds."""
+
+    type = 'histogram'
+    DEFAULT_BUCKETS = (.0001, .0005, .001, .005, .01, .025, .05, .1, .25, .5,
+                       1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        """Create a histogram with the given bucket upper bounds.
+
+        Args:
+            name (str): Metric name.
+            documentation (str): Help text.
+            labelnames (iterable): Names of the labels, if any.
+            buckets (iterable): Bucket upper bounds. ``+Inf`` is added if
+                missing.
+        """
+        super().__init__(name, documentation, labelnames)
+        upper_bounds = sorted(buckets or self.DEFAULT_BUCKETS)
+        if upper_bounds[-1] != math.inf:
+            upper_bounds.append(math.inf)
+        self.upper_bounds = tuple(upper_bounds)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        """Observe a value in a histogram without labels."""
+        self._default().observe(value)
+
+    def get(self):
+        """Return buckets, sum and count of a histogram without labels."""
+        return self._default().get()
+
+
+class MetricsRegistry:
+    """Collection of metrics indexed by name."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._metrics = {}
+        self._lock = Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        """Return the metric called ``name``, creating it if necessary.
+
+        Raises:
+            ValueError: If a metric with the same name has another type.
+
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f'Metric {name} is already a {metric.type}')
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Return the counter called ``name``, creating it if necessary."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Return the gauge called ``name``, creating it if necessary."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=None):
+        """Return the histogram called ``name``, creating it if necessary."""
+        return self._get_or_create(Histogram, name, documentation,
+                                   labelnames, buckets=buckets)
+
+    def get(self, name):
+        """Return the metric called ``name`` or None."""
+        return self._metrics.get(name)
+
+    def unregister(self, name):
+        """Remove the metric called ``name``, e.g. when a NApp is unloaded."""
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def to_prometheus(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in sorted(list(self._metrics.items())):
+            documentation = metric.documentation.replace('\\', r'\\')
+            documentation = documentation.replace('\n', r'\n')
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{name}{suffix}{_format_labels(labels)} '
+                             f'{_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    """Return labels as ``{name="value",...}`` or an empty string."""
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = value.replace('\\', r'\\').replace('\n', r'\n')
+        value = value.replace('"', r'\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    """Return a sample value as expected by Prometheus."""
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+#: MetricsRegistry: Registry of the core and NApps metrics.
+REGISTRY = MetricsRegistry()
@@ -4,6 +4,7 @@ import logging
 import re
 import shutil
 from pathlib import Path
+from threading import Lock
 
 from kytos.core.napps import NApp
 
@@ -33,6 +34,16 @@ class NAppsManager:
 
         self._installed_path = self._enabled_path / '.installed'
 
+        #: dict: NApps found in each scanned path, indexed by NApp id.
+        #:
+        #: The key is the scanned path (enabled or installed) and the value is
+        #: a dict mapping ``username/name`` to a :class:`NApp` instance. It is
+        #: built on demand and dropped by :meth:`invalidate`, which is called
+        #: after every filesystem change made by this class and by
+        #: :class:`~kytos.core.napps.napp_dir_listener.NAppDirListener`.
+        self._index = {}
+        self._index_lock = Lock()
+
     def install(self, napp_uri, enable=True):
         """Install and enable a NApp from its repository.
 
@@ -59,6 +70,7 @@ class NAppsManager:
             if pkg_folder and pkg_folder.exists():
                 shutil.rmtree(str(pkg_folder))
 
+        self.invalidate()
         LOG.info("New NApp installed: %s", napp)
 
         napp = NApp.create_from_json(dst/'kytos.json')
@@ -79,8 +91,7 @@ class NAppsManager:
                         napp_id)
             return False
 
-        new_manager = NewNAppManager(self._installed_path)
-        napp = new_manager.napps[napp_id]
+        napp = self._get_index(self._installed_path)[napp_id]
         deps = napp.napp_dependencies
 
         if deps and napp.meta:
@@ -95,6 +106,7 @@ class NAppsManager:
                 installed.unlink()
             else:
                 shutil.rmtree(str(installed))
+            self.invalidate()
             LOG.info("NApp uninstalled: %s", napp_id)
         else:
             LOG.warning("Unable to uninstall NApp %s. Already uninstalled.",
@@ -108,8 +120,7 @@ class NAppsManager:
         enabled = self._enabled_path / napp_id
         installed = self._installed_path / napp_id
 
-        new_manager = NewNAppManager(self._installed_path)
-        napp = new_manager.napps[napp_id]
+        napp = self._get_index(self._installed_path)[napp_id]
         deps = napp.napp_dependencies
 
         if deps and napp.meta:
@@ -125,6 +136,7 @@ class NAppsManager:
             try:
                 # Create symlink
                 enabled.symlink_to(installed)
+                self.invalidate()
                 LOG.info("NApp enabled: %s", napp_id)
             except FileExistsError:
                 pass  # OK, NApp was already enabled
@@ -139,8 +151,7 @@ class NAppsManager:
         napp_id = "{}/{}".format(username, napp_name)
         enabled = self._enabled_path / napp_id
 
-        new_manager = NewNAppManager(self._installed_path)
-        napp = new_manager.napps[napp_id]
+        napp = self._get_index(self._installed_path)[napp_id]
         deps = napp.napp_dependencies
 
         if deps and napp.meta:
@@ -151,6 +162,7 @@ class NAppsManager:
 
         try:
             enabled.unlink()
+            self.invalidate()
             LOG.info("NApp disabled: %s", napp_id)
             if self._controller is not None:
                 self._controller.unload_napp(username, napp_name)
@@ -172,15 +184,35 @@ class NAppsManager:
     def is_enabled(self, username, napp_name):
         """Whether a NApp is enabled or not on this controller FS."""
         napp_id = "{}/{}".format(username, napp_name)
-
-        napp = NApp.create_from_uri(napp_id)
-        return napp in self.get_enabled_napps()
+        return napp_id in self._get_index(self._enabled_path)
 
     def is_installed(self, username, napp_name):
         """Whether a NApp is installed or not on this controller."""
         napp_id = "{}/{}".format(username, napp_name)
-        napp = NApp.create_from_uri(napp_id)
-        return napp in self.get_all_napps()
+        return napp_id in self._get_index(self._installed_path)
+
+    def invalidate(self):
+        """Drop the in-memory NApps index.
+
+        The next query rebuilds it from the filesystem. Call this method
+        whenever the enabled or installed NApps directories change outside
+        this class.
+        """
+        with self._index_lock:
+            self._index = {}
+
+    def _get_index(self, path):
+        """Return the NApps found in ``path`` indexed by NApp id.
+
+        Scan ``path`` only if it is not indexed yet.
+        """
+        with self._index_lock:
+            index = self._index.get(path)
+            if index is None:
+                index = {napp.id: napp
+                         for napp in self.get_napps_from_path(path)}
+                self._index[path] = index
+            return index
 
     @staticmethod
     def get_napp_fullname_from_uri(uri):
@@ -197,7 +229,7 @@ class NAppsManager:
 
     def get_enabled_napps(self):
         """Return all enabled NApps on this controller FS."""
-        enabled = self.get_napps_from_path(self._enabled_path)
+        enabled = list(self._get_index(self._enabled_path).values())
         for napp in enabled:
             # We should also check if the NApp is enabled on controller
             napp.enabled = True
@@ -211,7 +243,7 @@ class NAppsManager:
 
     def get_installed_napps(self):
         """Return all NApps installed on this controller FS."""
-        return self.get_napps_from_path(self._installed_path)
+        return list(self._get_index(self._installed_path).values())
 
     def get_napp_metadata(self, username, napp_name, key):
         """Return a value from kytos.json.
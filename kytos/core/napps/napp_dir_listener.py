@@ -14,6 +14,7 @@ class NAppDirListener(RegexMatchingEventHandler):
 
     regexes = [re.compile(r".*\/kytos\/napps\/[a-zA-Z][^/]+\/[a-zA-Z].*")]
     ignore_regexes = [re.compile(r".*\.installed")]
+    ignored_suffixes = ('.pyc', '__pycache__')
     _controller = None
 
     def __init__(self, controller):
@@ -44,6 +45,29 @@ class NAppDirListener(RegexMatchingEventHandler):
         self.observer.stop()
         LOG.info('NAppDirListener Stopped...')
 
+    def dispatch(self, event):
+        """Invalidate the NApps index and UI manifest and dispatch the event.
+
+        Any change in the NApps directory, including the ``.installed`` one
+        ignored by the handlers below, may add or remove a NApp or one of
+        its UI files, so the NApps index kept by
+        :class:`~kytos.core.napps.manager.NAppsManager` and the UI manifest
+        kept by :class:`~kytos.core.web_ui.UIAssets` are dropped before the
+        regex filtering takes place. Python bytecode changes are ignored.
+
+        Args:
+            event(watchdog.events.FileSystemEvent): Event received from an
+                observer.
+        """
+        if not event.src_path.endswith(self.ignored_suffixes):
+            napps_manager = getattr(self._controller, 'napps_manager', None)
+            if napps_manager is not None:
+                napps_manager.invalidate()
+            api_server = getattr(self._controller, 'api_server', None)
+            if api_server is not None:
+                api_server.ui_assets.invalidate()
+        super().dispatch(event)
+
     def _get_napp(self, absolute_path):
         """Get a username and napp_name from absolute path.
 
@@ -0,0 +1,218 @@
+"""Process pool for CPU-bound work of NApps.
+
+Pure CPU work, like path computation or statistics aggregation, holds the
+GIL and slows down the event loop and every other listener. Functions
+decorated with :func:`~kytos.core.helpers.run_in_process` run in the
+processes of :data:`PROCESS_POOL` instead:
+
+.. code-block:: python3
+
+    @run_in_process(result_event='kytos/my_napp.paths.computed')
+    def compute_paths(graph, source, destination):
+        ...
+
+    class Main(KytosNApp):
+
+        @listen_to('kytos/topology.updated')
+        def on_topology_updated(self, event):
+            compute_paths(to_graph(event.content['topology']), 'A', 'B')
+
+Decorated functions must be module level functions or static methods, since
+NApp instances cannot be sent to another process, and their modules must be
+importable by name in the pool processes, as NApp modules are. Arguments and
+results are pickled with the highest protocol. The call returns a
+:class:`~concurrent.futures.Future` and, if ``result_event`` is given, the
+result is also sent to the app buffer in the ``result`` key of that event,
+or the exception in its ``exception`` key.
+"""
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from importlib import import_module
+from threading import Lock
+
+from kytos.core.events import KytosEvent
+
+__all__ = ('PROCESS_POOL', 'ProcessPool')
+
+LOG = logging.getLogger(__name__)
+
+# ProcessPoolExecutor only takes a multiprocessing context since Python 3.7
+_HAS_MP_CONTEXT = sys.version_info >= (3, 7)
+
+#: dict: Functions decorated with ``run_in_process``, by module and qualname.
+_FUNCTIONS = {}
+
+
+def register(function):
+    """Make ``function`` callable by name in the pool processes."""
+    _FUNCTIONS[(function.__module__, function.__qualname__)] = function
+
+
+def _run_pickled(data):
+    """Call a registered function in a pool process.
+
+    Args:
+        data (bytes): Pickled module name, qualified name and arguments.
+
+    Returns:
+        bytes: Pickled result.
+
+    """
+    module, qualname, args, kwargs = pickle.loads(data)
+    function = _FUNCTIONS.get((module, qualname))
+    if function is None:
+        # Modules loaded after the process was started register their
+        # functions when imported
+        import_module(module)
+        function = _FUNCTIONS[(module, qualname)]
+    return pickle.dumps(function(*args, **kwargs), pickle.HIGHEST_PROTOCOL)
+
+
+def _get_context():
+    """Return the multiprocessing context of the pool processes.
+
+    The pool is started when the controller already runs other threads, so
+    its processes are not forked from the controller: a lock held by one of
+    those threads, like the one of a logging handler, would never be
+    released in the child. Processes are forked by a server started for
+    that instead, or spawned where it is not available, and import the
+    modules of the functions they call.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _create_executor(max_workers):
+    """Return an executor whose processes are started by ``_get_context``.
+
+    Before Python 3.7, the executor uses the default start method, which is
+    set instead if no other one was set yet.
+    """
+    context = _get_context()
+    if _HAS_MP_CONTEXT:
+        return ProcessPoolExecutor(max_workers, mp_context=context)
+    method = context.get_start_method()
+    current = multiprocessing.get_start_method(allow_none=True)
+    if current is None:
+        multiprocessing.set_start_method(method)
+    elif current != method:
+        LOG.warning('Process pool started with the %s start method, set '
+                    'before the pool, instead of %s', current, method)
+    return ProcessPoolExecutor(max_workers)
+
+
+class ProcessPool:
+    """Processes that run the functions decorated with ``run_in_process``.
+
+    The processes are only started by the first call, so there is no cost
+    if no NApp uses them.
+    """
+
+    def __init__(self):
+        """Create a pool that is not started yet."""
+        #: int: Maximum number of processes; 0 for one per CPU.
+        self.max_workers = 0
+        self._controller = None
+        self._executor = None
+        self._lock = Lock()
+
+    def configure(self, controller, max_workers=0):
+        """Set the controller that receives the result events.
+
+        Args:
+            controller (:class:`~kytos.core.controller.Controller`): Kytos
+                controller.
+            max_workers (int): Maximum number of processes; 0 for one per
+                CPU.
+        """
+        self._controller = controller
+        self.max_workers = max_workers
+
+    def _get_executor(self):
+        """Return the executor, starting it if necessary."""
+        with self._lock:
+            if self._executor is None:
+                max_workers = self.max_workers or os.cpu_count() or 1
+                self._executor = _create_executor(max_workers)
+                LOG.info('Process pool started with %s processes',
+                         max_workers)
+            return self._executor
+
+    def submit(self, function, args=(), kwargs=None, result_event=None):
+        """Run ``function`` in a pool process.
+
+        Args:
+            function (callable): Function registered with :func:`register`.
+            args (tuple): Positional arguments.
+            kwargs (dict): Keyword arguments.
+            result_event (str): Name of the event that receives the result
+                in the app buffer, if any.
+
+        Returns:
+            concurrent.futures.Future: Future of the result.
+
+        Raises:
+            pickle.PicklingError: If the arguments cannot be pickled. Some
+                objects, like local functions, raise AttributeError.
+
+        """
+        data = pickle.dumps((function.__module__, function.__qualname__,
+                             args, kwargs or {}), pickle.HIGHEST_PROTOCOL)
+        future = _unpickled(self._get_executor().submit(_run_pickled, data))
+        if result_event is not None:
+            future.add_done_callback(
+                lambda done: self._send_result(result_event, done))
+        return future
+
+    def _send_result(self, name, future):
+        """Put the result of ``future`` in the app buffer."""
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception is None:
+            content = {'result': future.result()}
+        else:
+            content = {'exception': exception}
+        if self._controller is None:
+            LOG.warning('No controller to receive %s', name)
+            return
+        self._controller.buffers.app.put(KytosEvent(name, content))
+
+    def shutdown(self, wait=True):
+        """Stop the processes.
+
+        Args:
+            wait (bool): Whether to wait for the running calls to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _unpickled(future):
+    """Return a future of the unpickled result of ``future``."""
+    result = Future()
+
+    def _set_result(done):
+        if done.cancelled():
+            result.cancel()
+        elif done.exception() is not None:
+            result.set_exception(done.exception())
+        else:
+            try:
+                result.set_result(pickle.loads(done.result()))
+            except Exception as exception:  # pylint: disable=broad-except
+                result.set_exception(exception)
+
+    future.add_done_callback(_set_result)
+    return result
+
+
+#: ProcessPool: Pool used by ``run_in_process``.
+PROCESS_POOL = ProcessPool()
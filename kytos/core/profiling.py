@@ -0,0 +1,298 @@
+"""Profiling helpers used by Kytos core."""
+import json
+import logging
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from threading import Lock
+
+from kytos.core.helpers import get_thread_target, run_on_thread
+
+__all__ = ('ListenerProfiler', 'ListenerStats', 'StartupProfiler')
+
+LOG = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Record how long each phase of the controller startup takes.
+
+    Phases are recorded in the order they finish. When disabled, the
+    :meth:`phase` context manager does nothing, so it can be left in the
+    startup code path.
+
+    Example of usage:
+
+    .. code-block:: python3
+
+        profiler = StartupProfiler()
+        with profiler.phase('config'):
+            config = KytosConfig()
+        print(profiler.report())
+    """
+
+    def __init__(self, enabled=True):
+        """Create an empty profile.
+
+        Args:
+            enabled (bool): Whether phases should be recorded.
+        """
+        self.enabled = enabled
+        #: list: ``(name, seconds)`` tuples, one for each recorded phase.
+        self.phases = []
+        #: dict: Seconds spent loading each NApp, indexed by NApp id.
+        self.napps = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Record the time spent running the ``with`` block.
+
+        Args:
+            name (str): Phase name, e.g. ``'imports'`` or ``'napps'``.
+        """
+        if not self.enabled:
+            yield
+            return
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started_at)
+
+    def add(self, name, seconds):
+        """Record a phase measured elsewhere.
+
+        Args:
+            name (str): Phase name.
+            seconds (float): Time spent in the phase.
+        """
+        if self.enabled:
+            self.phases.append((name, seconds))
+
+    @property
+    def total(self):
+        """Return the seconds spent in all recorded phases."""
+        return sum(seconds for _, seconds in self.phases)
+
+    def as_dict(self):
+        """Return the recorded phases and NApps load times."""
+        return {'phases': [{'name': name, 'seconds': seconds}
+                           for name, seconds in self.phases],
+                'napps': dict(self.napps),
+                'total': self.total}
+
+    def report(self):
+        """Return a human-readable table with the recorded phases.
+
+        Phases are listed in the order they were recorded, followed by the
+        NApps load times, slowest first.
+        """
+        total = self.total or 1
+        lines = ['Startup profile:',
+                 f'  {"phase":<24} {"seconds":>9} {"share":>7}']
+        for name, seconds in self.phases:
+            lines.append(f'  {name:<24} {seconds:>9.3f} '
+                         f'{seconds / total:>7.1%}')
+        lines.append(f'  {"total":<24} {self.total:>9.3f}')
+
+        if self.napps:
+            lines.append(f'  {"napp":<24} {"seconds":>9}')
+            for napp_id, seconds in sorted(self.napps.items(),
+                                           key=lambda item: -item[1]):
+                lines.append(f'  {napp_id:<24} {seconds:>9.3f}')
+        return '\n'.join(lines)
+
+    def save(self, filename):
+        """Write the profile as JSON to ``filename``.
+
+        Returns:
+            bool: Whether the file could be written.
+
+        """
+        try:
+            with open(filename, 'w') as profile_file:
+                json.dump(self.as_dict(), profile_file, indent=2)
+        except OSError as exception:
+            LOG.warning('Could not save startup profile to %s: %s',
+                        filename, exception)
+            return False
+        return True
+
+
+class ListenerStats:
+    """Calls, errors, concurrency and latency of one listener."""
+
+    #: int: Latest durations kept to compute percentiles.
+    SAMPLES = 1024
+
+    def __init__(self):
+        """Create empty stats."""
+        self._lock = Lock()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_error = None
+        self._durations = deque(maxlen=self.SAMPLES)
+
+    def start(self):
+        """Count a call that started running."""
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finish(self, seconds, exception=None):
+        """Count a call that finished after ``seconds``."""
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._durations.append(seconds)
+            if exception is not None:
+                self.errors += 1
+                self.last_error = repr(exception)
+
+    def as_dict(self):
+        """Return the stats with the p50, p90 and p99 latencies."""
+        with self._lock:
+            durations = sorted(self._durations)
+            stats = {'calls': self.calls, 'errors': self.errors,
+                     'in_flight': self.in_flight,
+                     'max_in_flight': self.max_in_flight,
+                     'total_seconds': self.total_seconds,
+                     'max_seconds': self.max_seconds,
+                     'last_error': self.last_error}
+        for percentile in (50, 90, 99):
+            stats[f'p{percentile}_seconds'] = _percentile(durations,
+                                                          percentile)
+        return stats
+
+
+class _ProfiledListener:
+    """Listener wrapper that records its calls in a :class:`ListenerStats`.
+
+    Listeners decorated with :func:`~kytos.core.helpers.run_on_thread`, like
+    the ones of ``@listen_to``, are timed inside their thread, so the stats
+    show how long the handler took instead of how long it took to start it.
+    """
+
+    __slots__ = ('listener', 'stats', '_target')
+
+    def __init__(self, listener, stats):
+        self.listener = listener
+        self.stats = stats
+        self._target = get_thread_target(listener)
+
+    def __call__(self, *args):
+        if self._target is None:
+            self._timed(self.listener, *args)
+        else:
+            run_on_thread(self._timed)(self._target, *args)
+
+    def get_thread_target(self):
+        """Return the timed function run in a new thread, if any."""
+        if self._target is None:
+            return None
+        return partial(self._timed, self._target)
+
+    def _timed(self, function, *args):
+        """Call ``function`` recording its duration and exception."""
+        self.stats.start()
+        started_at = time.perf_counter()
+        try:
+            function(*args)
+        except Exception as exception:
+            self.stats.finish(time.perf_counter() - started_at, exception)
+            raise
+        self.stats.finish(time.perf_counter() - started_at)
+
+    def __eq__(self, other):
+        if isinstance(other, _ProfiledListener):
+            other = other.listener
+        return self.listener == other
+
+    def __hash__(self):
+        return hash(self.listener)
+
+
+class ListenerProfiler:
+    """Record calls and latency of the listeners of each event pattern.
+
+    Listeners are wrapped only while profiling is enabled, so listeners are
+    called directly, without any overhead, when it is disabled.
+    """
+
+    def __init__(self):
+        """Create a disabled profiler."""
+        self.enabled = False
+        self._stats = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def get_listener_id(listener):
+        """Return the NApp id and the qualified name of a listener."""
+        owner = getattr(listener, '__self__', None)
+        napp_id = getattr(owner, 'napp_id', None) or 'kytos/core'
+        name = getattr(listener, '__qualname__', None) or repr(listener)
+        return napp_id, name
+
+    def wrap(self, listener, pattern):
+        """Return ``listener`` wrapped to be profiled as ``pattern``."""
+        if isinstance(listener, _ProfiledListener):
+            return listener
+        key = (*self.get_listener_id(listener), pattern)
+        with self._lock:
+            stats = self._stats.setdefault(key, ListenerStats())
+        return _ProfiledListener(listener, stats)
+
+    @staticmethod
+    def unwrap(listener):
+        """Return the original listener of a wrapped one."""
+        return getattr(listener, 'listener', listener)
+
+    def enable(self, events_listeners):
+        """Wrap the listeners of ``events_listeners`` in place.
+
+        Args:
+            events_listeners (dict): Lists of listeners indexed by event
+                pattern, e.g. ``Controller.events_listeners``.
+        """
+        self.enabled = True
+        for pattern, listeners in list(events_listeners.items()):
+            listeners[:] = [self.wrap(listener, pattern)
+                            for listener in listeners]
+        LOG.info('Listener profiling enabled')
+
+    def disable(self, events_listeners):
+        """Restore the original listeners of ``events_listeners``."""
+        self.enabled = False
+        for listeners in list(events_listeners.values()):
+            listeners[:] = [self.unwrap(listener) for listener in listeners]
+        LOG.info('Listener profiling disabled')
+
+    def reset(self):
+        """Discard all stats."""
+        with self._lock:
+            self._stats = {}
+
+    def as_dict(self):
+        """Return the stats indexed by NApp id and event pattern."""
+        result = {}
+        with self._lock:
+            items = list(self._stats.items())
+        for (napp_id, name, pattern), stats in items:
+            result.setdefault(napp_id, {}).setdefault(pattern, {})[name] = \
+                stats.as_dict()
+        return {'enabled': self.enabled, 'napps': result}
+
+
+def _percentile(values, percentile):
+    """Return the percentile of sorted values or None if there is none."""
+    if not values:
+        return None
+    index = max(math.ceil(percentile / 100 * len(values)) - 1, 0)
+    return values[index]
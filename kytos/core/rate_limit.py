@@ -0,0 +1,283 @@
+"""Per-connection rate limiting of the messages received from the switches.
+
+A switch with a broadcast loop can send PacketIns faster than the NApps
+handle them and starve every other switch. With ``ingress_rate_limit`` set
+in kytos.conf, each connection has a token bucket of that many OpenFlow
+messages per second, and ``ingress_message_rate_limits`` adds a bucket per
+message type, e.g. ``{"packet_in": 100}``. Buckets hold up to
+``ingress_rate_burst`` messages, or one second of messages if it is 0.
+
+Messages over the budget are handled according to
+``ingress_rate_limit_action``:
+
+- ``drop``: they are discarded before reaching the raw buffer;
+- ``sample``: one of every ``1 / ingress_rate_limit_sample`` of them is
+  kept and the others are discarded;
+- ``pause``: they are kept, but the connection is not read until the
+  bucket has tokens again, so TCP slows the switch down.
+
+Handshake, echo and reply messages, listed in :data:`CONTROL_TYPES`, are
+not limited by ``ingress_rate_limit``, so that a switch sending a storm of
+PacketIns still answers the echo requests and the requests of the NApps.
+They are only limited by their own ``ingress_message_rate_limits``.
+
+When a connection exceeds its budget, and at most once per second while it
+does, a ``kytos/core.connection.rate_limited`` event is sent with the
+connection as ``source`` and the messages limited since the last event.
+"""
+import logging
+import struct
+import time
+
+from kytos.core.metrics import REGISTRY
+
+__all__ = ('ACTIONS', 'CONTROL_TYPES', 'RateLimiter', 'RateLimits',
+           'TokenBucket')
+
+LOG = logging.getLogger(__name__)
+
+#: tuple: Valid values of the ``ingress_rate_limit_action`` option.
+ACTIONS = ('drop', 'sample', 'pause')
+
+#: dict: Names accepted by ``ingress_message_rate_limits``. These message
+#: types have the same number in OpenFlow 1.0 and 1.3.
+MESSAGE_TYPES = {'hello': 0, 'error': 1, 'echo_request': 2,
+                 'echo_reply': 3, 'packet_in': 10, 'flow_removed': 11,
+                 'port_status': 12}
+
+#: dict: Message types not limited by the overall rate, by OpenFlow version:
+#: hello, error, echo request and reply, and the replies to the controller.
+CONTROL_TYPES = {
+    # features, get_config, stats, barrier and queue_get_config replies
+    0x01: frozenset({0, 1, 2, 3, 6, 8, 17, 19, 21}),
+    # features, get_config, multipart, barrier, queue_get_config, role and
+    # get_async replies
+    0x04: frozenset({0, 1, 2, 3, 6, 8, 19, 21, 23, 25, 27}),
+}
+
+#: struct.Struct: Version, type and length of the OpenFlow header.
+HEADER = struct.Struct('!BBH')
+
+LIMITED_MESSAGES = REGISTRY.counter('kytos_rate_limited_messages_total',
+                                    'Messages received over the rate limit '
+                                    'of their connection.', ['action'])
+
+
+class TokenBucket:
+    """Budget of ``rate`` operations per second, up to ``burst`` at once."""
+
+    def __init__(self, rate, burst=0, clock=time.monotonic):
+        """Create a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Maximum tokens; ``rate`` if 0.
+            clock (callable): Function returning the current seconds.
+        """
+        self.rate = rate
+        self.burst = burst or rate
+        self.tokens = self.burst
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self):
+        """Add the tokens of the time elapsed since the last refill."""
+        now = self._clock()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def consume(self, tokens=1):
+        """Remove ``tokens`` if available and return whether they were."""
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def borrow(self, tokens=1):
+        """Remove ``tokens``, even if not available.
+
+        Returns:
+            float: Seconds until the bucket is no longer in debt.
+
+        """
+        self._refill()
+        self.tokens -= tokens
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimits:
+    """Rate limits of the ``ingress_*`` options, shared by all connections."""
+
+    def __init__(self, rate=0, burst=0, message_rates=None, action='drop',
+                 sample=0.1, clock=time.monotonic):
+        """Check and store the limits.
+
+        Args:
+            rate (float): Messages per second of each connection; 0 to limit
+                only the message types in ``message_rates``.
+            burst (float): Messages each bucket holds; one second of
+                messages if 0.
+            message_rates (dict): Messages per second of each connection by
+                OpenFlow message type, either a number or a name of
+                :data:`MESSAGE_TYPES`.
+            action (str): One of :data:`ACTIONS`.
+            sample (float): Fraction of the limited messages kept by the
+                ``sample`` action.
+            clock (callable): Function returning the current seconds.
+
+        Raises:
+            ValueError: If the action or a message type are not valid.
+
+        """
+        if action not in ACTIONS:
+            raise ValueError(f'Unknown rate limit action {action!r}; use one '
+                             f'of {", ".join(ACTIONS)}')
+        self.rate = rate
+        self.burst = burst
+        self.message_rates = {}
+        for message_type, message_rate in (message_rates or {}).items():
+            if str(message_type).isdigit():
+                message_type = int(message_type)
+            elif message_type in MESSAGE_TYPES:
+                message_type = MESSAGE_TYPES[message_type]
+            else:
+                raise ValueError(f'Unknown OpenFlow message type '
+                                 f'{message_type!r}')
+            self.message_rates[message_type] = message_rate
+        self.action = action
+        #: int: Limited messages among which one is kept when sampling.
+        self.sample_every = max(1, round(1 / sample)) if sample > 0 else 0
+        self.clock = clock
+
+    @classmethod
+    def from_options(cls, options):
+        """Return the rate limits of kytos.conf, or None if there are none.
+
+        Args:
+            options (argparse.Namespace): Options of the controller.
+        """
+        if not (options.ingress_rate_limit or
+                options.ingress_message_rate_limits):
+            return None
+        return cls(options.ingress_rate_limit, options.ingress_rate_burst,
+                   options.ingress_message_rate_limits,
+                   options.ingress_rate_limit_action,
+                   options.ingress_rate_limit_sample)
+
+    def limiter(self):
+        """Return the rate limiter of a new connection."""
+        return RateLimiter(self)
+
+
+class RateLimiter:
+    """Frame the OpenFlow messages of a connection and apply its limits.
+
+    Only complete messages are returned by :meth:`filter`; a message split
+    among segments is returned with its last segment.
+    """
+
+    def __init__(self, limits):
+        """Create the buckets of a connection.
+
+        Args:
+            limits (:class:`RateLimits`): Limits of all connections.
+        """
+        self.limits = limits
+        self._bucket = None
+        if limits.rate:
+            self._bucket = TokenBucket(limits.rate, limits.burst,
+                                       limits.clock)
+        self._type_buckets = {
+            message_type: TokenBucket(rate, limits.burst, limits.clock)
+            for message_type, rate in limits.message_rates.items()}
+        self._rest = b''
+        self._sampled = 0
+        #: float: Seconds the connection should not be read, with ``pause``.
+        self.delay = 0.0
+        #: dict: Messages limited by type since :meth:`pop_report`.
+        self.limited = {}
+        self._reported_at = None
+
+    def _over_budget(self, version, message_type):
+        """Return the seconds to wait for a message, or None if allowed."""
+        buckets = [self._type_buckets.get(message_type)]
+        if message_type not in CONTROL_TYPES.get(version, ()):
+            buckets.append(self._bucket)
+        buckets = [bucket for bucket in buckets if bucket is not None]
+        if self.limits.action == 'pause':
+            delays = [bucket.borrow() for bucket in buckets]
+            delay = max(delays, default=0.0)
+            return delay or None
+        for index, bucket in enumerate(buckets):
+            if not bucket.consume():
+                # Give back the tokens of the buckets already consumed
+                for consumed in buckets[:index]:
+                    consumed.tokens += 1
+                return 0.0
+        return None
+
+    def _keep_limited(self):
+        """Return whether a message over the budget is kept."""
+        if self.limits.action == 'pause':
+            return True
+        if self.limits.action == 'sample' and self.limits.sample_every:
+            self._sampled += 1
+            if self._sampled == self.limits.sample_every:
+                self._sampled = 0
+                return True
+        return False
+
+    def filter(self, data):
+        """Return the complete messages of ``data`` within the limits.
+
+        Args:
+            data (bytes): Bytes received from the connection.
+
+        Returns:
+            bytes: Messages to be handled by the controller.
+
+        """
+        data = self._rest + data
+        kept = []
+        offset = 0
+        kept_from = 0
+        self.delay = 0.0
+        while offset + HEADER.size <= len(data):
+            version, message_type, length = HEADER.unpack_from(data, offset)
+            length = max(length, HEADER.size)
+            if offset + length > len(data):
+                break
+            delay = self._over_budget(version, message_type)
+            if delay is not None:
+                self.delay = max(self.delay, delay)
+                self.limited[message_type] = (
+                    self.limited.get(message_type, 0) + 1)
+                if not self._keep_limited():
+                    LIMITED_MESSAGES.labels('drop').inc()
+                    kept.append(data[kept_from:offset])
+                    kept_from = offset + length
+                else:
+                    LIMITED_MESSAGES.labels(self.limits.action).inc()
+            offset += length
+        kept.append(data[kept_from:offset])
+        self._rest = data[offset:]
+        return b''.join(kept)
+
+    def pop_report(self):
+        """Return and reset the limited messages, at most once per second.
+
+        Returns:
+            dict: Messages limited by OpenFlow message type, or None if
+            there are none or the last report was less than a second ago.
+
+        """
+        if not self.limited:
+            return None
+        now = self.limits.clock()
+        if self._reported_at is not None and now - self._reported_at < 1:
+            return None
+        self._reported_at = now
+        limited, self.limited = self.limited, {}
+        return limited
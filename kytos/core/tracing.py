@@ -0,0 +1,234 @@
+"""Sampled tracing of events across buffers and listeners.
+
+A sampled event gets a trace when it is first added to a buffer. Its trace
+records:
+
+- one ``queue`` span for each buffer, from the time the event was added to
+  the time it was removed from the buffer;
+- one ``listener`` span for each listener called with the event.
+
+Events created by a listener while it handles a traced event, e.g.
+``kytos/of_core.v0x04.messages.in.*`` events created from a raw event, are
+part of the same trace, so a whole ``raw`` -> ``msg_in`` -> ``app`` pipeline
+can be followed.
+
+Finished spans are kept in memory, up to :attr:`EventTracer.max_spans`, and
+exported as Chrome trace events, which can be opened in ``chrome://tracing``
+or Perfetto, or as OpenTelemetry (OTLP/JSON) spans.
+"""
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from threading import Lock, local
+
+from kytos.core.helpers import get_thread_target, run_on_thread
+from kytos.core.profiling import ListenerProfiler
+
+__all__ = ('EventTracer', 'TRACER')
+
+LOG = logging.getLogger(__name__)
+
+#: tuple: Formats accepted by :meth:`EventTracer.export`.
+FORMATS = ('chrome', 'otlp')
+
+
+class _Trace:
+    """Trace context of an event."""
+
+    __slots__ = ('trace_id', 'parent_id', 'enqueued')
+
+    def __init__(self, trace_id, parent_id=None):
+        self.trace_id = trace_id
+        #: int: Span that created the event or, after the event was removed
+        #: from a buffer, its queue span.
+        self.parent_id = parent_id
+        #: dict: Time the event was added to each buffer, by buffer name.
+        self.enqueued = {}
+
+
+class EventTracer:
+    """Record trace points of a sample of the events.
+
+    The tracer is disabled when :attr:`sample_rate` is 0. While disabled,
+    buffers and the controller only check :attr:`enabled`.
+    """
+
+    def __init__(self, sample_rate=0.0, max_spans=100000):
+        """Create a tracer.
+
+        Args:
+            sample_rate (float): Fraction of the events to be traced, from 0
+                (disabled) to 1 (all events).
+            max_spans (int): Finished spans kept in memory. The oldest ones
+                are discarded first.
+        """
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.set_sample_rate(sample_rate)
+        self.max_spans = max_spans
+        self._spans = deque(maxlen=max_spans)
+        self._local = local()
+        self._lock = Lock()
+
+    def set_sample_rate(self, sample_rate):
+        """Change the fraction of the events to be traced.
+
+        Raises:
+            ValueError: If ``sample_rate`` is not between 0 and 1.
+
+        """
+        sample_rate = float(sample_rate)
+        if not 0 <= sample_rate <= 1:
+            raise ValueError('The sample rate must be between 0 and 1')
+        self.sample_rate = sample_rate
+        self.enabled = sample_rate > 0
+
+    def enqueued(self, event, buffer_name):
+        """Record ``event`` being added to a buffer, sampling new events."""
+        trace = getattr(event, 'trace', None)
+        if trace is None:
+            current = getattr(self._local, 'span', None)
+            if current is not None:
+                trace = _Trace(*current)
+            elif random.random() < self.sample_rate:
+                trace = _Trace(random.getrandbits(128))
+            else:
+                return
+            event.trace = trace
+        trace.enqueued[buffer_name] = time.time()
+
+    def dequeued(self, event, buffer_name):
+        """Record the queue span of a traced ``event``."""
+        trace = getattr(event, 'trace', None)
+        if trace is None:
+            return
+        started_at = trace.enqueued.pop(buffer_name, None)
+        if started_at is None:
+            return
+        span_id = self._add_span(trace.trace_id, trace.parent_id,
+                                 f'queue {buffer_name}', 'queue',
+                                 started_at, time.time(),
+                                 {'event': event.name,
+                                  'buffer': buffer_name})
+        trace.parent_id = span_id
+
+    def dispatch(self, listener, event):
+        """Call ``listener`` with a traced ``event`` recording its span.
+
+        Threaded listeners are called in a new thread, as they would be, and
+        their span is recorded inside the thread.
+        """
+        target = get_thread_target(listener)
+        if target is None:
+            self._call(listener, listener, event)
+        else:
+            run_on_thread(self._call)(listener, target, event)
+
+    def _call(self, listener, function, event):
+        """Call ``function`` recording a listener span."""
+        trace = event.trace
+        span_id = random.getrandbits(64)
+        napp_id, name = ListenerProfiler.get_listener_id(
+            ListenerProfiler.unwrap(listener))
+        attributes = {'event': event.name, 'napp': napp_id}
+        previous = getattr(self._local, 'span', None)
+        self._local.span = (trace.trace_id, span_id)
+        started_at = time.time()
+        try:
+            function(event)
+        except Exception as exception:
+            attributes['error'] = repr(exception)
+            raise
+        finally:
+            self._local.span = previous
+            self._add_span(trace.trace_id, trace.parent_id, name, 'listener',
+                           started_at, time.time(), attributes, span_id)
+
+    def _add_span(self, trace_id, parent_id, name, category, started_at,
+                  finished_at, attributes, span_id=None):
+        """Keep a finished span and return its id."""
+        if span_id is None:
+            span_id = random.getrandbits(64)
+        self._spans.append((trace_id, span_id, parent_id, name, category,
+                            started_at, finished_at, attributes))
+        return span_id
+
+    def get_spans(self):
+        """Return the finished spans as a list of dicts."""
+        keys = ('trace_id', 'span_id', 'parent_id', 'name', 'category',
+                'started_at', 'finished_at', 'attributes')
+        return [dict(zip(keys, span)) for span in list(self._spans)]
+
+    def reset(self):
+        """Discard the finished spans."""
+        self._spans.clear()
+
+    def to_chrome(self):
+        """Return the spans in the Chrome trace event format.
+
+        Each trace is an async track, so spans of the same trace are shown
+        together even when they happened in different threads.
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.get_spans():
+            common = {'name': span['name'], 'cat': span['category'],
+                      'id': f"{span['trace_id']:032x}", 'pid': pid,
+                      'tid': pid}
+            events.append({**common, 'ph': 'b',
+                           'ts': span['started_at'] * 1e6,
+                           'args': span['attributes']})
+            events.append({**common, 'ph': 'e',
+                           'ts': span['finished_at'] * 1e6})
+        events.sort(key=lambda event: event['ts'])
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_otlp(self):
+        """Return the spans in the OpenTelemetry OTLP/JSON format."""
+        spans = []
+        for span in self.get_spans():
+            otlp_span = {
+                'traceId': f"{span['trace_id']:032x}",
+                'spanId': f"{span['span_id']:016x}",
+                'name': span['name'],
+                'kind': 1,
+                'startTimeUnixNano': str(int(span['started_at'] * 1e9)),
+                'endTimeUnixNano': str(int(span['finished_at'] * 1e9)),
+                'attributes': [
+                    {'key': f'kytos.{key}', 'value': {'stringValue': value}}
+                    for key, value in span['attributes'].items()]}
+            if span['parent_id'] is not None:
+                otlp_span['parentSpanId'] = f"{span['parent_id']:016x}"
+            if 'error' in span['attributes']:
+                otlp_span['status'] = {'code': 2}
+            spans.append(otlp_span)
+        return {'resourceSpans': [{
+            'resource': {'attributes': [
+                {'key': 'service.name', 'value': {'stringValue': 'kytos'}}]},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}]}]}
+
+    def export(self, filename, trace_format='chrome'):
+        """Write the spans to ``filename``.
+
+        Args:
+            filename (str): Path of the JSON file.
+            trace_format (str): ``chrome`` or ``otlp``.
+
+        Raises:
+            ValueError: If the format is unknown.
+
+        """
+        if trace_format not in FORMATS:
+            raise ValueError(f'Unknown trace format {trace_format}')
+        with self._lock:
+            content = getattr(self, f'to_{trace_format}')()
+            with open(filename, 'w') as trace_file:
+                json.dump(content, trace_file)
+        LOG.info('%s trace spans written to %s', len(self._spans), filename)
+
+
+#: EventTracer: Tracer used by the buffers and the controller.
+TRACER = EventTracer()
@@ -0,0 +1,474 @@
+"""Install, update and serve the static files of the Kytos web UI."""
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from contextlib import suppress
+from datetime import datetime
+from threading import Lock, Thread
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen, urlretrieve
+
+from kytos.core.helpers import now
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+__all__ = ('UIAsset', 'UIAssets', 'WebUIUpdater')
+
+LOG = logging.getLogger(__name__)
+
+
+class WebUIUpdater:
+    """Download and install web UI bundles without blocking the caller.
+
+    A bundle is the ``latest.zip`` file published in each release of the UI
+    repository. Downloaded bundles are kept in ``cache_dir`` along with their
+    SHA-256 checksum, so installing the same version again does not access
+    the network. Local bundles are only installed from ``bundles_dir`` and
+    with their checksum. The new files are extracted next to ``web_ui_dir``
+    and renamed to it once the old files are renamed to a backup, so the API
+    server never serves a half-extracted UI. Between both renames, requests
+    find no UI.
+
+    Only one update runs at a time and its progress is available in
+    :attr:`status`.
+    """
+
+    REPOSITORY = 'https://github.com/kytos/ui'
+    LATEST_RELEASE_URL = ('https://api.github.com/repos/kytos/ui/releases/'
+                          'latest')
+    #: str: Version used when the latest one can not be found.
+    DEFAULT_VERSION = '1.1.1'
+    UPDATED = "updated the web ui"
+    ALREADY_INSTALLED = "web ui already installed"
+
+    def __init__(self, web_ui_dir, cache_dir=None, on_installed=None,
+                 bundles_dir=None):
+        """Set where the web UI is installed and bundles are cached.
+
+        Args:
+            web_ui_dir (str): Directory served by the API server.
+            cache_dir (str): Directory to keep downloaded bundles. If None,
+                bundles are not cached.
+            on_installed (callable): Called without arguments after a new
+                web UI is installed.
+            bundles_dir (str): Directory of the local bundles that can be
+                installed. If None, local bundles are not accepted.
+        """
+        self.web_ui_dir = web_ui_dir
+        self.cache_dir = cache_dir
+        self.bundles_dir = bundles_dir
+        self.on_installed = on_installed
+        self._lock = Lock()
+        self._thread = None
+        #: dict: State of the last update: ``idle``, ``running``,
+        #: ``finished`` or ``failed``.
+        self.status = {'state': 'idle', 'version': None, 'message': '',
+                       'started_at': None, 'finished_at': None}
+
+    def is_running(self):
+        """Return whether an update is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, version='latest', force=True, bundle=None, sha256=None):
+        """Run :meth:`update` in a background thread.
+
+        Returns:
+            bool: False if an update was already running, True otherwise.
+
+        """
+        with self._lock:
+            if self.is_running():
+                return False
+            self.status = {'state': 'running', 'version': version,
+                           'message': '', 'started_at': now().isoformat(),
+                           'finished_at': None}
+            self._thread = Thread(target=self._run, name='web_ui_updater',
+                                  args=(version, force, bundle, sha256),
+                                  daemon=True)
+            self._thread.start()
+        return True
+
+    def join(self, timeout=None):
+        """Wait for the running update, if any, to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, version, force, bundle, sha256):
+        """Run an update and store its outcome in :attr:`status`."""
+        try:
+            message = self.update(version, force, bundle, sha256)
+            succeeded = message in (self.UPDATED, self.ALREADY_INSTALLED)
+            state = 'finished' if succeeded else 'failed'
+        except Exception as exception:  # pylint: disable=broad-except
+            LOG.exception('Web UI update failed')
+            message, state = f'Web UI update failed: {exception}', 'failed'
+        self.status.update(state=state, message=message,
+                           finished_at=now().isoformat())
+        LOG.info('Web UI update %s: %s', state, message)
+
+    def update(self, version='latest', force=True, bundle=None, sha256=None):
+        """Install a web UI bundle, blocking until it is done.
+
+        Args:
+            version (str): UI release to be downloaded, e.g. ``'1.1.1'``.
+            force (bool): Whether to replace an already installed UI.
+            bundle (str): Path to a local bundle to be installed instead of
+                downloading one. It must be in ``bundles_dir``.
+            sha256 (str): Expected checksum of the local bundle, required
+                with ``bundle``.
+
+        Returns:
+            str: Message describing the outcome of the update.
+
+        """
+        if not force and os.path.exists(self.web_ui_dir):
+            return self.ALREADY_INSTALLED
+
+        if bundle:
+            error = self.check_bundle(bundle, sha256)
+            if error:
+                return error
+            if not os.path.isfile(bundle):
+                return f"Bundle {bundle} not found."
+            if _sha256(bundle) != sha256.lower():
+                return f"Bundle {bundle} checksum mismatch."
+            return self._install(bundle, bundle)
+
+        if version == 'latest':
+            version = self._get_latest_version()
+        version = str(version)
+        if not re.match(r'^[\w.-]+$', version):
+            return f"Invalid version {version}."
+        self.status['version'] = version
+
+        uri = f"{self.REPOSITORY}/releases/download/{version}/latest.zip"
+        package = self._get_cached(version)
+        if package is None:
+            try:
+                package = urlretrieve(uri)[0]
+            except HTTPError:
+                return f"Uri not found {uri}."
+            except URLError:
+                LOG.warning("Error accessing URL %s.", uri)
+                return f"Error accessing URL {uri}."
+            package = self._add_to_cache(version, package)
+
+        return self._install(package, uri)
+
+    def check_bundle(self, bundle, sha256):
+        """Return why a local bundle can not be installed, if it can not.
+
+        Args:
+            bundle (str): Path of the local bundle.
+            sha256 (str): Expected checksum of the bundle.
+
+        Returns:
+            str: Error message, or None if the bundle is in ``bundles_dir``
+            and has a checksum.
+
+        """
+        if not self.bundles_dir:
+            return "Local bundles are not accepted."
+        bundles_dir = os.path.realpath(self.bundles_dir)
+        path = os.path.realpath(bundle)
+        if os.path.commonpath([bundles_dir, path]) != bundles_dir:
+            return f"Bundle {bundle} is not in {self.bundles_dir}."
+        if not sha256:
+            return f"Bundle {bundle} requires its sha256 checksum."
+        return None
+
+    def _get_latest_version(self):
+        """Return the latest UI release tag or the default version."""
+        try:
+            response = urlopen(self.LATEST_RELEASE_URL)
+            data = response.readlines()[0]
+            return json.loads(data)['tag_name']
+        except URLError:
+            return self.DEFAULT_VERSION
+
+    def _cache_paths(self, version):
+        """Return the cached bundle and checksum file paths."""
+        bundle = os.path.join(self.cache_dir, f'{version}.zip')
+        return bundle, bundle + '.sha256'
+
+    def _get_cached(self, version):
+        """Return the cached bundle for ``version`` if its checksum matches."""
+        if not self.cache_dir:
+            return None
+        bundle, checksum_file = self._cache_paths(version)
+        try:
+            with open(checksum_file) as checksum:
+                expected = checksum.read().strip()
+        except OSError:
+            return None
+        if _sha256(bundle) == expected:
+            LOG.info('Using cached web UI bundle %s', bundle)
+            return bundle
+        LOG.warning('Discarding corrupted web UI bundle %s', bundle)
+        for path in (bundle, checksum_file):
+            with suppress(OSError):
+                os.remove(path)
+        return None
+
+    def _add_to_cache(self, version, package):
+        """Move a downloaded bundle to the cache and record its checksum.
+
+        Returns:
+            str: Path of the bundle, either cached or the original one.
+
+        """
+        if not self.cache_dir:
+            return package
+        bundle, checksum_file = self._cache_paths(version)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.move(package, bundle)
+            with open(checksum_file, 'w') as checksum:
+                checksum.write(_sha256(bundle))
+        except OSError as exception:
+            LOG.warning('Could not cache web UI bundle: %s', exception)
+            return package if os.path.exists(package) else bundle
+        return bundle
+
+    def _install(self, package, origin):
+        """Extract ``package`` and swap it with the installed web UI."""
+        try:
+            zip_ref = zipfile.ZipFile(package, 'r')
+        except (OSError, zipfile.BadZipFile):
+            return f'Zip file from {origin} is corrupted.'
+
+        with zip_ref:
+            if zip_ref.testzip() is not None:
+                return f'Zip file from {origin} is corrupted.'
+
+            web_ui_dir = os.path.normpath(self.web_ui_dir)
+            parent = os.path.dirname(web_ui_dir)
+            new_dir = tempfile.mkdtemp(prefix='.web-ui-', dir=parent)
+            try:
+                zip_ref.extractall(new_dir)
+            except OSError:
+                shutil.rmtree(new_dir, ignore_errors=True)
+                raise
+        os.chmod(new_dir, 0o755)
+
+        # backup the old web-ui files and move the new ones in place
+        if os.path.exists(web_ui_dir):
+            date = datetime.now().strftime("%Y%m%d%H%M%S")
+            os.rename(web_ui_dir, f"{web_ui_dir}-{date}")
+        os.rename(new_dir, web_ui_dir)
+
+        if self.on_installed is not None:
+            self.on_installed()
+        return self.UPDATED
+
+
+class UIAsset:
+    """A static file kept in memory along with its compressed versions.
+
+    The file is read and compressed the first time it is requested, so
+    building a :class:`UIAssets` manifest only lists the files.
+    """
+
+    #: int: Files smaller than this are not worth compressing.
+    MIN_COMPRESS_SIZE = 512
+
+    def __init__(self, path):
+        """Set the file path and guess its mimetype.
+
+        Args:
+            path (str): Absolute path of the file.
+        """
+        self.path = path
+        self.mimetype = (mimetypes.guess_type(path)[0]
+                         or 'application/octet-stream')
+        self._variants = None
+
+    def _load(self):
+        """Read the file and return its variants indexed by encoding."""
+        with open(self.path, 'rb') as asset_file:
+            content = asset_file.read()
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        variants = {None: (content, digest)}
+        if len(content) >= self.MIN_COMPRESS_SIZE:
+            compressed = {'gzip': gzip.compress(content, 9)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(content)
+            for encoding, data in compressed.items():
+                if len(data) < len(content):
+                    variants[encoding] = (data, f'{digest}-{encoding}')
+        return variants
+
+    def get(self, encodings=()):
+        """Return the best representation for the accepted encodings.
+
+        Args:
+            encodings (iterable): Content codings accepted by the client,
+                in order of preference, e.g. ``('br', 'gzip')``.
+
+        Returns:
+            tuple: Content (bytes), content coding (str or None) and a
+                strong ETag value that is unique for each coding.
+
+        """
+        if self._variants is None:
+            self._variants = self._load()
+        for encoding in encodings:
+            if encoding in self._variants:
+                content, etag = self._variants[encoding]
+                return content, encoding, etag
+        content, etag = self._variants[None]
+        return content, None, etag
+
+
+class UIAssets:
+    """In-memory manifest of the web UI and NApps UI files.
+
+    Files are looked up in the manifest instead of the filesystem, so serving
+    a request does not touch the disk after the file was read once. The
+    manifest is rebuilt on the next lookup after :meth:`invalidate` is
+    called, e.g. when NApps are loaded or the NApps directory changes.
+    """
+
+    #: str: Extension of the NApps UI components.
+    COMPONENT_EXTENSION = '.kytos'
+
+    def __init__(self, web_ui_dir, napps_dir):
+        """Set the directories holding the UI files.
+
+        Args:
+            web_ui_dir (str): Directory where the web UI is installed.
+            napps_dir (str): Directory of the enabled NApps.
+        """
+        self.web_ui_dir = web_ui_dir
+        self.napps_dir = napps_dir
+        self._lock = Lock()
+        self._assets = None
+        self._components = None
+
+    def invalidate(self):
+        """Discard the manifest, so it is rebuilt on the next lookup."""
+        with self._lock:
+            self._assets = None
+            self._components = None
+
+    def build(self):
+        """List the UI files and NApps UI components.
+
+        Returns:
+            dict: :class:`UIAsset` instances indexed by their URL path
+                relative to ``/ui/``, by ``'index.html'`` or by
+                ``'dist/'`` and their path in the web UI bundle.
+
+        """
+        assets, components = {}, {}
+        for username, napp_name, ui_dir in self._get_napps_ui_dirs():
+            for relative, path in _walk_files(ui_dir):
+                url = f'{username}/{napp_name}/{relative}'
+                assets[url] = UIAsset(path)
+                section = os.path.dirname(relative)
+                name, extension = os.path.splitext(url)
+                if (extension == self.COMPONENT_EXTENSION
+                        and section and os.sep not in section):
+                    name = name.replace('/', '-')
+                    components.setdefault(section, []).append(
+                        {'name': name, 'url': f'ui/{url}'})
+
+        # Files of the web UI bundle are added last, so they are not
+        # replaced by the ones of a NApp from a user called "dist"
+        index = os.path.join(self.web_ui_dir, 'index.html')
+        if os.path.isfile(index):
+            assets['index.html'] = UIAsset(index)
+        dist_dir = os.path.join(self.web_ui_dir, 'dist')
+        for relative, path in _walk_files(dist_dir):
+            assets[f'dist/{relative}'] = UIAsset(path)
+
+        for section_components in components.values():
+            section_components.sort(key=lambda component: component['name'])
+        with self._lock:
+            self._assets, self._components = assets, components
+        return assets
+
+    def _get_napps_ui_dirs(self):
+        """Yield username, NApp name and ``ui`` dir of each enabled NApp."""
+        for user_dir in _scan_dirs(self.napps_dir):
+            for napp_dir in _scan_dirs(user_dir.path):
+                ui_dir = os.path.join(napp_dir.path, 'ui')
+                if os.path.isdir(ui_dir):
+                    yield user_dir.name, napp_dir.name, ui_dir
+
+    def _get_assets(self):
+        """Return the current manifest, building it if necessary."""
+        assets = self._assets
+        if assets is None:
+            assets = self.build()
+        return assets
+
+    def get(self, path):
+        """Return the :class:`UIAsset` for ``path`` or None if not found.
+
+        Args:
+            path (str): ``'index.html'``, a web UI bundle file path such as
+                ``'dist/js/app.js'`` or a NApp UI file path such as
+                ``'kytos/of_core/k-info-panel/main.kytos'``.
+        """
+        return self._get_assets().get(path)
+
+    def get_components(self, section_name):
+        """Return the NApps UI components of a section.
+
+        Args:
+            section_name (str): UI section name or ``'all'``.
+
+        Returns:
+            list: Dicts with the ``name`` and ``url`` of each component.
+
+        """
+        self._get_assets()
+        components = self._components or {}
+        if section_name == 'all':
+            return sorted((component for section in components.values()
+                           for component in section),
+                          key=lambda component: component['name'])
+        return list(components.get(section_name, []))
+
+
+def _scan_dirs(path):
+    """Return the visible subdirectories of ``path``, following symlinks."""
+    try:
+        with os.scandir(path) as entries:
+            return [entry for entry in entries
+                    if entry.is_dir() and not entry.name.startswith('.')]
+    except OSError:
+        return []
+
+
+def _walk_files(path):
+    """Yield the relative and full paths of the visible files in ``path``."""
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        relative_root = os.path.relpath(root, path)
+        for filename in files:
+            yield (os.path.normpath(os.path.join(relative_root, filename)),
+                   os.path.join(root, filename))
+
+
+def _sha256(filename):
+    """Return the hex SHA-256 digest of a file or None if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(filename, 'rb') as data:
+            for chunk in iter(lambda: data.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
@@ -1,11 +1,49 @@
 """WebSocket abstraction."""
 import logging
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
 
 __all__ = ('WebSocketHandler', )
 
 
-class WebSocketHandler:
-    """Log handler that logs to web socket."""
+class WebSocketHandler(logging.Handler):
+    """Log handler that logs to web socket.
+
+    Records are formatted and queued by the logging thread, so that their
+    arguments are not read after they change, and sent by a background
+    thread, in batches, every :attr:`interval` seconds, so slow
+    web clients never block a logger. When the queue is full, new records
+    are dropped and counted in :attr:`dropped`, and a warning with the
+    amount of dropped records is sent with the next batch.
+
+    Clients in the ``log`` room receive all lines. Clients may join a
+    ``log:<LEVEL>`` room instead, e.g. ``log:WARNING``, to receive only the
+    lines of records with that level or higher.
+    """
+
+    #: tuple: Level names with a room of their own.
+    LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+    def __init__(self, socketio, interval=0.25, max_queue=10000):
+        """Receive the socket to write to.
+
+        Args:
+            socketio: socketio socket.
+            interval (float): Seconds between batches.
+            max_queue (int): Records waiting to be sent before new ones are
+                dropped.
+        """
+        super().__init__()
+        self._io = socketio
+        self.interval = interval
+        self._queue = Queue(max_queue)
+        self._flush_lock = Lock()
+        self._dropped_lock = Lock()
+        self._dropped = 0
+        #: int: Records dropped since the handler was created.
+        self.dropped = 0
+        self._stopped = Event()
+        self._thread = None
 
     @classmethod
     def get_handler(cls, socket):
@@ -13,10 +51,8 @@ class WebSocketHandler:
 
         Args:
             socket: socketio socket.
-            stream: Object that supports ``write()`` and ``flush()``.
         """
-        stream = WebSocketStream(socket)
-        handler = logging.StreamHandler(stream)
+        handler = cls(socket)
         handler.addFilter(cls._filter_web_requests)
         return handler
 
@@ -29,21 +65,77 @@ class WebSocketHandler:
         """
         return record.name != 'werkzeug' or record.levelno > logging.INFO
 
+    def emit(self, record):
+        """Format a record and queue it to be sent in the next batch."""
+        try:
+            content = self.format(record)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+        try:
+            self._queue.put_nowait((record.levelno, content))
+        except Full:
+            with self._dropped_lock:
+                self._dropped += 1
+                self.dropped += 1
+        if self._thread is None:
+            self._start()
 
-class WebSocketStream:
-    """Make loggers write to web socket."""
+    def _start(self):
+        """Start the thread that sends the batches."""
+        with self._flush_lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = Thread(target=self._run, daemon=True,
+                                      name='websocket_logs')
+                self._thread.start()
 
-    def __init__(self, socketio):
-        """Receive the socket to write to."""
-        self._io = socketio
-        self._content = ''
+    def _run(self):
+        """Send a batch every interval until the handler is closed."""
+        while not self._stopped.wait(self.interval):
+            self.flush()
 
-    def write(self, content):
-        """Store a new line."""
-        self._content += content
+    def _get_lines(self):
+        """Split the queued records into lines.
+
+        Returns:
+            list: ``(levelno, line)`` tuples, one for each line.
+
+        """
+        lines = []
+        while True:
+            try:
+                levelno, content = self._queue.get_nowait()
+            except Empty:
+                break
+            lines.extend((levelno, line) for line in content.split('\n'))
+
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            lines.append((logging.WARNING,
+                          f'{dropped} log records were dropped.'))
+        return lines
 
     def flush(self):
-        """Send lines and reset the content."""
-        lines = self._content.split('\n')[:-1]
-        self._content = ''
-        self._io.emit('show logs', lines, room='log')
+        """Send the queued records to the ``log`` rooms."""
+        with self._flush_lock:
+            lines = self._get_lines()
+            if not lines:
+                return
+            self._io.emit('show logs', [line for _, line in lines],
+                          room='log')
+            for name in self.LEVELS:
+                levelno = logging.getLevelName(name)
+                selected = [line for line_levelno, line in lines
+                            if line_levelno >= levelno]
+                if selected:
+                    self._io.emit('show logs', selected, room=f'log:{name}')
+
+    def close(self):
+        """Stop the background thread and send the remaining records."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(self.interval * 4)
+        self.flush()
+        super().close()
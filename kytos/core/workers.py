@@ -0,0 +1,328 @@
+"""Worker processes sharing the OpenFlow port.
+
+With ``workers`` greater than 1 in kytos.conf, the controller starts
+``workers - 1`` worker processes once the NApps are installed. Every process
+listens on the OpenFlow port with ``SO_REUSEPORT``, so the kernel spreads
+the switch connections among them, and reads, frames, rate limits and
+captures the data of its own switches.
+
+The first process, the coordinator, is the only one that runs the NApps,
+the topology and the REST API. Workers forward every southbound event of
+their connections, listed in :data:`RAW_EVENTS` and :data:`APP_EVENTS`, to
+the coordinator, which puts them in the same buffers with a
+:class:`WorkerConnection` as ``source``. What the NApps send to that
+connection, e.g. FlowMods or LLDP packets, is routed back to the worker
+that handles the switch. The NApps see every switch as if it were connected
+to the coordinator.
+"""
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+import socket
+from copy import copy
+from threading import Thread
+
+from kytos.core.connection import SENT_BYTES, Connection, ConnectionState
+from kytos.core.events import KytosEvent
+from kytos.core.metrics import REGISTRY
+
+__all__ = ('APP_EVENTS', 'RAW_EVENTS', 'WorkerChannel', 'WorkerConnection',
+           'WorkerPool', 'reuse_port_supported')
+
+LOG = logging.getLogger(__name__)
+
+#: tuple: Patterns of the southbound events forwarded to the raw buffer.
+RAW_EVENTS = (r'kytos/core\.[^.]+\.connection\.new',
+              r'kytos/core\.[^.]+\.raw\.in')
+#: tuple: Patterns of the southbound events forwarded to the app buffer.
+APP_EVENTS = (r'kytos/core\.[^.]+\.connection\.lost',
+              r'kytos/core\.connection\.rate_limited')
+
+EVENTS_FORWARDED = REGISTRY.counter('kytos_worker_events_forwarded_total',
+                                    'Events forwarded by a worker to the '
+                                    'coordinator.')
+EVENTS_DROPPED = REGISTRY.counter('kytos_worker_events_dropped_total',
+                                  'Events of a worker not forwarded to the '
+                                  'coordinator buffers.', ['reason'])
+
+
+def reuse_port_supported():
+    """Return whether sockets can share a port with ``SO_REUSEPORT``."""
+    return hasattr(socket, 'SO_REUSEPORT')
+
+
+class WorkerPool:
+    """Worker processes started and stopped by the coordinator.
+
+    The pool is also the coordinator side of the communication with the
+    workers: a thread receives the events forwarded by the workers and puts
+    them in the buffers of the coordinator controller, and the messages
+    sent to their connections are queued to the worker of each one.
+    """
+
+    #: int: Index of the coordinator process.
+    index = 0
+
+    def __init__(self, count, target, max_queue=10000):
+        """Create a pool of ``count - 1`` workers, not started yet.
+
+        Args:
+            count (int): Total number of processes, including the
+                coordinator.
+            target (callable): Module level function that runs a controller.
+                It is called in each worker with a copy of the options and a
+                :class:`WorkerChannel`.
+            max_queue (int): Forwarded events waiting to be received before
+                workers stop reading their switches.
+        """
+        self.count = count
+        self.target = target
+        # The workers are started when the controller already runs other
+        # threads, so they are not forked from it; see process_pool
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context('forkserver')
+        else:
+            self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue(max_queue)
+        #: dict: Queue of the messages to each worker, by worker index.
+        self._commands = {}
+        #: dict: WorkerConnection by worker index and connection id.
+        self.connections = {}
+        self._processes = []
+        self._thread = None
+
+    def start(self, options):
+        """Start the worker processes.
+
+        Args:
+            options: Options parsed by
+                :class:`~kytos.core.config.KytosConfig`.
+        """
+        for index in range(1, self.count):
+            worker_options = copy(options)
+            worker_options.foreground = False
+            commands = self._context.Queue()
+            channel = WorkerChannel(index, self._events, commands)
+            process = self._context.Process(
+                target=self.target, args=(worker_options, channel),
+                name=f'kytos-worker-{index}')
+            process.start()
+            self._commands[index] = commands
+            self._processes.append(process)
+            LOG.info('Worker %s started with pid %s', index, process.pid)
+        REGISTRY.gauge('kytos_workers_alive',
+                       'Worker processes running.').set_function(self.alive)
+
+    def alive(self):
+        """Return the number of workers running."""
+        return sum(process.is_alive() for process in self._processes)
+
+    def attach(self, controller):
+        """Put the events forwarded by the workers in the buffers."""
+        self._thread = Thread(target=self._receive, args=(controller,),
+                              daemon=True, name='worker_events')
+        self._thread.start()
+
+    def _receive(self, controller):
+        """Receive forwarded events until None is received."""
+        while True:
+            data = self._events.get()
+            if data is None:
+                break
+            self._put_event(controller, *pickle.loads(data))
+
+    # pylint: disable=too-many-arguments
+    def _put_event(self, controller, worker, buffer_name, name,
+                   connection_id, protocol_name, content):
+        """Put an event forwarded by ``worker`` in a buffer."""
+        key = (worker, connection_id)
+        connection = self.connections.get(key)
+        if connection is None:
+            if not name.endswith('.connection.new'):
+                EVENTS_DROPPED.labels('closed').inc()
+                LOG.debug('Event %s of the closed connection %s dropped',
+                          name, connection_id)
+                return
+            connection = WorkerConnection(*connection_id, self, worker)
+            connection.protocol.name = protocol_name
+            self.connections[key] = connection
+        elif name.endswith('.connection.lost'):
+            del self.connections[key]
+            connection.lost()
+        EVENTS_FORWARDED.inc()
+        if controller.has_listeners(name):
+            content['source'] = connection
+            getattr(controller.buffers, buffer_name).put(
+                KytosEvent(name, content))
+
+    def send(self, worker, connection_id, buffer):
+        """Send ``buffer`` to a connection of ``worker``."""
+        self._command(worker, 'send', connection_id, buffer)
+
+    def close(self, worker, connection_id):
+        """Close a connection of ``worker``."""
+        self._command(worker, 'close', connection_id, None)
+
+    def _command(self, worker, *command):
+        """Queue ``command`` to ``worker`` if it is still running."""
+        commands = self._commands.get(worker)
+        if commands is not None:
+            commands.put(command)
+
+    def stop(self, timeout=10):
+        """Stop the workers, waiting up to ``timeout`` seconds for each."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                LOG.warning('Killing worker %s (pid %s)', process.name,
+                            process.pid)
+                os.kill(process.pid, signal.SIGKILL)
+                process.join()
+        self._processes = []
+        self._commands = {}
+        for connection in self.connections.values():
+            connection.lost()
+        self.connections = {}
+        if self._thread is not None:
+            self._events.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class WorkerConnection(Connection):
+    """Connection of a switch handled by a worker process.
+
+    Messages sent to it are written to the switch by the worker.
+    """
+
+    def __init__(self, address, port, pool, worker):
+        """Create the connection as known by the coordinator.
+
+        Args:
+            address (str): Switch address.
+            port (int): Switch port.
+            pool (:class:`WorkerPool`): Pool of the worker.
+            worker (int): Index of the worker handling the connection.
+        """
+        super().__init__(address, port, None)
+        #: int: Index of the worker handling the connection.
+        self.worker = worker
+        self._pool = pool
+
+    def send(self, buffer):
+        """Send a buffer message through the worker of the connection.
+
+        Args:
+            buffer (bytes): Message buffer that will be sent.
+        """
+        if self.is_alive():
+            self._pool.send(self.worker, self.id, buffer)
+            SENT_BYTES.inc(len(buffer))
+
+    def close(self):
+        """Ask the worker to close the connection."""
+        if self.is_alive():
+            self._pool.close(self.worker, self.id)
+        self.lost()
+
+    def lost(self):
+        """Mark the connection as finished, e.g. when the worker lost it."""
+        self.state = ConnectionState.FINISHED
+        if self.switch and self.switch.connection is self:
+            self.switch.connection = None
+
+    def is_alive(self):
+        """Return True if the connection is alive. False otherwise."""
+        return self.state not in (ConnectionState.FINISHED,
+                                  ConnectionState.FAILED)
+
+
+class WorkerChannel:
+    """Worker side of the communication with the coordinator."""
+
+    def __init__(self, index, events, commands):
+        """Create the channel of a worker.
+
+        Args:
+            index (int): Worker index, from 1 to ``workers - 1``.
+            events (multiprocessing.Queue): Queue read by the coordinator.
+            commands (multiprocessing.Queue): Queue of the messages from the
+                coordinator.
+        """
+        self.index = index
+        self._events = events
+        self._commands = commands
+        #: dict: Open connections of the worker by id.
+        self.connections = {}
+        self._thread = None
+
+    def attach(self, controller):
+        """Listen to the southbound events and to the coordinator messages.
+
+        The listeners are called in the event loop, which stops reading the
+        switches while the queue of the coordinator is full.
+        """
+        for pattern in RAW_EVENTS:
+            controller.events_listeners.setdefault(pattern, []).append(
+                self.forward_raw)
+        for pattern in APP_EVENTS:
+            controller.events_listeners.setdefault(pattern, []).append(
+                self.forward_app)
+        self._thread = Thread(target=self._receive, daemon=True,
+                              name='coordinator_messages')
+        self._thread.start()
+
+    def forward_raw(self, event):
+        """Send ``event`` to the raw buffer of the coordinator."""
+        self._forward('raw', event)
+
+    def forward_app(self, event):
+        """Send ``event`` to the app buffer of the coordinator."""
+        self._forward('app', event)
+
+    def _forward(self, buffer_name, event):
+        """Send ``event`` with the id of its connection to the coordinator."""
+        content = dict(event.content)
+        connection = content.pop('source')
+        if event.name.endswith('.connection.new'):
+            self.connections[connection.id] = connection
+        elif event.name.endswith('.connection.lost'):
+            self.connections.pop(connection.id, None)
+        try:
+            data = pickle.dumps((self.index, buffer_name, event.name,
+                                 connection.id, connection.protocol.name,
+                                 content), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            EVENTS_DROPPED.labels('pickle').inc()
+            LOG.warning('Event %s not forwarded: %s', event.name, error)
+            return
+        self._events.put(data)
+
+    def _receive(self):
+        """Send or close connections as the coordinator asks, until None."""
+        while True:
+            command = self._commands.get()
+            if command is None:
+                break
+            action, connection_id, buffer = command
+            connection = self.connections.get(connection_id)
+            if connection is None:
+                continue
+            if action == 'send':
+                connection.send(buffer)
+            else:
+                connection.close()
+
+    def stop(self):
+        """Flush the forwarded events before the worker exits."""
+        if self._thread is not None:
+            self._commands.put(None)
+            self._thread.join()
+            self._thread = None
+        self._events.close()
+        self._events.join_thread()
@@ -0,0 +1,396 @@
+r"""Emulate OpenFlow 1.3 switches to put southbound load on Kytos.
+
+Each emulated switch opens a TCP connection to the controller, does the
+hello and features handshake, answers echo, barrier and multipart requests
+and sends echo keepalives, PacketIns and port status messages at the
+configured rates. Everything runs in a single asyncio loop, so a few
+thousand switches can be emulated on localhost, without Mininet or OVS.
+
+Example of usage, against a local ``kytosd`` with the of_core NApp:
+
+.. code-block:: shell
+
+    python3 -m kytos.lib.switch_emulator --switches 100 --duration 30 \
+        --packet-in-rate 50 --port-status-rate 0.1
+
+The report has the messages sent and received per second, the TCP connect
+latency, the handshake latency (from the connection to the features reply)
+and the echo reply latency.
+"""
+import argparse
+import asyncio
+import math
+import struct
+import sys
+import time
+
+__all__ = ('EmulatedSwitch', 'LatencyStats', 'SwitchEmulator', 'main')
+
+OF_VERSION = 0x04
+
+#: int: OpenFlow 1.3 message types used by the emulator.
+OFPT_HELLO = 0
+OFPT_ECHO_REQUEST = 2
+OFPT_ECHO_REPLY = 3
+OFPT_FEATURES_REQUEST = 5
+OFPT_FEATURES_REPLY = 6
+OFPT_PACKET_IN = 10
+OFPT_PORT_STATUS = 12
+OFPT_MULTIPART_REQUEST = 18
+OFPT_MULTIPART_REPLY = 19
+OFPT_BARRIER_REQUEST = 20
+OFPT_BARRIER_REPLY = 21
+
+OFPMP_DESC = 0
+OFPMP_PORT_DESC = 13
+
+HEADER = struct.Struct('!BBHI')
+#: bytes: LLDP-like Ethernet frame carried by the PacketIns.
+PACKET_IN_DATA = (b'\x01\x80\xc2\x00\x00\x0e' + b'\x02\x00\x00\x00\x00\x01' +
+                  b'\x88\xcc' + bytes(46))
+
+
+def message(msg_type, xid, body=b''):
+    """Return an OpenFlow 1.3 message with ``body`` after the header."""
+    return HEADER.pack(OF_VERSION, msg_type, HEADER.size + len(body),
+                       xid) + body
+
+
+def hello(xid=0):
+    """Return a hello message with the OpenFlow 1.3 version bitmap."""
+    return message(OFPT_HELLO, xid, struct.pack('!HHI', 1, 8,
+                                                1 << OF_VERSION))
+
+
+def features_reply(xid, dpid):
+    """Return the features reply of the switch ``dpid`` (an int)."""
+    return message(OFPT_FEATURES_REPLY, xid,
+                   struct.pack('!QIBB2xII', dpid, 256, 254, 0, 0x4f, 0))
+
+
+def port(port_no, dpid):
+    """Return an ``ofp_port`` structure."""
+    hw_addr = struct.pack('!HI', dpid & 0xffff, port_no)
+    name = f's{dpid}-eth{port_no}'.encode()[:15]
+    return struct.pack('!I4x6s2x16sIIIIIIII', port_no, hw_addr, name, 0, 4,
+                       0x2840, 0x2840, 0x2840, 0, 10000000, 10000000)
+
+
+def port_status(xid, dpid, port_no, reason=2):
+    """Return a port status message, by default with the modify reason."""
+    return message(OFPT_PORT_STATUS, xid,
+                   struct.pack('!B7x', reason) + port(port_no, dpid))
+
+
+def packet_in(xid, in_port, data=PACKET_IN_DATA):
+    """Return a PacketIn received in ``in_port`` without buffer."""
+    # OXM in_port field: class OFPXMC_OPENFLOW_BASIC, field 0, length 4
+    match = struct.pack('!HHII', 1, 12, 0x80000004, in_port) + bytes(4)
+    return message(OFPT_PACKET_IN, xid,
+                   struct.pack('!IHBBQ', 0xffffffff, len(data), 0, 0, 0) +
+                   match + bytes(2) + data)
+
+
+def multipart_reply(xid, multipart_type, body=b''):
+    """Return the last multipart reply of a request."""
+    return message(OFPT_MULTIPART_REPLY, xid,
+                   struct.pack('!HH4x', multipart_type, 0) + body)
+
+
+class LatencyStats:
+    """Latency samples, in seconds."""
+
+    def __init__(self):
+        """Create empty stats."""
+        self.samples = []
+
+    def add(self, seconds):
+        """Add a sample."""
+        self.samples.append(seconds)
+
+    def as_dict(self):
+        """Return count and p50/p99/max in milliseconds."""
+        samples = sorted(self.samples)
+        result = {'count': len(samples)}
+        for name, fraction in (('p50', 0.5), ('p99', 0.99), ('max', 1)):
+            if samples:
+                index = min(len(samples) - 1,
+                            max(0, math.ceil(fraction * len(samples)) - 1))
+                result[f'{name}_ms'] = samples[index] * 1000
+            else:
+                result[f'{name}_ms'] = None
+        return result
+
+
+class EmulatedSwitch(asyncio.Protocol):
+    """Connection of one emulated switch to the controller."""
+
+    def __init__(self, emulator, dpid):
+        """Create the switch ``dpid`` of ``emulator``."""
+        self.emulator = emulator
+        self.dpid = dpid
+        self.transport = None
+        self.connected_at = None
+        self.handshake_done = False
+        self.closed = False
+        self._rest = b''
+        self._xid = 0
+        self._echoes = {}
+
+    def next_xid(self):
+        """Return a new transaction id."""
+        self._xid = (self._xid + 1) & 0xffffffff
+        return self._xid
+
+    def send(self, data, count=1):
+        """Send ``count`` messages in ``data``."""
+        self.transport.write(data)
+        self.emulator.sent += count
+
+    def connection_made(self, transport):
+        """Start the handshake."""
+        self.transport = transport
+        self.connected_at = time.perf_counter()
+        self.send(hello(self.next_xid()))
+
+    def connection_lost(self, exc):
+        """Stop sending messages."""
+        self.closed = True
+
+    def data_received(self, data):
+        """Split the data into messages and handle each one."""
+        data = self._rest + data
+        offset = 0
+        while len(data) - offset >= HEADER.size:
+            _, msg_type, length, xid = HEADER.unpack_from(data, offset)
+            if length < HEADER.size or len(data) - offset < length:
+                break
+            self.emulator.received += 1
+            self.handle(msg_type, xid,
+                        data[offset + HEADER.size:offset + length])
+            offset += length
+        self._rest = data[offset:]
+
+    def handle(self, msg_type, xid, body):
+        """Answer a message received from the controller."""
+        if msg_type == OFPT_ECHO_REQUEST:
+            self.send(message(OFPT_ECHO_REPLY, xid, body))
+        elif msg_type == OFPT_ECHO_REPLY:
+            sent_at = self._echoes.pop(xid, None)
+            if sent_at is not None:
+                self.emulator.echo_latency.add(time.perf_counter() - sent_at)
+        elif msg_type == OFPT_FEATURES_REQUEST:
+            self.send(features_reply(xid, self.dpid))
+            if not self.handshake_done:
+                self.handshake_done = True
+                self.emulator.handshake_latency.add(
+                    time.perf_counter() - self.connected_at)
+        elif msg_type == OFPT_MULTIPART_REQUEST:
+            self.send(self.multipart_reply(xid, body))
+        elif msg_type == OFPT_BARRIER_REQUEST:
+            self.send(message(OFPT_BARRIER_REPLY, xid))
+
+    def multipart_reply(self, xid, body):
+        """Return the reply of a multipart request."""
+        multipart_type = struct.unpack_from('!H', body)[0]
+        if multipart_type == OFPMP_DESC:
+            reply_body = b''.join(field.ljust(size, b'\0') for field, size in
+                                  ((b'Kytos', 256),
+                                   (b'Switch emulator', 256),
+                                   (b'1.0', 256), (b'', 32), (b'', 256)))
+        elif multipart_type == OFPMP_PORT_DESC:
+            reply_body = b''.join(port(port_no, self.dpid) for port_no in
+                                  range(1, self.emulator.ports + 1))
+        else:
+            reply_body = b''
+        return multipart_reply(xid, multipart_type, reply_body)
+
+    def send_echo(self):
+        """Send an echo request whose reply latency is measured."""
+        xid = self.next_xid()
+        self._echoes[xid] = time.perf_counter()
+        self.send(message(OFPT_ECHO_REQUEST, xid))
+
+    def send_packet_ins(self, count):
+        """Send ``count`` PacketIns from rotating ports."""
+        ports = self.emulator.ports
+        self.send(b''.join(packet_in(self.next_xid(), index % ports + 1)
+                           for index in range(count)), count)
+
+    def send_port_statuses(self, count):
+        """Send ``count`` port status messages of rotating ports."""
+        ports = self.emulator.ports
+        self.send(b''.join(port_status(self.next_xid(), self.dpid,
+                                       index % ports + 1)
+                           for index in range(count)), count)
+
+
+class SwitchEmulator:
+    """Run many emulated switches against a controller."""
+
+    #: float: Seconds between two batches of PacketIns and port statuses.
+    TICK = 0.01
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, host='127.0.0.1', port=6653, switches=10,
+                 packet_in_rate=0.0, port_status_rate=0.0, echo_interval=1.0,
+                 ports=4, first_dpid=1):
+        """Configure the emulated switches.
+
+        Args:
+            host (str): Controller address.
+            port (int): Controller OpenFlow port.
+            switches (int): Number of switches (connections).
+            packet_in_rate (float): PacketIns per second of each switch.
+            port_status_rate (float): Port status messages per second of
+                each switch.
+            echo_interval (float): Seconds between echo requests.
+            ports (int): Ports of each switch.
+            first_dpid (int): Datapath id of the first switch.
+        """
+        self.host = host
+        self.port = port
+        self.switches = switches
+        self.packet_in_rate = packet_in_rate
+        self.port_status_rate = port_status_rate
+        self.echo_interval = echo_interval
+        self.ports = ports
+        self.first_dpid = first_dpid
+        self.sent = 0
+        self.received = 0
+        self.connect_latency = LatencyStats()
+        self.handshake_latency = LatencyStats()
+        self.echo_latency = LatencyStats()
+        self.connect_errors = 0
+
+    async def _connect(self, dpid):
+        """Connect one switch, recording the connect latency."""
+        loop = asyncio.get_event_loop()
+        started_at = time.perf_counter()
+        try:
+            _, switch = await loop.create_connection(
+                lambda: EmulatedSwitch(self, dpid), self.host, self.port)
+        except OSError:
+            self.connect_errors += 1
+            return None
+        self.connect_latency.add(time.perf_counter() - started_at)
+        return switch
+
+    async def _drive(self, switch, stop_at):
+        """Send the switch messages until ``stop_at``."""
+        packet_ins, port_statuses = 0.0, 0.0
+        next_echo = time.perf_counter() + self.echo_interval
+        while not switch.closed:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            if switch.handshake_done:
+                packet_ins += self.packet_in_rate * self.TICK
+                port_statuses += self.port_status_rate * self.TICK
+                if packet_ins >= 1:
+                    switch.send_packet_ins(int(packet_ins))
+                    packet_ins -= int(packet_ins)
+                if port_statuses >= 1:
+                    switch.send_port_statuses(int(port_statuses))
+                    port_statuses -= int(port_statuses)
+            if now >= next_echo:
+                switch.send_echo()
+                next_echo = now + self.echo_interval
+            await asyncio.sleep(self.TICK)
+
+    async def run(self, duration=10.0):
+        """Run the switches for ``duration`` seconds and return the report.
+
+        Returns:
+            dict: Report as returned by :meth:`report`.
+
+        """
+        started_at = time.perf_counter()
+        switches = await asyncio.gather(*(
+            self._connect(self.first_dpid + index)
+            for index in range(self.switches)))
+        switches = [switch for switch in switches if switch is not None]
+        stop_at = started_at + duration
+        await asyncio.gather(*(self._drive(switch, stop_at)
+                               for switch in switches))
+        elapsed = time.perf_counter() - started_at
+        for switch in switches:
+            switch.transport.close()
+        return self.report(elapsed, switches)
+
+    def report(self, elapsed, switches):
+        """Return the results of a run.
+
+        Args:
+            elapsed (float): Duration of the run, in seconds.
+            switches (list): Emulated switches that connected.
+
+        Returns:
+            dict: Message rates, connection counts and latencies.
+
+        """
+        return {
+            'seconds': elapsed,
+            'switches_connected': len(switches),
+            'switches_handshaken': sum(switch.handshake_done
+                                       for switch in switches),
+            'connect_errors': self.connect_errors,
+            'messages_sent_per_second': self.sent / elapsed,
+            'messages_received_per_second': self.received / elapsed,
+            'connect_latency': self.connect_latency.as_dict(),
+            'handshake_latency': self.handshake_latency.as_dict(),
+            'echo_latency': self.echo_latency.as_dict()}
+
+
+def _format_report(report):
+    """Return the report as text lines."""
+    lines = []
+    for key, value in report.items():
+        if isinstance(value, dict):
+            value = ', '.join(
+                f'{name}={"-" if number is None else f"{number:.2f}"}'
+                if name.endswith('_ms') else f'{name}={number}'
+                for name, number in value.items())
+        elif isinstance(value, float):
+            value = f'{value:,.1f}'
+        lines.append(f'{key:<30} {value}')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the emulator from the command line."""
+    parser = argparse.ArgumentParser(
+        prog='python3 -m kytos.lib.switch_emulator',
+        description='Emulate OpenFlow 1.3 switches connected to Kytos.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6653)
+    parser.add_argument('--switches', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='seconds (default: %(default)s)')
+    parser.add_argument('--packet-in-rate', type=float, default=0.0,
+                        help='PacketIns per second of each switch')
+    parser.add_argument('--port-status-rate', type=float, default=0.0,
+                        help='port status messages per second of each '
+                             'switch')
+    parser.add_argument('--echo-interval', type=float, default=1.0,
+                        help='seconds between echo requests')
+    parser.add_argument('--ports', type=int, default=4,
+                        help='ports of each switch')
+    parser.add_argument('--first-dpid', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    emulator = SwitchEmulator(args.host, args.port, args.switches,
+                              args.packet_in_rate, args.port_status_rate,
+                              args.echo_interval, args.ports,
+                              args.first_dpid)
+    loop = asyncio.new_event_loop()
+    try:
+        report = loop.run_until_complete(emulator.run(args.duration))
+    finally:
+        loop.close()
+    print(_format_report(report))
+    return 0 if report['switches_connected'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
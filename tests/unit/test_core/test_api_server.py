@@ -1,5 +1,8 @@
 """APIServer tests."""
+import gzip
 import json
+import os
+import tempfile
 import unittest
 import warnings
 # Disable not-grouped imports that conflicts with isort
@@ -9,6 +12,7 @@ from urllib.error import HTTPError
 
 from kytos.core.api_server import APIServer
 from kytos.core.napps import rest
+from kytos.core.web_ui import UIAssets
 
 KYTOS_CORE_API = "http://127.0.0.1:8181/api/kytos/"
 API_URI = KYTOS_CORE_API+"core"
@@ -77,6 +81,21 @@ class TestAPIServer(unittest.TestCase):
         status = self.api_server.status_api()
         self.assertEqual(status, ('{"response": "running"}', 200))
 
+    def test_metrics_endpoint(self):
+        """Test metrics_endpoint method and the REST latency metric."""
+        endpoint = self.api_server.metrics_endpoint
+        self.api_server.register_core_endpoint('metrics/', endpoint)
+        client = self.api_server.app.test_client()
+
+        client.get('/api/kytos/core/metrics/')
+        response = client.get('/api/kytos/core/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/plain')
+        self.assertIn('kytos_rest_request_seconds_count{method="GET",'
+                      'rule="/api/kytos/core/metrics/",status="200"}',
+                      response.get_data(as_text=True))
+
     @patch('kytos.core.api_server.urlopen')
     def test_stop_api_server(self, mock_urlopen):
         """Test stop_api_server method."""
@@ -85,123 +104,184 @@ class TestAPIServer(unittest.TestCase):
         url = "%s/shutdown" % API_URI
         mock_urlopen.assert_called_with(url)
 
-    @patch('kytos.core.api_server.send_file')
-    @patch('os.path.exists', return_value=True)
-    def test_static_web_ui__success(self, *args):
+    def create_ui_assets(self):
+        """Create a web UI and a NApp UI component in a temporary dir."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        web_ui_dir = os.path.join(tmp_dir.name, 'web-ui')
+        napps_dir = os.path.join(tmp_dir.name, 'napps')
+        section_dir = os.path.join(napps_dir, 'kytos', 'napp', 'ui',
+                                   'k-toolbar')
+        os.makedirs(section_dir)
+        os.makedirs(web_ui_dir)
+        os.makedirs(os.path.join(web_ui_dir, 'dist', 'js'))
+        with open(os.path.join(web_ui_dir, 'index.html'), 'w') as index:
+            index.write('<html></html>')
+        with open(os.path.join(web_ui_dir, 'dist', 'js', 'app.1a2b.js'),
+                  'w') as script:
+            script.write('main();')
+        with open(os.path.join(section_dir, 'main.kytos'), 'w') as component:
+            component.write('<template></template>' * 100)
+        self.api_server.ui_assets = UIAssets(web_ui_dir, napps_dir)
+
+    def test_static_web_ui__success(self):
         """Test static_web_ui method to success case."""
-        (_, mock_send_file) = args
-        self.api_server.static_web_ui('kytos', 'napp', 'filename')
-
-        mock_send_file.assert_called_with('napps_dir/kytos/napp/ui/filename')
-
-    @patch('os.path.exists', return_value=False)
-    def test_static_web_ui__error(self, _):
+        self.create_ui_assets()
+        with self.api_server.app.test_request_context():
+            response = self.api_server.static_web_ui(
+                'kytos', 'napp', 'k-toolbar/main.kytos')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(),
+                         b'<template></template>' * 100)
+        self.assertEqual(response.headers['Cache-Control'],
+                         APIServer.UI_CACHE_CONTROL)
+        self.assertIsNotNone(response.get_etag()[0])
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_static_web_ui__gzip(self):
+        """Test static_web_ui method serving a gzip compressed file."""
+        self.create_ui_assets()
+        headers = {'Accept-Encoding': 'gzip'}
+        with self.api_server.app.test_request_context(headers=headers):
+            response = self.api_server.static_web_ui(
+                'kytos', 'napp', 'k-toolbar/main.kytos')
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(gzip.decompress(response.get_data()),
+                         b'<template></template>' * 100)
+
+    def test_static_web_ui__not_modified(self):
+        """Test static_web_ui method when the client has the same file."""
+        self.create_ui_assets()
+        with self.api_server.app.test_request_context():
+            etag = self.api_server.static_web_ui(
+                'kytos', 'napp', 'k-toolbar/main.kytos').get_etag()[0]
+        headers = {'If-None-Match': f'"{etag}"'}
+        with self.api_server.app.test_request_context(headers=headers):
+            response = self.api_server.static_web_ui(
+                'kytos', 'napp', 'k-toolbar/main.kytos')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+
+    def test_static_web_ui__error(self):
         """Test static_web_ui method to error case."""
-        resp, code = self.api_server.static_web_ui('kytos', 'napp', 'filename')
+        self.create_ui_assets()
+        resp, code = self.api_server.static_web_ui('kytos', 'napp',
+                                                   '../../../kytos.json')
 
         self.assertEqual(resp, '')
         self.assertEqual(code, 404)
 
-    @patch('kytos.core.api_server.glob')
-    def test_get_ui_components(self, mock_glob):
+    def test_static_dist(self):
+        """Test static_dist method serving the web UI bundle files."""
+        self.create_ui_assets()
+        with self.api_server.app.test_request_context():
+            response = self.api_server.static_dist('js/app.1a2b.js')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), b'main();')
+        self.assertEqual(response.headers['Cache-Control'],
+                         APIServer.DIST_CACHE_CONTROL)
+        self.assertIsNotNone(response.get_etag()[0])
+
+        _, code = self.api_server.static_dist('js/missing.js')
+        self.assertEqual(code, 404)
+
+    def test_get_ui_components(self):
         """Test get_ui_components method."""
+        self.create_ui_assets()
         with self.api_server.app.app_context():
-            mock_glob.return_value = ['napps_dir/*/*/ui/*/*.kytos']
             response = self.api_server.get_ui_components('all')
 
-            expected_json = [{'name': '*-*-*-*', 'url': 'ui/*/*/*/*.kytos'}]
+            expected_json = [{'name': 'kytos-napp-k-toolbar-main',
+                              'url': 'ui/kytos/napp/k-toolbar/main.kytos'}]
             self.assertEqual(response.json, expected_json)
             self.assertEqual(response.status_code, 200)
 
-    @patch('os.path')
-    @patch('kytos.core.api_server.send_file')
-    def test_web_ui__success(self, mock_send_file, ospath_mock):
+    def test_web_ui__success(self):
         """Test web_ui method."""
-        ospath_mock.exists.return_value = True
-        self.api_server.web_ui()
+        self.create_ui_assets()
+        with self.api_server.app.test_request_context():
+            response = self.api_server.web_ui()
 
-        mock_send_file.assert_called_with('flask_dir/index.html')
+        self.assertEqual(response.get_data(), b'<html></html>')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
 
-    @patch('os.path')
-    def test_web_ui__error(self, ospath_mock):
+    def test_web_ui__error(self):
         """Test web_ui method."""
-        ospath_mock.exists.return_value = False
+        self.api_server.ui_assets = UIAssets('flask_dir', 'napps_dir')
         _, error = self.api_server.web_ui()
 
         self.assertEqual(error, 404)
 
-    @patch('kytos.core.api_server.urlretrieve')
-    @patch('kytos.core.api_server.urlopen')
-    @patch('zipfile.ZipFile')
-    @patch('os.path.exists')
-    @patch('os.mkdir')
-    @patch('shutil.move')
-    def test_update_web_ui(self, *args):
-        """Test update_web_ui method."""
-        (_, _, mock_exists, mock_zipfile, mock_urlopen,
-         mock_urlretrieve) = args
-        zipfile = MagicMock()
-        zipfile.testzip.return_value = None
-        mock_zipfile.return_value = zipfile
-
-        data = json.dumps({'tag_name': 1.0})
-        url_response = MagicMock()
-        url_response.readlines.return_value = [data]
-        mock_urlopen.return_value = url_response
-
-        mock_exists.side_effect = [False, True]
-
-        response = self.api_server.update_web_ui()
-
-        url = 'https://github.com/kytos/ui/releases/download/1.0/latest.zip'
-        mock_urlretrieve.assert_called_with(url)
-        self.assertEqual(response, 'updated the web ui')
-
-    @patch('kytos.core.api_server.urlretrieve')
-    @patch('kytos.core.api_server.urlopen')
-    @patch('os.path.exists')
-    def test_update_web_ui__http_error(self, *args):
-        """Test update_web_ui method to http error case."""
-        (mock_exists, mock_urlopen, mock_urlretrieve) = args
+    def test_update_web_ui(self):
+        """Test update_web_ui method starting a background update."""
+        self.api_server.web_ui_updater = MagicMock()
+        self.api_server.web_ui_updater.status = {'state': 'running'}
+        self.api_server.web_ui_updater.start.return_value = True
+
+        with self.api_server.app.app_context():
+            response, code = self.api_server.update_web_ui('1.0',
+                                                           bundle='ui.zip')
 
-        data = json.dumps({'tag_name': 1.0})
-        url_response = MagicMock()
-        url_response.readlines.return_value = [data]
-        mock_urlopen.return_value = url_response
-        mock_urlretrieve.side_effect = HTTPError('url', 123, 'msg', 'hdrs',
-                                                 MagicMock())
+        self.api_server.web_ui_updater.start.assert_called_with(
+            '1.0', True, 'ui.zip', None)
+        self.assertEqual(response.json, {'state': 'running'})
+        self.assertEqual(code, 202)
 
-        mock_exists.return_value = False
+    def test_update_web_ui__running(self):
+        """Test update_web_ui method when an update is already running."""
+        self.api_server.web_ui_updater = MagicMock()
+        self.api_server.web_ui_updater.status = {'state': 'running'}
+        self.api_server.web_ui_updater.start.return_value = False
 
-        response = self.api_server.update_web_ui()
+        with self.api_server.app.app_context():
+            _, code = self.api_server.update_web_ui()
 
-        expected_response = 'Uri not found https://github.com/kytos/ui/' + \
-                            'releases/download/1.0/latest.zip.'
-        self.assertEqual(response, expected_response)
+        self.assertEqual(code, 409)
 
-    @patch('kytos.core.api_server.urlretrieve')
-    @patch('kytos.core.api_server.urlopen')
-    @patch('zipfile.ZipFile')
-    @patch('os.path.exists')
-    def test_update_web_ui__zip_error(self, *args):
-        """Test update_web_ui method to error case in zip file."""
-        (mock_exists, mock_zipfile, mock_urlopen, _) = args
-        zipfile = MagicMock()
-        zipfile.testzip.return_value = 'any'
-        mock_zipfile.return_value = zipfile
+    def test_update_web_ui__bundle_from_body(self):
+        """Test update_web_ui endpoint reading a bundle from the body."""
+        self.api_server.web_ui_updater = MagicMock()
+        self.api_server.web_ui_updater.status = {}
+        self.api_server.web_ui_updater.check_bundle.return_value = None
+        body = {'bundle': '/tmp/ui.zip', 'sha256': 'abc'}
+
+        with self.api_server.app.test_request_context(json=body):
+            self.api_server.update_web_ui()
+
+        self.api_server.web_ui_updater.start.assert_called_with(
+            'latest', True, '/tmp/ui.zip', 'abc')
+
+    def test_update_web_ui__bundle_rejected(self):
+        """Test update_web_ui endpoint with a bundle that is not accepted."""
+        self.api_server.web_ui_updater = MagicMock()
+        self.api_server.web_ui_updater.check_bundle.return_value = 'error'
+        body = {'bundle': '/etc/ui.zip'}
 
-        data = json.dumps({'tag_name': 1.0})
-        url_response = MagicMock()
-        url_response.readlines.return_value = [data]
-        mock_urlopen.return_value = url_response
+        with self.api_server.app.test_request_context(json=body):
+            response, code = self.api_server.update_web_ui()
 
-        mock_exists.return_value = False
+        self.api_server.web_ui_updater.check_bundle.assert_called_with(
+            '/etc/ui.zip', None)
+        self.api_server.web_ui_updater.start.assert_not_called()
+        self.assertEqual(response.json, {'message': 'error'})
+        self.assertEqual(code, 400)
+
+    def test_web_ui_status(self):
+        """Test web_ui_status method."""
+        self.api_server.web_ui_updater = MagicMock()
+        self.api_server.web_ui_updater.status = {'state': 'finished'}
 
-        response = self.api_server.update_web_ui()
+        with self.api_server.app.app_context():
+            response, code = self.api_server.web_ui_status()
 
-        expected_response = 'Zip file from https://github.com/kytos/ui/' + \
-                            'releases/download/1.0/latest.zip is corrupted.'
-        self.assertEqual(response, expected_response)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.json, {'state': 'finished'})
+        self.assertEqual(code, 200)
 
     def test_enable_napp__error_not_installed(self):
         """Test _enable_napp method error case when napp is not installed."""
@@ -520,6 +600,16 @@ class TestAPIDecorator(unittest.TestCase):
         blueprint.add_url_rule.assert_called_once_with(
             '/api/test/MyNApp/rule', None, napp.my_endpoint)
 
+    @staticmethod
+    @patch('kytos.core.api_server.WebUIUpdater')
+    def test_install_web_ui(mock_web_ui_updater):
+        """Test the web UI being installed only if asked to."""
+        APIServer('test', install_web_ui=False)
+        mock_web_ui_updater.return_value.start.assert_not_called()
+
+        APIServer('test')
+        mock_web_ui_updater.return_value.start.assert_called_with(force=False)
+
     @staticmethod
     def _mock_api_server(napp):
         """Instantiate APIServer, mock ``.app`` and start ``napp`` API."""
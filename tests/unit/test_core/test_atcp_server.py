@@ -3,10 +3,13 @@
 import asyncio
 import errno
 import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
-from kytos.core.atcp_server import (KytosServer, KytosServerProtocol,
-                                    exception_handler)
+from kytos.core.atcp_server import (PAUSED_SECONDS, UNHANDLED_BYTES,
+                                    FlowControl, KytosServer,
+                                    KytosServerProtocol, exception_handler)
+from kytos.core.buffers import KytosBuffers
+from kytos.core.capture import _ReplayTransport
 
 # Using "nettest" TCP port as a way to avoid conflict with a running
 # Kytos server on 6653.
@@ -95,7 +98,8 @@ class TestKytosServerProtocol:
         expected_name = 'kytos/core.protocol.raw.in'
         mock_kytos_event.assert_called_with(content=expected_content,
                                             name=expected_name)
-        buffers.raw.aput.assert_called_with(mock_kytos_event.return_value)
+        buffers.raw.put_nowait.assert_called_with(
+            mock_kytos_event.return_value)
 
     @patch('kytos.core.atcp_server.KytosEvent')
     def test_connection_lost(self, mock_kytos_event):
@@ -110,4 +114,116 @@ class TestKytosServerProtocol:
         expected_name = 'kytos/core.protocol.connection.lost'
         mock_kytos_event.assert_called_with(content=expected_content,
                                             name=expected_name)
-        buffers.app.aput.assert_called_with(mock_kytos_event.return_value)
+        buffers.app.put_nowait.assert_called_with(
+            mock_kytos_event.return_value)
+
+
+class TestFlowControl:
+    """Test the backpressure on the connections filling the raw buffer."""
+
+    def setup_method(self):
+        """Instantiate a flow control of a fake buffer."""
+        # pylint: disable=attribute-defined-outside-init
+        self.loop = asyncio.new_event_loop()
+        self.buffer = Mock(**{'qsize.return_value': 0})
+        self.flow_control = FlowControl(self.buffer, 10, 4, loop=self.loop)
+        self.noisy, self.quiet = MagicMock(), MagicMock()
+
+    def teardown_method(self):
+        """Close the loop."""
+        self.loop.close()
+
+    def receive(self, protocol, size):
+        """Receive data whose event was added to the buffer."""
+        self.flow_control.received(protocol, size)
+
+    def test_pause_noisiest(self):
+        """Test only the connection sending most data being paused."""
+        self.receive(self.quiet, 10)
+        self.receive(self.noisy, 600)
+        self.buffer.qsize.return_value = 10
+        self.receive(self.noisy, 400)
+
+        assert self.flow_control.is_paused(self.noisy)
+        assert not self.flow_control.is_paused(self.quiet)
+        self.noisy.pause_reading.assert_called_once_with('buffer')
+        self.quiet.pause_reading.assert_not_called()
+
+    def test_resume_below_low_watermark(self):
+        """Test the paused connections being resumed after draining."""
+        paused_seconds = PAUSED_SECONDS.get()
+        self.buffer.qsize.return_value = 10
+        self.receive(self.noisy, 1000)
+        self.buffer.qsize.return_value = 5
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        assert self.flow_control.is_paused(self.noisy)
+        self.noisy.resume_reading.assert_not_called()
+
+        self.buffer.qsize.return_value = 4
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        assert not self.flow_control.is_paused(self.noisy)
+        self.noisy.resume_reading.assert_called_once_with('buffer')
+        assert PAUSED_SECONDS.get() > paused_seconds
+
+    def test_remove(self):
+        """Test a paused connection being lost."""
+        self.buffer.qsize.return_value = 10
+        self.receive(self.noisy, 1)
+
+        self.flow_control.remove(self.noisy)
+
+        assert not self.flow_control.is_paused(self.noisy)
+
+
+class TestEventSuppression:
+    """Test the events nobody listens to not being created."""
+
+    def setup_method(self):
+        """Create a server whose controller only listens to raw data."""
+        # pylint: disable=attribute-defined-outside-init
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.buffers = KytosBuffers(loop=self.loop)
+        self.controller = Mock(buffers=self.buffers)
+        self.controller.has_listeners.side_effect = (
+            lambda name: name.endswith('.raw.in'))
+        KytosServer(TEST_ADDRESS, KytosServerProtocol, self.controller,
+                    'openflow', loop=self.loop)
+
+    def teardown_method(self):
+        """Close the loop."""
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def test_suppressed_events(self):
+        """Test only the events with listeners being queued."""
+        protocol = KytosServerProtocol()
+
+        protocol.connection_made(_ReplayTransport('10.0.0.1', 40000, 6653))
+        protocol.data_received(b'data')
+        protocol.connection_lost(None)
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        assert self.buffers.app.qsize() == 0
+        assert self.buffers.raw.qsize() == 1
+        assert self.buffers.raw.get().name == 'kytos/core.openflow.raw.in'
+
+    def test_unhandled_data(self, caplog):
+        """Test the data nobody listens to being counted and logged once."""
+        self.controller.has_listeners.side_effect = None
+        self.controller.has_listeners.return_value = False
+        unhandled = UNHANDLED_BYTES.labels('openflow')
+        count = unhandled.get()
+        protocol = KytosServerProtocol()
+        protocol.connection_made(_ReplayTransport('10.0.0.1', 40000, 6653))
+
+        with caplog.at_level(logging.DEBUG, 'kytos.core.atcp_server'):
+            protocol.data_received(b'data')
+            protocol.data_received(b'more')
+
+        assert unhandled.get() == count + 8
+        assert protocol.raw_events == 0
+        assert len([record for record in caplog.records
+                    if record.getMessage().startswith('No listeners')]) == 1
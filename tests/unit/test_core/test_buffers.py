@@ -3,7 +3,9 @@ import asyncio
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from kytos.core.buffers import KytosBuffers, KytosEventBuffer
+from janus import Queue
+
+from kytos.core.buffers import QUEUE_SIZE, KytosBuffers, KytosEventBuffer
 
 
 # pylint: disable=protected-access
@@ -33,6 +35,32 @@ class TestKytosEventBuffer(TestCase):
 
         self.assertEqual(queue_event, event)
 
+    def test_metrics(self):
+        """Test events being counted by the buffer metrics."""
+        events_in = self.kytos_event_buffer._events_in.get()
+        events_out = self.kytos_event_buffer._events_out.get()
+
+        self.kytos_event_buffer.put(self.create_event_mock())
+        self.assertEqual(QUEUE_SIZE.labels('name').get(), 1)
+        self.kytos_event_buffer.get()
+
+        self.assertEqual(self.kytos_event_buffer._events_in.get(),
+                         events_in + 1)
+        self.assertEqual(self.kytos_event_buffer._events_out.get(),
+                         events_out + 1)
+        self.assertEqual(QUEUE_SIZE.labels('name').get(), 0)
+
+    @patch('kytos.core.buffers.TRACER')
+    def test_trace(self, mock_tracer):
+        """Test trace points recorded while the tracer is enabled."""
+        event = self.create_event_mock()
+
+        self.kytos_event_buffer.put(event)
+        self.kytos_event_buffer.get()
+
+        mock_tracer.enqueued.assert_called_with(event, 'name')
+        mock_tracer.dequeued.assert_called_with(event, 'name')
+
     def test_put__shutdown(self):
         """Test put method to shutdown event."""
         event = self.create_event_mock('kytos/core.shutdown')
@@ -49,6 +77,67 @@ class TestKytosEventBuffer(TestCase):
 
         self.assertTrue(self.kytos_event_buffer._reject_new_events)
 
+    def test_put_nowait(self):
+        """Test put_nowait method in the event loop."""
+        event = self.create_event_mock()
+
+        async def put_and_get():
+            self.kytos_event_buffer.put_nowait(event)
+            return await self.kytos_event_buffer.aget()
+
+        expected = self.loop.run_until_complete(put_and_get())
+
+        self.assertEqual(event, expected)
+
+    def test_put_nowait__batch(self):
+        """Test the events of a loop iteration being moved by one task."""
+        events = [self.create_event_mock() for _ in range(3)]
+
+        async def put():
+            for event in events:
+                self.kytos_event_buffer.put_nowait(event)
+            return self.kytos_event_buffer._flush_task
+
+        flush_task = self.loop.run_until_complete(put())
+        self.assertEqual(self.kytos_event_buffer.qsize(), 3)
+        self.loop.run_until_complete(flush_task)
+
+        self.assertIsNone(self.kytos_event_buffer._flush_task)
+        self.assertEqual([self.kytos_event_buffer.get() for _ in events],
+                         events)
+
+    def test_empty_and_full__pending(self):
+        """Test the events added by put_nowait counting before moved."""
+        self.kytos_event_buffer._queue = Queue(maxsize=2, loop=self.loop)
+        self.kytos_event_buffer._pending.append(self.create_event_mock())
+
+        self.assertFalse(self.kytos_event_buffer.empty())
+        self.assertFalse(self.kytos_event_buffer.full())
+
+        self.kytos_event_buffer.put(self.create_event_mock())
+
+        self.assertTrue(self.kytos_event_buffer.full())
+
+    def test_get_nowait(self):
+        """Test get_nowait method with queued and pending events."""
+        events = [self.create_event_mock() for _ in range(2)]
+        self.kytos_event_buffer.put(events[0])
+        self.kytos_event_buffer._pending.append(events[1])
+
+        self.assertEqual([self.kytos_event_buffer.get_nowait()
+                          for _ in range(3)], events + [None])
+
+    def test_put_nowait__shutdown(self):
+        """Test put_nowait method to shutdown event."""
+        event = self.create_event_mock('kytos/core.shutdown')
+
+        async def put():
+            self.kytos_event_buffer.put_nowait(event)
+
+        self.loop.run_until_complete(put())
+
+        self.assertTrue(self.kytos_event_buffer._reject_new_events)
+
     def test_aget(self):
         """Test aget async method."""
         event = self.create_event_mock()
@@ -0,0 +1,201 @@
+"""Test kytos.core.capture module."""
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from kytos.core.atcp_server import KytosServer, KytosServerProtocol
+from kytos.core.buffers import KytosBuffers
+from kytos.core.capture import (CLOSE, CONNECT, DATA, CaptureReader,
+                                CaptureWriter, Replayer, _ReplayTransport)
+from kytos.core.config import KytosConfig
+from kytos.core.controller import Controller
+from kytos.core.rate_limit import RateLimits
+
+
+class TestCapture(TestCase):
+    """Test CaptureWriter and CaptureReader."""
+
+    def setUp(self):
+        """Create a temporary capture file name."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'test.kcap')
+
+    def write_session(self, data=(b'abc', b'defg')):
+        """Write a session with one connection."""
+        writer = CaptureWriter(self.filename)
+        connection = writer.connection_made('10.0.0.1', 40000, 6653)
+        for segment in data:
+            writer.data(connection, segment)
+        writer.connection_lost(connection)
+        writer.close()
+
+    def read(self):
+        """Return the records of the capture file as tuples."""
+        reader = CaptureReader(self.filename)
+        try:
+            return [(record.kind, record.connection, record.timestamp,
+                     bytes(record.data)) for record in reader]
+        finally:
+            reader.close()
+
+    def test_read(self):
+        """Test the records of a session."""
+        self.write_session()
+
+        records = self.read()
+
+        self.assertEqual([record[0] for record in records],
+                         [CONNECT, DATA, DATA, CLOSE])
+        self.assertEqual(records[1][3], b'abc')
+        self.assertEqual(records[2][3], b'defg')
+        self.assertTrue(records[0][3].endswith(b'10.0.0.1'))
+        timestamps = [record[2] for record in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_sessions(self):
+        """Test sessions appended to the same file."""
+        self.write_session()
+        self.write_session([b'second'])
+
+        records = self.read()
+
+        self.assertEqual(len(records), 7)
+        self.assertNotEqual(records[0][1], records[4][1])
+        self.assertGreaterEqual(records[4][2], records[3][2])
+        self.assertEqual(records[5][3], b'second')
+
+    def test_truncated(self):
+        """Test a record truncated by a crash being ignored."""
+        self.write_session()
+        with open(self.filename, 'r+b') as capture_file:
+            capture_file.truncate(os.path.getsize(self.filename) - 20)
+
+        records = self.read()
+
+        self.assertEqual([record[0] for record in records], [CONNECT, DATA])
+
+    def test_not_closed(self):
+        """Test the records being in the file before it is closed."""
+        writer = CaptureWriter(self.filename)
+        self.addCleanup(writer.close)
+        connection = writer.connection_made('10.0.0.1', 40000, 6653)
+        writer.data(connection, b'abc')
+
+        records = self.read()
+
+        self.assertEqual([record[0] for record in records], [CONNECT, DATA])
+        self.assertEqual(records[1][3], b'abc')
+
+    def test_invalid_file(self):
+        """Test files that are not capture files."""
+        with open(self.filename, 'wb') as capture_file:
+            capture_file.write(b'not a capture file')
+
+        with self.assertRaises(ValueError):
+            CaptureReader(self.filename)
+
+    def test_server_protocol(self):
+        """Test the bytes received by the server protocol being captured."""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        writer = CaptureWriter(self.filename)
+        controller = Mock(buffers=KytosBuffers(loop=loop))
+        KytosServer(('127.0.0.1', 0), KytosServerProtocol, controller,
+                    'openflow', loop=loop, capture=writer)
+        protocol = KytosServerProtocol()
+
+        protocol.connection_made(_ReplayTransport('10.0.0.2', 40001, 6653))
+        protocol.data_received(b'data')
+        protocol.connection_lost(None)
+        writer.close()
+        loop.run_until_complete(asyncio.sleep(0))
+
+        self.assertEqual([(record[0], record[3]) for record in self.read()
+                          if record[0] != CONNECT],
+                         [(DATA, b'data'), (CLOSE, b'')])
+
+
+class TestReplayer(TestCase):
+    """Replay a capture file to a controller."""
+
+    def setUp(self):
+        """Instantiate a controller with a server and buffer handlers."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.controller = Controller(KytosConfig().options['daemon'],
+                                     loop=self.loop)
+        self.controller.log = Mock()
+        self.controller.server = KytosServer(
+            ('127.0.0.1', 0), KytosServerProtocol, self.controller,
+            'openflow', loop=self.loop)
+        self.raw_events = []
+        self.controller.events_listeners['kytos/core.openflow.raw.in'] = [
+            self.raw_events.append]
+        self.tasks = [
+            self.loop.create_task(self.controller.raw_event_handler()),
+            self.loop.create_task(self.controller.app_event_handler())]
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'test.kcap')
+        writer = CaptureWriter(self.filename)
+        for port in (40000, 40001):
+            connection = writer.connection_made('10.0.0.1', port, 6653)
+            writer.data(connection, b'\x04\x00\x00\x08\x00\x00\x00\x01')
+            writer.connection_lost(connection)
+        writer.close()
+
+    def tearDown(self):
+        """Stop the buffer handlers."""
+        for task in self.tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*self.tasks,
+                                                    return_exceptions=True))
+
+    def test_run(self):
+        """Test every captured segment reaching the listeners."""
+        replayer = Replayer(self.controller, self.filename, speed=0)
+
+        report = self.loop.run_until_complete(replayer.run())
+
+        self.assertTrue(report['verified'])
+        self.assertEqual(report['connections'], 2)
+        self.assertEqual(report['segments'], 2)
+        self.assertEqual(report['expected_events'], 6)
+        self.assertEqual([event.content['new_data']
+                          for event in self.raw_events],
+                         [b'\x04\x00\x00\x08\x00\x00\x00\x01'] * 2)
+        self.assertNotIn(Replayer.EVENTS_PATTERN,
+                         [pattern for pattern, listeners
+                          in self.controller.events_listeners.items()
+                          if listeners])
+
+    def test_run__rate_limited(self):
+        """Test the segments dropped by the rate limits not being expected."""
+        self.controller.server.rate_limits = RateLimits(
+            message_rates={'hello': 0.5})
+        replayer = Replayer(self.controller, self.filename, speed=0,
+                            timeout=0.1)
+
+        report = self.loop.run_until_complete(replayer.run())
+
+        self.assertTrue(report['verified'])
+        self.assertEqual(report['suppressed_segments'], 2)
+        self.assertEqual(report['expected_events'], 4)
+        self.assertEqual(self.raw_events, [])
+
+    def test_run__not_verified(self):
+        """Test the report of events that do not reach the listeners."""
+        self.tasks.pop().cancel()
+        replayer = Replayer(self.controller, self.filename, speed=0,
+                            timeout=0.1)
+
+        report = self.loop.run_until_complete(replayer.run())
+
+        self.assertFalse(report['verified'])
+        self.assertEqual(report['events'], 4)
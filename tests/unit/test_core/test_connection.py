@@ -1,5 +1,7 @@
 """Test kytos.core.connection module."""
+import asyncio
 from socket import error as SocketError
+from threading import Thread
 from unittest import TestCase
 from unittest.mock import MagicMock
 
@@ -60,6 +62,38 @@ class TestConnection(TestCase):
 
         self.assertIsNone(self.connection.socket)
 
+    def test_send__transport(self):
+        """Test sending through the transport in the thread of its loop."""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        transport = MagicMock()
+        connection = Connection('addr', 123, MagicMock(), transport=transport)
+
+        connection.send(b'data')
+        transport.write.assert_called_with(b'data')
+        connection.socket.sendall.assert_not_called()
+
+        thread = Thread(target=connection.send, args=(b'thread',))
+        thread.start()
+        thread.join()
+        self.assertEqual(transport.write.call_count, 1)
+        loop.run_until_complete(asyncio.sleep(0))
+        transport.write.assert_called_with(b'thread')
+
+    def test_close__transport(self):
+        """Test closing the transport instead of the socket."""
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        self.addCleanup(asyncio.get_event_loop().close)
+        socket, transport = MagicMock(), MagicMock()
+        connection = Connection('addr', 123, socket, transport=transport)
+
+        connection.close()
+
+        transport.close.assert_called()
+        socket.shutdown.assert_not_called()
+        self.assertFalse(connection.is_alive())
+
     def test_close(self):
         """Test close method."""
         self.connection.close()
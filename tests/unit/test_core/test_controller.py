@@ -4,6 +4,7 @@ import json
 import logging
 import sys
 import tempfile
+import time
 import warnings
 from copy import copy
 from unittest import TestCase
@@ -11,6 +12,9 @@ from unittest.mock import MagicMock, Mock, call, patch
 
 from kytos.core import Controller
 from kytos.core.config import KytosConfig
+from kytos.core.controller import DROPPED_AT_SHUTDOWN
+from kytos.core.events import KytosEvent
+from kytos.core.helpers import run_on_thread
 from kytos.core.logs import LogManager
 
 
@@ -49,7 +53,7 @@ class TestController(TestCase):
         handlers_bak = copy(logging.root.handlers)
 
         # Minimum to instantiate Controller
-        options = Mock(napps='')
+        options = Mock(napps='', workdir=None)
         path.return_value.exists.return_value = False
         controller = Controller(options, loop=loop)
 
@@ -90,6 +94,39 @@ class TestController(TestCase):
         self.controller.napps[(username, napp_name)] = napp
         return listener
 
+    def test_rest_listeners_profile(self):
+        """Test enabling, querying and disabling listeners profiling."""
+        listener = Mock(__qualname__='listener')
+        self.controller.events_listeners['kytos/.*'] = [listener]
+
+        _, code = self.controller.rest_listeners_profile('enable')
+        self.assertEqual(code, 200)
+        self.controller.events_listeners['kytos/.*'][0]('event')
+        response, _ = self.controller.rest_listeners_profile()
+        profile = json.loads(response)
+        self.controller.rest_listeners_profile('disable')
+
+        self.assertTrue(profile['enabled'])
+        stats = profile['napps']['kytos/core']['kytos/.*']['listener']
+        self.assertEqual(stats['calls'], 1)
+        self.assertIs(self.controller.events_listeners['kytos/.*'][0],
+                      listener)
+        _, code = self.controller.rest_listeners_profile('invalid')
+        self.assertEqual(code, 400)
+
+    def test_rest_traces(self):
+        """Test the spans being returned in the requested format."""
+        response, code = self.controller.rest_traces()
+        self.assertEqual(code, 200)
+        self.assertIn('traceEvents', json.loads(response))
+
+        response, code = self.controller.rest_traces('otlp')
+        self.assertEqual(code, 200)
+        self.assertIn('resourceSpans', json.loads(response))
+
+        _, code = self.controller.rest_traces('xml')
+        self.assertEqual(code, 400)
+
     def test_deprecation_warning(self):
         """Deprecated method should suggest @rest decorator."""
         with warnings.catch_warnings(record=True) as wrngs:
@@ -142,22 +179,26 @@ class TestController(TestCase):
             self.assertTrue(logger.getEffectiveLevel(), logging.CRITICAL)
 
     @patch.object(LogManager, 'load_config_file')
-    def test_debug_no_name(self, mock_load_config_file):
+    @patch.object(LogManager, 'set_debug')
+    def test_debug_no_name(self, mock_set_debug, mock_load_config_file):
         """Test the enable debug logger with default levels."""
-        # Mock the LogManager that loads the default Loggers
+        # Mock the LogManager that sets the default Loggers levels
         self.controller.toggle_debug()
         self._test_debug_result()
 
-        mock_load_config_file.assert_called_once()
+        mock_set_debug.assert_called_once()
+        mock_load_config_file.assert_not_called()
 
     @patch.object(LogManager, 'load_config_file')
-    def test_debug_empty_name(self, mock_load_config_file):
+    @patch.object(LogManager, 'set_debug')
+    def test_debug_empty_name(self, mock_set_debug, mock_load_config_file):
         """Test the enable debug logger with default levels."""
-        # Mock the LogManager that loads the default Loggers
+        # Mock the LogManager that sets the default Loggers levels
         self.controller.toggle_debug('')
         self._test_debug_result()
 
-        mock_load_config_file.assert_called_once()
+        mock_set_debug.assert_called_once()
+        mock_load_config_file.assert_not_called()
 
     def test_debug_wrong_name(self):
         """Test the enable debug logger with wrong name."""
@@ -224,6 +265,49 @@ class TestController(TestCase):
         mock_pre_install_napps.assert_called_with([napp])
         mock_load_napps.assert_called()
 
+    @staticmethod
+    @patch('kytos.core.controller.APIServer')
+    @patch('kytos.core.controller.KytosServer')
+    @patch('kytos.core.controller.Controller.load_napps')
+    @patch('kytos.core.controller.Controller.pre_install_napps')
+    def test_start_controller__worker(*args):
+        """Test a worker leaving the NApps and web UI to the coordinator."""
+        (mock_pre_install_napps, mock_load_napps, _, mock_api_server) = args
+        options = KytosConfig().options['daemon']
+        controller = Controller(options, loop=MagicMock(),
+                                workers=MagicMock(index=1))
+        controller.log = Mock()
+
+        controller.start_controller()
+
+        assert mock_api_server.call_args[0][-1] is False
+        controller.workers.attach.assert_called_with(controller)
+        mock_pre_install_napps.assert_not_called()
+        mock_load_napps.assert_not_called()
+
+    @staticmethod
+    @patch('kytos.core.controller.KytosServer')
+    @patch('kytos.core.controller.Controller.load_napps')
+    @patch('kytos.core.controller.Controller.pre_install_napps')
+    def test_start_controller__coordinator(*args):
+        """Test the workers being started once the NApps are installed."""
+        (mock_pre_install_napps, mock_load_napps, _) = args
+        options = KytosConfig().options['daemon']
+        workers = MagicMock(index=0)
+        manager = Mock()
+        manager.attach_mock(mock_pre_install_napps, 'pre_install_napps')
+        manager.attach_mock(workers.start, 'start')
+        manager.attach_mock(mock_load_napps, 'load_napps')
+        controller = Controller(options, loop=MagicMock(), workers=workers)
+        controller.log = Mock()
+        controller.napp_dir_listener = Mock()
+
+        controller.start_controller()
+
+        assert [name for name, *_ in manager.mock_calls] == [
+            'pre_install_napps', 'start', 'load_napps']
+        workers.start.assert_called_with(options)
+
     @patch('kytos.core.controller.Controller.__init__')
     @patch('kytos.core.controller.Controller.start')
     @patch('kytos.core.controller.Controller.stop')
@@ -256,6 +340,10 @@ class TestController(TestCase):
         (_, mock_unload_napps) = args
         server = MagicMock()
         buffers = MagicMock()
+        for buffer in (buffers.raw, buffers.msg_in, buffers.msg_out,
+                       buffers.app):
+            buffer.get_nowait.return_value = None
+            buffer.qsize.return_value = 0
         api_server = MagicMock()
         napp_dir_listener = MagicMock()
         pool = MagicMock()
@@ -267,6 +355,7 @@ class TestController(TestCase):
 
         self.controller.stop_controller()
 
+        server.stop_reading.assert_called()
         buffers.send_stop_signal.assert_called()
         api_server.stop_api_server.assert_called()
         napp_dir_listener.stop.assert_called()
@@ -274,6 +363,25 @@ class TestController(TestCase):
         mock_unload_napps.assert_called()
         server.shutdown.assert_called()
 
+    @patch('kytos.core.controller.Controller.unload_napps')
+    @patch('kytos.core.controller.KytosBuffers')
+    def test_stop_controller__worker(self, *_):
+        """Test a worker stopping without the coordinator API server."""
+        self.controller.options.shutdown_drain_timeout = 0
+        self.controller.workers = MagicMock()
+        self.controller.worker_index = 1
+        self.controller.server = MagicMock()
+        self.controller.api_server = MagicMock()
+        self.controller.napp_dir_listener = MagicMock()
+        self.controller._pool = MagicMock()
+        self.controller._loop = MagicMock()
+
+        self.controller.stop_controller()
+
+        self.controller.api_server.stop_api_server.assert_not_called()
+        self.controller.workers.stop.assert_called()
+        self.controller._loop.stop.assert_called()
+
     def test_status(self):
         """Test status method."""
         status_1 = self.controller.status()
@@ -315,6 +423,19 @@ class TestController(TestCase):
 
         method.assert_called_with(event)
 
+    @patch('kytos.core.controller.TRACER')
+    def test_notify_listeners__traced(self, mock_tracer):
+        """Test listeners of sampled events being called by the tracer."""
+        method = MagicMock()
+        self.controller.events_listeners = {'kytos/any': [method]}
+        event = MagicMock()
+        event.name = 'kytos/any'
+
+        self.controller.notify_listeners(event)
+
+        mock_tracer.dispatch.assert_called_with(method, event)
+        method.assert_not_called()
+
     def test_get_interface_by_id__not_interface(self):
         """Test get_interface_by_id method when interface does not exist."""
         resp_interface = self.controller.get_interface_by_id(None)
@@ -546,18 +667,115 @@ class TestController(TestCase):
 
         self.napps_manager.install.assert_called_with(str(napp_2), enable=True)
 
-    @patch('kytos.core.controller.Controller.load_napp')
-    def test_load_napps(self, mock_load):
+    @staticmethod
+    def get_napp_mock(username, name, napp_dependencies=()):
+        """Return a NApp mock as listed by NAppsManager."""
+        napp = MagicMock(username=username, napp_dependencies=[])
+        napp.name = name
+        napp.id = f'{username}/{name}'
+        napp.napp_dependencies = list(napp_dependencies)
+        return napp
+
+    @patch('kytos.core.controller.Controller._activate_napp')
+    @patch('kytos.core.controller.Controller._create_napp')
+    def test_load_napps(self, *args):
         """Test load_napps method."""
-        napp = MagicMock()
-        napp.username = 'kytos'
-        napp.name = 'name'
-        enabled_napps = [napp]
-        self.napps_manager.get_enabled_napps.return_value = enabled_napps
+        (mock_create, mock_activate) = args
+        napp = self.get_napp_mock('kytos', 'name')
+        instance = MagicMock()
+        mock_create.return_value = instance
+        self.napps_manager.get_enabled_napps.return_value = [napp]
+
+        self.controller.load_napps()
+
+        mock_create.assert_called_with('kytos', 'name')
+        mock_activate.assert_called_with('kytos', 'name', instance)
+        self.assertIn('kytos/name', self.controller.napps_load_times)
+
+    @patch('kytos.core.controller.Controller._activate_napp')
+    @patch('kytos.core.controller.Controller._create_napp')
+    def test_load_napps__order(self, *args):
+        """Test whether NApps are activated after their dependencies."""
+        (mock_create, mock_activate) = args
+        mock_create.side_effect = lambda username, name: name
+        napps = [self.get_napp_mock('kytos', 'topology', ['kytos/of_core']),
+                 self.get_napp_mock('kytos', 'of_lldp', ['kytos/of_core']),
+                 self.get_napp_mock('kytos', 'of_core')]
+        self.napps_manager.get_enabled_napps.return_value = napps
+
+        self.controller.load_napps()
+
+        expected = [call('kytos', name, name)
+                    for name in ('of_core', 'of_lldp', 'topology')]
+        self.assertEqual(mock_activate.call_args_list, expected)
+
+    @patch('kytos.core.controller.Controller._activate_napp')
+    @patch('kytos.core.controller.Controller._create_napp', return_value=None)
+    def test_load_napps__error(self, *args):
+        """Test load_napps method when a NApp can not be created."""
+        (_, mock_activate) = args
+        napp = self.get_napp_mock('kytos', 'name')
+        self.napps_manager.get_enabled_napps.return_value = [napp]
 
         self.controller.load_napps()
 
-        mock_load.assert_called_with('kytos', 'name')
+        mock_activate.assert_not_called()
+        self.assertEqual(self.controller.napps_load_times, {})
+
+    @patch('kytos.core.controller.Controller._activate_napp')
+    @patch('kytos.core.controller.Controller._create_napp')
+    def test_load_napps__activation_error(self, *args):
+        """Test a NApp failing to start not stopping the others."""
+        (mock_create, mock_activate) = args
+        mock_create.side_effect = lambda username, name: name
+        mock_activate.side_effect = [FileNotFoundError('ui'), None]
+        self.napps_manager.get_enabled_napps.return_value = [
+            self.get_napp_mock('kytos', 'a'), self.get_napp_mock('kytos', 'b')]
+
+        self.controller.load_napps()
+
+        self.assertEqual(mock_activate.call_count, 2)
+        self.assertEqual(list(self.controller.napps_load_times), ['kytos/b'])
+
+    @patch('kytos.core.controller.Controller._activate_napp')
+    @patch('kytos.core.controller.Controller._create_napp')
+    def test_load_napps__workers(self, *args):
+        """Test the loader threads using the controller event loop."""
+        (mock_create, mock_activate) = args
+        mock_create.side_effect = (
+            lambda username, name: asyncio.get_event_loop())
+        self.options.napps_load_workers = 2
+        self.napps_manager.get_enabled_napps.return_value = [
+            self.get_napp_mock('kytos', 'a'), self.get_napp_mock('kytos', 'b')]
+
+        self.controller.load_napps()
+
+        expected = [call('kytos', name, self.loop) for name in ('a', 'b')]
+        self.assertEqual(mock_activate.call_args_list, expected)
+
+    def test_get_napps_load_stages(self):
+        """Test _get_napps_load_stages method."""
+        napp_a = self.get_napp_mock('kytos', 'a')
+        napp_b = self.get_napp_mock('kytos', 'b', ['kytos/a', 'kytos/x'])
+        napp_c = self.get_napp_mock('kytos', 'c', ['kytos/b'])
+        napp_d = self.get_napp_mock('kytos', 'd')
+
+        stages = self.controller._get_napps_load_stages([napp_c, napp_d,
+                                                         napp_b, napp_a])
+
+        self.assertEqual(stages, [[napp_a, napp_d], [napp_b], [napp_c]])
+
+    def test_get_napps_load_stages__circular(self):
+        """Test _get_napps_load_stages method with circular dependencies."""
+        napp_a = self.get_napp_mock('kytos', 'a', ['kytos/b'])
+        napp_b = self.get_napp_mock('kytos', 'b', ['kytos/a'])
+        napp_c = self.get_napp_mock('kytos', 'c')
+
+        stages = self.controller._get_napps_load_stages([napp_a, napp_b,
+                                                         napp_c])
+
+        self.assertEqual(stages, [[napp_c], [napp_a, napp_b]])
+        self.controller.log.warning.assert_called()
 
     @patch('kytos.core.controller.import_module')
     def test_reload_napp_module__module_not_found(self, mock_import_module):
@@ -608,6 +826,58 @@ class TestController(TestCase):
         mock_load.assert_called_with('kytos', 'napp')
         self.assertEqual(code, 200)
 
+    @patch('kytos.core.controller.Controller.reload_napp_module')
+    @patch('kytos.core.controller.Controller._create_napp')
+    def test_reload_napp__held_events(self, *args):
+        """Test the events received while reloading being replayed."""
+        (mock_create_napp, _) = args
+        self.controller.api_server = MagicMock()
+        received = []
+
+        def shutdown(_):
+            # Events received while the NApp shuts down and is reloaded
+            for name in ('one', 'two'):
+                self.controller.notify_listeners(
+                    KytosEvent(f'kytos/napp.{name}'))
+
+        old_napp = MagicMock(_listeners={
+            'kytos/core.shutdown.kytos/napp': [shutdown],
+            'kytos/napp.*': [lambda event: received.append(('old', event))]})
+        new_napp = MagicMock(_listeners={
+            'kytos/napp.*': [lambda event: received.append(('new', event))]})
+        mock_create_napp.return_value = new_napp
+        self.controller._activate_napp('kytos', 'napp', old_napp)
+
+        code = self.controller.reload_napp('kytos', 'napp')
+        self.controller.notify_listeners(KytosEvent('kytos/napp.three'))
+
+        self.assertEqual(code, 200)
+        self.assertEqual([(instance, event.name)
+                          for instance, event in received],
+                         [('new', 'kytos/napp.one'), ('new', 'kytos/napp.two'),
+                          ('new', 'kytos/napp.three')])
+        self.assertEqual(self.controller.events_listeners['kytos/napp.*'],
+                         new_napp._listeners['kytos/napp.*'])
+        report = self.controller.napps_reload_reports['kytos/napp']
+        self.assertEqual((report['replayed'], report['dropped']), (2, 0))
+
+    def test_has_listeners(self):
+        """Test the listeners of NApps being seen when loaded or unloaded."""
+        self.controller.api_server = MagicMock()
+        napp = MagicMock(_listeners={
+            'kytos/core.shutdown.kytos/napp': [Mock()],
+            'kytos/core.openflow.raw.in': [Mock()]})
+        self.assertFalse(
+            self.controller.has_listeners('kytos/core.openflow.raw.in'))
+
+        self.controller._activate_napp('kytos', 'napp', napp)
+        self.assertTrue(
+            self.controller.has_listeners('kytos/core.openflow.raw.in'))
+
+        self.controller.unload_napp('kytos', 'napp')
+        self.assertFalse(
+            self.controller.has_listeners('kytos/core.openflow.raw.in'))
+
     @patch('kytos.core.controller.Controller.unload_napp')
     @patch('kytos.core.controller.Controller.reload_napp_module')
     def test_reload_napp__error(self, *args):
@@ -697,3 +967,105 @@ class TestController(TestCase):
         self.loop.run_until_complete(self.controller.app_event_handler())
 
         mock_notify_listeners.assert_called_with(event)
+
+
+class TestControllerDrain(TestCase):
+    """Test the buffers being drained when the controller stops."""
+
+    def setUp(self):
+        """Instantiate a controller with a message to be sent."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.controller = Controller(KytosConfig().options['daemon'],
+                                     loop=self.loop)
+        self.controller.log = Mock()
+        self.destination = MagicMock(state=0)
+
+    def flow_mod(self):
+        """Return a msg_out event."""
+        return KytosEvent('kytos/of_core.v0x04.messages.out.ofpt_flow_mod',
+                          content={'message': MagicMock(),
+                                   'destination': self.destination})
+
+    def test_drain_buffers(self):
+        """Test queued events and the events they create being handled."""
+        def handle_packet_in(_):
+            self.controller.buffers.msg_out.put(self.flow_mod())
+
+        self.controller.events_listeners['kytos/of_core.packet_in'] = [
+            handle_packet_in]
+        self.controller.buffers.msg_in.put(
+            KytosEvent('kytos/of_core.packet_in'))
+        self.controller.buffers.msg_out.put(self.flow_mod())
+
+        report = self.loop.run_until_complete(
+            self.controller.drain_buffers(1.0))
+
+        self.assertEqual(self.destination.send.call_count, 2)
+        self.assertEqual(report['events'], 3)
+        self.assertEqual(report['left'], {})
+
+    def test_drain_buffers__handler_threads(self):
+        """Test the loop writing what handler threads send while draining."""
+        written = []
+
+        @run_on_thread
+        def handle_packet_in(_):
+            time.sleep(0.02)
+            self.loop.call_soon_threadsafe(written.append, 'flow_mod')
+
+        self.controller.events_listeners['kytos/of_core.packet_in'] = [
+            handle_packet_in]
+        self.controller.buffers.msg_in.put(
+            KytosEvent('kytos/of_core.packet_in'))
+
+        report = self.loop.run_until_complete(
+            self.controller.drain_buffers(1.0))
+
+        self.assertEqual(written, ['flow_mod'])
+        self.assertEqual(report['handlers'], 0)
+
+    @patch('kytos.core.controller.Controller.stop_controller')
+    def test_stop_async(self, mock_stop_controller):
+        """Test the buffers being drained in the loop before stopping."""
+        self.controller.started_at = 1
+        self.controller.server = MagicMock()
+        self.controller.buffers.msg_out.put(self.flow_mod())
+
+        self.loop.run_until_complete(self.controller.stop_async())
+
+        self.controller.server.stop_reading.assert_called()
+        self.destination.send.assert_called_once()
+        mock_stop_controller.assert_called_with(True, drain=False)
+
+    @patch('kytos.core.controller.running_handlers')
+    def test_drain_buffers__timeout(self, mock_running_handlers):
+        """Test the report of handlers still running after the timeout."""
+        mock_running_handlers.return_value = [Mock()]
+        self.controller.buffers.msg_out.put(self.flow_mod())
+
+        report = self.loop.run_until_complete(
+            self.controller.drain_buffers(0.05))
+
+        self.destination.send.assert_called_once()
+        self.assertEqual(report['handlers'], 1)
+        self.controller.log.warning.assert_called_once()
+
+    @patch('kytos.core.controller.Controller.unload_napps')
+    def test_stop_controller__dropped(self, _):
+        """Test the events left without draining being counted."""
+        self.controller.options.shutdown_drain_timeout = 0
+        self.controller.server = MagicMock()
+        self.controller.api_server = MagicMock()
+        self.controller.napp_dir_listener = MagicMock()
+        self.controller._pool = MagicMock()
+        self.controller.buffers.msg_out.put(self.flow_mod())
+        dropped = DROPPED_AT_SHUTDOWN.labels('msg_out_event')
+        count = dropped.get()
+
+        self.controller.stop_controller()
+
+        self.controller.server.stop_reading.assert_not_called()
+        self.destination.send.assert_not_called()
+        self.assertEqual(dropped.get(), count + 1)
@@ -0,0 +1,59 @@
+"""Test kytos.core.event_loop module."""
+import asyncio
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from kytos.core.event_loop import (available_loops, get_loop_policy,
+                                   select_event_loop)
+
+
+class FakeUVLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """Policy standing for the uvloop one."""
+
+
+FAKE_UVLOOP = Mock(EventLoopPolicy=FakeUVLoopPolicy)
+
+
+class TestEventLoop(TestCase):
+    """Test the selection of the event loop implementation."""
+
+    def test_get_loop_policy__asyncio(self):
+        """Test the default asyncio loop."""
+        name, policy = get_loop_policy('asyncio')
+
+        self.assertEqual(name, 'asyncio')
+        self.assertIs(type(policy), asyncio.DefaultEventLoopPolicy)
+
+    @patch('kytos.core.event_loop._import_uvloop', return_value=FAKE_UVLOOP)
+    def test_get_loop_policy__uvloop(self, _):
+        """Test uvloop being used when it is installed."""
+        for option in ('uvloop', 'auto'):
+            name, policy = get_loop_policy(option)
+
+            self.assertEqual(name, 'uvloop')
+            self.assertIsInstance(policy, FakeUVLoopPolicy)
+        self.assertEqual(available_loops(), ['asyncio', 'uvloop'])
+
+    @patch('kytos.core.event_loop._import_uvloop', return_value=None)
+    def test_get_loop_policy__not_installed(self, _):
+        """Test asyncio being used when uvloop is not installed."""
+        with self.assertLogs('kytos.core.event_loop', 'WARNING'):
+            self.assertEqual(get_loop_policy('uvloop')[0], 'asyncio')
+        self.assertEqual(get_loop_policy('auto')[0], 'asyncio')
+        self.assertEqual(available_loops(), ['asyncio'])
+
+    def test_get_loop_policy__invalid(self):
+        """Test an unknown loop name."""
+        with self.assertRaises(ValueError):
+            get_loop_policy('trio')
+
+    @patch('kytos.core.event_loop._import_uvloop', return_value=FAKE_UVLOOP)
+    @patch('asyncio.set_event_loop_policy')
+    def test_select_event_loop(self, mock_set_policy, _):
+        """Test the policy being replaced only by one of another type."""
+        self.assertEqual(select_event_loop('asyncio'), 'asyncio')
+        mock_set_policy.assert_not_called()
+
+        self.assertEqual(select_event_loop('uvloop'), 'uvloop')
+        self.assertIsInstance(mock_set_policy.call_args[0][0],
+                              FakeUVLoopPolicy)
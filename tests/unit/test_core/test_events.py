@@ -1,7 +1,10 @@
 """Test kytos.core.events module."""
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
+from unittest.mock import patch
 
-from kytos.core.events import KytosEvent
+from kytos.core.events import (EventHolder, EventListeners, KytosEvent,
+                               _WallOffset)
 
 
 class TestKytosEvent(TestCase):
@@ -45,3 +48,146 @@ class TestKytosEvent(TestCase):
 
         self.event.content = {"message": "msg"}
         self.assertEqual(self.event.message, 'msg')
+
+    def test_timestamp(self):
+        """Test the creation time being converted to a UTC datetime."""
+        timestamp = self.event.timestamp
+
+        self.assertEqual(timestamp.tzinfo, timezone.utc)
+        self.assertLess(abs(datetime.now(timezone.utc) - timestamp),
+                        timedelta(seconds=1))
+        self.assertIs(self.event.timestamp, timestamp)
+
+        self.event.timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(self.event.timestamp.year, 2020)
+
+    @patch('kytos.core.events._monotonic_ns')
+    @patch('time.time')
+    def test_wall_offset(self, mock_time, mock_monotonic_ns):
+        """Test the wall clock offset following wall clock adjustments."""
+        wall_offset = _WallOffset()
+        mock_time.return_value = 1000.0
+        mock_monotonic_ns.return_value = 10 * 10 ** 9
+        self.assertEqual(wall_offset(), 990.0)
+
+        mock_time.return_value = 2000.0
+        mock_monotonic_ns.return_value = 20 * 10 ** 9
+        self.assertEqual(wall_offset(), 990.0)
+
+        mock_monotonic_ns.return_value = 70 * 10 ** 9
+        self.assertEqual(wall_offset(), 1930.0)
+
+    def test_name_interned(self):
+        """Test equal names being the same object."""
+        name = ''.join(['kytos/core', '.any'])
+
+        self.assertIs(KytosEvent(name).name, self.event.name)
+
+    def test_extra_attributes(self):
+        """Test attributes not declared in the event class."""
+        self.event.extra = 'value'
+
+        self.assertEqual(self.event.extra, 'value')
+
+
+# pylint: disable=protected-access
+class TestEventListeners(TestCase):
+    """EventListeners tests."""
+
+    def setUp(self):
+        """Create listeners of a few patterns."""
+        self.listeners = EventListeners({
+            'kytos/core.shutdown': ['shutdown'],
+            'kytos/of_core.*': ['of_core'],
+            '.*': ['all']})
+
+    def test_get_listeners(self):
+        """Test patterns being matched against the whole name."""
+        routes = self.listeners.get_listeners('kytos/core.shutdown')
+        self.assertEqual(routes, (['shutdown'], ['all']))
+
+        routes = self.listeners.get_listeners('kytos/core.shutdown.napp')
+        self.assertEqual(routes, (['all'], ))
+
+    def test_get_listeners__cached(self):
+        """Test listeners added to existing lists without clearing routes."""
+        routes = self.listeners.get_listeners('kytos/of_core.switch')
+        self.listeners['kytos/of_core.*'].append('new')
+
+        self.assertIs(self.listeners.get_listeners('kytos/of_core.switch'),
+                      routes)
+        self.assertEqual(routes, (['of_core', 'new'], ['all']))
+
+    def test_get_listeners__new_pattern(self):
+        """Test routes being updated when patterns change."""
+        self.listeners.get_listeners('kytos/topology.updated')
+
+        self.listeners.setdefault('kytos/topology.*', []).append('topology')
+        routes = self.listeners.get_listeners('kytos/topology.updated')
+        self.assertEqual(routes, (['all'], ['topology']))
+
+        del self.listeners['.*']
+        routes = self.listeners.get_listeners('kytos/topology.updated')
+        self.assertEqual(routes, (['topology'], ))
+
+    def test_get_listeners__max_routes(self):
+        """Test the cache being cleared when it is full."""
+        self.listeners.MAX_ROUTES = 2
+        for index in range(3):
+            self.listeners.get_listeners(f'kytos/event.{index}')
+
+        self.assertEqual(list(self.listeners._routes), ['kytos/event.2'])
+
+    def test_has_listeners(self):
+        """Test names matched by patterns without listeners."""
+        listeners = EventListeners({'kytos/core.openflow.raw.in': [],
+                                    'kytos/of_core.*': ['of_core']})
+
+        self.assertFalse(listeners.has_listeners('kytos/core.openflow.raw.in'))
+        self.assertTrue(listeners.has_listeners('kytos/of_core.switch'))
+        self.assertFalse(listeners.has_listeners('kytos/topology.updated'))
+
+        listeners['kytos/core.openflow.raw.in'].append('of_core')
+        listeners.setdefault('kytos/topology.*', []).append('topology')
+
+        self.assertTrue(listeners.has_listeners('kytos/core.openflow.raw.in'))
+        self.assertTrue(listeners.has_listeners('kytos/topology.updated'))
+
+
+class TestEventHolder(TestCase):
+    """Test the events held while listeners are replaced."""
+
+    def setUp(self):
+        """Create a holder of two events."""
+        self.holder = EventHolder(2)
+        self.delivered = []
+
+    def deliver(self, pattern, event):
+        """Record a delivered event."""
+        self.delivered.append((pattern, event.name))
+
+    def test_release(self):
+        """Test the held events being replayed in order after the swap."""
+        swapped = []
+        self.holder.listener('a')(KytosEvent('a'))
+        self.holder.listener('b')(KytosEvent('b'))
+        self.holder.listener('a')(KytosEvent('dropped'))
+
+        report = self.holder.release(
+            self.deliver, lambda: swapped.append(list(self.delivered)))
+
+        self.assertEqual(swapped, [[]])
+        self.assertEqual(self.delivered, [('a', 'a'), ('b', 'b')])
+        self.assertEqual(report['replayed'], 2)
+        self.assertEqual(report['dropped'], 1)
+        self.assertGreaterEqual(report['paused_seconds'], 0)
+
+    def test_after_release(self):
+        """Test events being delivered directly after the release."""
+        listener = self.holder.listener('a')
+        self.holder.release(self.deliver)
+
+        listener(KytosEvent('late'))
+
+        self.assertEqual(self.delivered, [('a', 'late')])
+        self.assertIs(self.holder.listener('a'), listener)
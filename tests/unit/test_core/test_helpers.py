@@ -1,8 +1,9 @@
 """Test kytos.core.helpers module."""
+from threading import Event
 from unittest import TestCase
 from unittest.mock import patch
 
-from kytos.core.helpers import get_time, run_on_thread
+from kytos.core.helpers import get_time, run_on_thread, running_handlers
 
 
 class TestHelpers(TestCase):
@@ -21,6 +22,25 @@ class TestHelpers(TestCase):
 
         mock_thread.return_value.start.assert_called()
 
+    def test_running_handlers(self):
+        """Test the threads of handlers being listed while running."""
+        release = Event()
+
+        @run_on_thread
+        def handler():
+            release.wait()
+
+        before = running_handlers()
+        handler()
+        threads = [thread for thread in running_handlers()
+                   if thread not in before]
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threads[0], running_handlers())
+
     def test_get_time__str(self):
         """Test get_time method passing a string as parameter."""
         date = get_time("2000-01-01T00:30:00")
@@ -2,7 +2,8 @@
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from kytos.core.kytosd import _create_pid_dir, async_main, main, start_shell
+from kytos.core.kytosd import (_create_pid_dir, _create_workers,
+                               _run_worker, async_main, main, start_shell)
 
 
 class TestKytosd(TestCase):
@@ -29,8 +30,27 @@ class TestKytosd(TestCase):
         mock_mkdirs.assert_called_with('/var/run/kytos', exist_ok=True)
         mock_chmod.assert_called_with('/var/run/kytos', 0o1777)
 
+    @patch('kytos.core.kytosd.WorkerPool')
+    @patch('kytos.core.kytosd.reuse_port_supported', return_value=False)
+    def test_create_workers__no_reuse_port(self, _, mock_worker_pool):
+        """Test a single process being started without SO_REUSEPORT."""
+        with self.assertLogs('kytos.core.kytosd', 'WARNING'):
+            self.assertIsNone(_create_workers(MagicMock(workers=4)))
+
+        mock_worker_pool.assert_not_called()
+
+    @patch('kytos.core.kytosd.WorkerPool')
+    @patch('kytos.core.kytosd.reuse_port_supported', return_value=True)
+    def test_create_workers(self, _, mock_worker_pool):
+        """Test the workers being created, but not started."""
+        workers = _create_workers(MagicMock(workers=4))
+
+        self.assertIs(workers, mock_worker_pool.return_value)
+        mock_worker_pool.assert_called_with(4, _run_worker)
+        workers.start.assert_not_called()
+
     @staticmethod
-    @patch('kytos.core.kytosd.InteractiveShellEmbed')
+    @patch('IPython.terminal.embed.InteractiveShellEmbed')
     def test_start_shell(mock_interactive_shell):
         """Test stop_api_server method."""
         start_shell(MagicMock())
@@ -44,7 +64,7 @@ class TestKytosd(TestCase):
     def test_main__foreground(*args):
         """Test main method in foreground."""
         (mock_kytos_config, mock_create_pid_dir, mock_async_main) = args
-        config = MagicMock(foreground=True)
+        config = MagicMock(foreground=True, event_loop='asyncio')
         options = {'daemon': config}
         mock_kytos_config.return_value.options = options
 
@@ -53,6 +73,23 @@ class TestKytosd(TestCase):
         mock_create_pid_dir.assert_called()
         mock_async_main.assert_called()
 
+    @staticmethod
+    @patch('kytos.core.kytosd.async_main')
+    @patch('kytos.core.kytosd._create_pid_dir')
+    @patch('kytos.core.kytosd.KytosConfig')
+    def test_main__profile_startup(*args):
+        """Test main method profiling the startup."""
+        (mock_kytos_config, _, mock_async_main) = args
+        config = MagicMock(foreground=True, profile_startup=True,
+                           event_loop='asyncio')
+        mock_kytos_config.return_value.options = {'daemon': config}
+
+        main(imports_started_at=0)
+
+        profiler = mock_async_main.call_args[0][1]
+        assert profiler.enabled
+        assert [name for name, _ in profiler.phases] == ['imports', 'config']
+
     @staticmethod
     @patch('kytos.core.kytosd.daemon.DaemonContext')
     @patch('kytos.core.kytosd.async_main')
@@ -61,7 +98,7 @@ class TestKytosd(TestCase):
     def test_main__background(*args):
         """Test main method in background."""
         (mock_kytos_config, mock_create_pid_dir, mock_async_main, _) = args
-        config = MagicMock(foreground=False)
+        config = MagicMock(foreground=False, event_loop='asyncio')
         options = {'daemon': config}
         mock_kytos_config.return_value.options = options
 
@@ -72,7 +109,7 @@ class TestKytosd(TestCase):
 
     @staticmethod
     @patch('kytos.core.kytosd.asyncio')
-    @patch('kytos.core.kytosd.InteractiveShellEmbed')
+    @patch('IPython.terminal.embed.InteractiveShellEmbed')
     @patch('kytos.core.kytosd.Controller')
     def test_async_main(*args):
         """Test async_main method."""
@@ -80,11 +117,12 @@ class TestKytosd(TestCase):
         controller = MagicMock()
         controller.options.debug = True
         controller.options.foreground = True
+        controller.worker_index = 0
         mock_controller.return_value = controller
 
         event_loop = MagicMock()
         mock_asyncio.get_event_loop.return_value = event_loop
 
-        async_main(MagicMock())
+        async_main(MagicMock(workers=1))
 
         event_loop.call_soon.assert_called_with(controller.start)
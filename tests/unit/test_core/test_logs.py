@@ -1,13 +1,16 @@
 """Test the logs module."""
 import importlib
+import json
 import logging
+import os
+import sys
+import tempfile
 from copy import copy
-from inspect import FrameInfo
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from kytos.core import logs
-from kytos.core.logs import LogManager, NAppLog
+from kytos.core.logs import JSONFormatter, LevelGuard, LogManager, NAppLog
 
 
 class LogTester(TestCase):
@@ -161,6 +164,57 @@ class TestLogManager(LogTester):
 
         parser.set.assert_not_called()
 
+    @patch.object(LogManager, '_CONFIG_LEVELS', {'logger_root': 'INFO',
+                                                 'logger_kytos': 'WARNING'})
+    @patch.object(LogManager, '_PARSER')
+    @patch.object(LogManager, 'set_level')
+    def test_set_debug(self, mock_set_level, parser):
+        """Test set_debug changing levels without loading the config."""
+        parser.get.return_value = 'kytos'
+
+        LogManager.set_debug(True)
+        mock_set_level.assert_any_call(None, 'DEBUG')
+        mock_set_level.assert_any_call('kytos', 'DEBUG')
+
+        LogManager.set_debug(False)
+        mock_set_level.assert_any_call(None, 'INFO')
+        mock_set_level.assert_any_call('kytos', 'WARNING')
+
+    def test_set_level(self):
+        """Test set_level refreshing the level guards."""
+        logger = logging.getLogger('kytos.test_set_level')
+        guard = LevelGuard(logger)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+
+        LogManager.set_level('kytos.test_set_level', logging.DEBUG)
+        self.assertTrue(guard.debug)
+
+        LogManager.set_level('kytos.test_set_level', logging.WARNING)
+        self.assertFalse(guard.debug)
+        self.assertFalse(guard.info)
+
+    def test_enable_json_logs(self):
+        """Test JSON records being written by the queue listener."""
+        logger = logging.getLogger('kytos.test_json')
+        logger.setLevel(logging.INFO)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'kytos.json')
+            handler = LogManager.enable_json_logs(filename)
+            self.assertIn(handler, logging.getLogger().handlers)
+
+            logger.info('Flow %s added', 1, extra={'dpid': '00:01'})
+            LogManager.disable_json_logs()
+
+            self.assertNotIn(handler, logging.getLogger().handlers)
+            with open(filename) as json_file:
+                records = [json.loads(line) for line in json_file]
+        record = next(record for record in records
+                      if record['logger'] == 'kytos.test_json')
+        self.assertEqual(record['message'], 'Flow 1 added')
+        self.assertEqual(record['level'], 'INFO')
+        self.assertEqual(record['dpid'], '00:01')
+
     def test_handler_filter(self):
         """Should not log harmless werkzeug "session is disconnected" msg."""
         logging.root.handlers = []
@@ -207,35 +261,72 @@ class TestLogManager(LogTester):
 class TestNAppLog(LogTester):
     """Test the log used by NApps."""
 
-    def setUp(self):
-        """Initialize variables."""
-        super().setUp()
-        self._inspect_patcher = None
-
-    def tearDown(self):
-        """Undo mocking."""
-        super().tearDown()
-        if self._inspect_patcher:
-            self._inspect_patcher.stop()
-
-    def _set_filename(self, filename):
-        """Mock the NApp's main.py file path."""
-        # Put the filename in the call stack
-        frame = FrameInfo(None, filename, None, None, None, None)
-        self._inspect_patcher = patch('kytos.core.logs.inspect')
-        inspect = self._inspect_patcher.start()
-        inspect.stack.return_value = [frame]
+    @staticmethod
+    def _call_from(filename, code):
+        """Run ``code`` as if it was in ``filename`` and return ``result``."""
+        namespace = {'NAppLog': NAppLog}
+        # pylint: disable=exec-used
+        exec(compile(code, filename, 'exec'), namespace)
+        return namespace['result']
 
     def test_napp_id_detection(self):
         """Test NApp ID detection based on filename."""
-        self._set_filename('/napps/username/name/main.py')
+        name = self._call_from('/napps/username/name/main.py',
+                               'result = NAppLog().name')
         expected_logger_name = 'kytos.napps.username/name'
-        napp_logger = NAppLog()
-        self.assertEqual(expected_logger_name, napp_logger.name)
+        self.assertEqual(expected_logger_name, name)
 
     def test_napp_id_not_found(self):
         """If NApp ID is not found, should use root logger."""
-        self._set_filename('not/an/expected/NApp/path.py')
+        name = self._call_from('not/an/expected/NApp/path.py',
+                               'result = NAppLog().name')
         root_logger = logging.getLogger("kytos.napps")
-        napp_logger = NAppLog()
-        self.assertEqual(root_logger.name, napp_logger.name)
+        self.assertEqual(root_logger.name, name)
+
+    def test_innermost_napp(self):
+        """Test the innermost NApp in the stack being detected."""
+        get_name = self._call_from('/napps/username/inner/main.py',
+                                   'def result():\n'
+                                   '    return NAppLog().name')
+        namespace = {'get_name': get_name}
+        # pylint: disable=exec-used
+        exec(compile('result = get_name()', '/napps/username/outer/main.py',
+                     'exec'), namespace)
+        self.assertEqual(namespace['result'], 'kytos.napps.username/inner')
+
+    def test_disabled_level(self):
+        """Test disabled logging methods not reaching the logger."""
+        logger = logging.getLogger('kytos.napps.username/disabled')
+        logger.setLevel(logging.INFO)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+
+        with patch.object(logging.Logger, 'debug') as mock_debug:
+            self._call_from('/napps/username/disabled/main.py',
+                            'NAppLog().debug("msg")\nresult = None')
+        mock_debug.assert_not_called()
+
+        with patch.object(logging.Logger, 'info') as mock_info:
+            self._call_from('/napps/username/disabled/main.py',
+                            'NAppLog().info("msg")\nresult = None')
+        mock_info.assert_called_once_with('msg')
+
+
+class TestJSONFormatter(TestCase):
+    """Test the JSONFormatter class."""
+
+    def test_format(self):
+        """Test a record formatted as JSON with its traceback."""
+        try:
+            raise ValueError('wrong value')
+        except ValueError:
+            record = logging.LogRecord('kytos', logging.ERROR, __file__, 1,
+                                       'error %s', ('msg',), sys.exc_info())
+        record.switch = '00:01'
+
+        data = json.loads(JSONFormatter().format(record))
+
+        self.assertEqual(data['message'], 'error msg')
+        self.assertEqual(data['logger'], 'kytos')
+        self.assertEqual(data['switch'], '00:01')
+        self.assertIn('ValueError: wrong value', data['exc_info'])
+        self.assertNotIn('args', data)
@@ -0,0 +1,150 @@
+"""Test kytos.core.metrics module."""
+from threading import Thread
+from unittest import TestCase
+
+from kytos.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestCounter(TestCase):
+    """Counter tests."""
+
+    def test_inc(self):
+        """Test inc method with and without amount."""
+        counter = Counter('events_total', 'Events.')
+        counter.inc()
+        counter.inc(2.5)
+
+        self.assertEqual(counter.get(), 3.5)
+
+    def test_inc__negative(self):
+        """Test counters not being decremented."""
+        counter = Counter('events_total', 'Events.')
+
+        with self.assertRaises(ValueError):
+            counter.inc(-1)
+
+    def test_inc__threads(self):
+        """Test increments from many threads being summed."""
+        counter = Counter('events_total', 'Events.')
+
+        def increment():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.get(), 4000)
+
+    def test_labels(self):
+        """Test labels returning the same child for the same values."""
+        counter = Counter('events_total', 'Events.', ['buffer'])
+        counter.labels('raw').inc()
+        counter.labels('raw').inc()
+        counter.labels('app').inc()
+
+        self.assertIs(counter.labels('raw'), counter.labels('raw'))
+        self.assertEqual(counter.labels('raw').get(), 2)
+        with self.assertRaises(ValueError):
+            counter.inc()
+        with self.assertRaises(ValueError):
+            counter.labels('raw', 'extra')
+
+    def test_invalid_name(self):
+        """Test invalid metric names."""
+        with self.assertRaises(ValueError):
+            Counter('kytos events', 'Events.')
+
+
+class TestGauge(TestCase):
+    """Gauge tests."""
+
+    def test_inc_dec_set(self):
+        """Test gauge updates."""
+        gauge = Gauge('connections', 'Connections.')
+        gauge.inc(3)
+        gauge.dec()
+        self.assertEqual(gauge.get(), 2)
+
+        gauge.set(10)
+        self.assertEqual(gauge.get(), 10)
+
+    def test_set_function(self):
+        """Test gauges read from a function."""
+        gauge = Gauge('queue_size', 'Queue size.')
+        gauge.set_function(lambda: 42)
+
+        self.assertEqual(gauge.get(), 42)
+
+
+class TestHistogram(TestCase):
+    """Histogram tests."""
+
+    def test_observe(self):
+        """Test observed values counted in their buckets."""
+        histogram = Histogram('latency_seconds', 'Latency.',
+                              buckets=[0.1, 1])
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+
+        buckets, total, count = histogram.get()
+
+        self.assertEqual(histogram.upper_bounds, (0.1, 1, float('inf')))
+        self.assertEqual(buckets, [2, 1, 1])
+        self.assertAlmostEqual(total, 2.65)
+        self.assertEqual(count, 4)
+
+
+class TestMetricsRegistry(TestCase):
+    """MetricsRegistry tests."""
+
+    def setUp(self):
+        """Create an empty registry."""
+        self.registry = MetricsRegistry()
+
+    def test_get_or_create(self):
+        """Test metrics being created once."""
+        counter = self.registry.counter('events_total', 'Events.')
+
+        self.assertIs(self.registry.counter('events_total', 'Events.'),
+                      counter)
+        self.assertIs(self.registry.get('events_total'), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge('events_total', 'Events.')
+
+    def test_unregister(self):
+        """Test unregister method."""
+        self.registry.counter('events_total', 'Events.')
+
+        self.registry.unregister('events_total')
+
+        self.assertIsNone(self.registry.get('events_total'))
+
+    def test_to_prometheus(self):
+        """Test the Prometheus text format."""
+        counter = self.registry.counter('events_total', 'Events\nin.',
+                                        ['buffer'])
+        counter.labels('ra"w').inc(2)
+        self.registry.gauge('connections', 'Connections.').set(1.0)
+        histogram = self.registry.histogram('latency_seconds', 'Latency.',
+                                            buckets=[0.5])
+        histogram.observe(0.25)
+
+        expected = '\n'.join([
+            '# HELP connections Connections.',
+            '# TYPE connections gauge',
+            'connections 1',
+            '# HELP events_total Events\\nin.',
+            '# TYPE events_total counter',
+            'events_total{buffer="ra\\"w"} 2',
+            '# HELP latency_seconds Latency.',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.5"} 1',
+            'latency_seconds_bucket{le="+Inf"} 1',
+            'latency_seconds_sum 0.25',
+            'latency_seconds_count 1',
+        ]) + '\n'
+        self.assertEqual(self.registry.to_prometheus(), expected)
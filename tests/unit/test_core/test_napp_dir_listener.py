@@ -2,6 +2,8 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
+from watchdog.events import DirCreatedEvent, FileCreatedEvent
+
 from kytos.core.napps.napp_dir_listener import NAppDirListener
 
 
@@ -37,3 +39,17 @@ class TestNAppDirListener(TestCase):
         """Test whether on_deleted is calling unload_napp."""
         self.napp_dir_listener.on_deleted(self.event)
         self.controller.unload_napp.assert_called_with("username", "napp_name")
+
+    def test_dispatch(self):
+        """Test whether dispatch invalidates the NApps index and UI."""
+        event = FileCreatedEvent('/tmp/.installed/username/napp/kytos.json')
+        self.napp_dir_listener.dispatch(event)
+        self.controller.napps_manager.invalidate.assert_called_once()
+        ui_assets = self.controller.api_server.ui_assets
+        ui_assets.invalidate.assert_called_once()
+
+    def test_dispatch__bytecode(self):
+        """Test whether dispatch ignores Python bytecode changes."""
+        event = DirCreatedEvent('/tmp/username/napp_name/__pycache__')
+        self.napp_dir_listener.dispatch(event)
+        self.controller.napps_manager.invalidate.assert_not_called()
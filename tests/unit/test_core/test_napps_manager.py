@@ -42,17 +42,15 @@ class TestNAppsManager(unittest.TestCase):
         return napp
 
     @staticmethod
-    def get_new_napps_manager():
-        """Return a NewNappsManager mock."""
+    def get_napps_index():
+        """Return a NApps index with a NApp depending on another one."""
         napp = MagicMock()
         napp.napp_dependencies = ['file://any/kytos/napp2:1.0']
 
         napp_2 = MagicMock()
         napp_2.napp_dependencies = []
 
-        new_napp_manager = MagicMock()
-        new_napp_manager.napps = {'kytos/napp': napp, 'kytos/napp2': napp_2}
-        return new_napp_manager
+        return {'kytos/napp': napp, 'kytos/napp2': napp_2}
 
     @patch('shutil.rmtree')
     @patch('shutil.move')
@@ -112,11 +110,12 @@ class TestNAppsManager(unittest.TestCase):
         self.assertFalse(installed)
 
     @patch('kytos.core.napps.NAppsManager.is_installed', return_value=True)
-    @patch('kytos.core.napps.manager.NewNAppManager')
+    @patch('kytos.core.napps.NAppsManager.is_enabled', return_value=False)
+    @patch('kytos.core.napps.NAppsManager._get_index')
     def test_uninstall(self, *args):
         """Test uninstall method."""
-        (mock_new_napp_manager, _) = args
-        mock_new_napp_manager.return_value = self.get_new_napps_manager()
+        (mock_get_index, _, _) = args
+        mock_get_index.return_value = self.get_napps_index()
 
         self.napps_manager._installed_path = self.get_path(['json'])
         uninstalled = self.napps_manager.uninstall('kytos', 'napp')
@@ -124,11 +123,12 @@ class TestNAppsManager(unittest.TestCase):
         self.assertTrue(uninstalled)
 
     @patch('kytos.core.napps.NAppsManager.is_installed', return_value=False)
-    @patch('kytos.core.napps.manager.NewNAppManager')
+    @patch('kytos.core.napps.NAppsManager.is_enabled', return_value=False)
+    @patch('kytos.core.napps.NAppsManager._get_index')
     def test_uninstall__not_installed(self, *args):
         """Test uninstall method when napp is not installed."""
-        (mock_new_napp_manager, _) = args
-        mock_new_napp_manager.return_value = self.get_new_napps_manager()
+        (mock_get_index, _, _) = args
+        mock_get_index.return_value = self.get_napps_index()
 
         uninstalled = self.napps_manager.uninstall('kytos', 'napp')
 
@@ -141,10 +141,10 @@ class TestNAppsManager(unittest.TestCase):
 
         self.assertFalse(uninstalled)
 
-    @patch('kytos.core.napps.manager.NewNAppManager')
-    def test_enable(self, mock_new_napp_manager):
+    @patch('kytos.core.napps.NAppsManager._get_index')
+    def test_enable(self, mock_get_index):
         """Test enable method."""
-        mock_new_napp_manager.return_value = self.get_new_napps_manager()
+        mock_get_index.return_value = self.get_napps_index()
 
         self.napps_manager._installed_path = self.get_path(['json'])
         self.napps_manager._enabled_path = self.get_path(['json'])
@@ -158,10 +158,10 @@ class TestNAppsManager(unittest.TestCase):
 
         self.assertTrue(enabled)
 
-    @patch('kytos.core.napps.manager.NewNAppManager')
-    def test_disable(self, mock_new_napp_manager):
+    @patch('kytos.core.napps.NAppsManager._get_index')
+    def test_disable(self, mock_get_index):
         """Test disable method."""
-        mock_new_napp_manager.return_value = self.get_new_napps_manager()
+        mock_get_index.return_value = self.get_napps_index()
 
         self.napps_manager._enabled_path = self.get_path(['json'])
 
@@ -193,33 +193,41 @@ class TestNAppsManager(unittest.TestCase):
 
         mock_disable.assert_called_once()
 
-    @patch('kytos.core.napps.NApp.create_from_uri')
-    @patch('kytos.core.napps.NAppsManager.get_enabled_napps')
-    def test_is_enabled(self, *args):
+    @patch('kytos.core.napps.NAppsManager.get_napps_from_path')
+    def test_is_enabled(self, mock_get_napps_from_path):
         """Test is_enabled method."""
-        (mock_get_enabled_napps, mock_create_from_uri) = args
-        napp = MagicMock()
-        mock_create_from_uri.return_value = napp
-        mock_get_enabled_napps.return_value = [napp]
-
-        is_enabled = self.napps_manager.is_enabled('kytos', 'napp')
+        napp = MagicMock(id='kytos/napp')
+        mock_get_napps_from_path.return_value = [napp]
 
-        mock_create_from_uri.assert_called_with('kytos/napp')
-        self.assertTrue(is_enabled)
+        self.assertTrue(self.napps_manager.is_enabled('kytos', 'napp'))
+        self.assertFalse(self.napps_manager.is_enabled('kytos', 'napp2'))
+        mock_get_napps_from_path.assert_called_once_with(
+            self.napps_manager._enabled_path)
 
-    @patch('kytos.core.napps.NApp.create_from_uri')
-    @patch('kytos.core.napps.NAppsManager.get_installed_napps')
-    def test_is_installed(self, *args):
+    @patch('kytos.core.napps.NAppsManager.get_napps_from_path')
+    def test_is_installed(self, mock_get_napps_from_path):
         """Test is_installed method."""
-        (mock_get_installed_napps, mock_create_from_uri) = args
-        napp = MagicMock()
-        mock_create_from_uri.return_value = napp
-        mock_get_installed_napps.return_value = [napp]
-
-        is_installed = self.napps_manager.is_installed('kytos', 'napp')
-
-        mock_create_from_uri.assert_called_with('kytos/napp')
-        self.assertTrue(is_installed)
+        napp = MagicMock(id='kytos/napp')
+        mock_get_napps_from_path.return_value = [napp]
+
+        self.assertTrue(self.napps_manager.is_installed('kytos', 'napp'))
+        self.assertFalse(self.napps_manager.is_installed('kytos', 'napp2'))
+        mock_get_napps_from_path.assert_called_once_with(
+            self.napps_manager._installed_path)
+
+    @patch('kytos.core.napps.NAppsManager.get_napps_from_path')
+    def test_invalidate(self, mock_get_napps_from_path):
+        """Test whether invalidate forces a new filesystem scan."""
+        napp = MagicMock(id='kytos/napp')
+        mock_get_napps_from_path.return_value = [napp]
+
+        self.napps_manager.get_installed_napps()
+        self.napps_manager.get_installed_napps()
+        self.assertEqual(mock_get_napps_from_path.call_count, 1)
+
+        self.napps_manager.invalidate()
+        self.napps_manager.get_installed_napps()
+        self.assertEqual(mock_get_napps_from_path.call_count, 2)
 
     def test_get_napp_fullname_from_uri(self):
         """Test get_napp_fullname_from_uri method."""
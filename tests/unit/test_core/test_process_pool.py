@@ -0,0 +1,117 @@
+"""Test kytos.core.process_pool module."""
+import os
+import pickle
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from kytos.core.helpers import run_in_process
+from kytos.core.process_pool import (PROCESS_POOL, ProcessPool,
+                                     _create_executor, _get_context)
+
+
+@run_in_process()
+def get_pid(value):
+    """Return the process id and ``value``."""
+    return os.getpid(), value
+
+
+@run_in_process(result_event='kytos/test.result')
+def divide(dividend, divisor=1):
+    """Return the division result."""
+    return dividend / divisor
+
+
+class TestProcessPool(TestCase):
+    """ProcessPool tests."""
+
+    def setUp(self):
+        """Configure the pool with a single process."""
+        self.controller = MagicMock()
+        PROCESS_POOL.configure(self.controller, max_workers=1)
+        self.addCleanup(PROCESS_POOL.shutdown)
+
+    def wait_event(self):
+        """Return the event put in the app buffer."""
+        put = self.controller.buffers.app.put
+        for _ in range(500):
+            if put.called:
+                break
+            time.sleep(0.01)
+        return put.call_args[0][0]
+
+    def test_run_in_process(self):
+        """Test the function running in another process."""
+        pid, value = get_pid('value').result(10)
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(value, 'value')
+        self.assertEqual(get_pid.__wrapped__(1), (os.getpid(), 1))
+
+    def test_result_event(self):
+        """Test the result being sent to the app buffer."""
+        self.assertEqual(divide(6, divisor=3).result(10), 2)
+
+        event = self.wait_event()
+        self.assertEqual(event.name, 'kytos/test.result')
+        self.assertEqual(event.content, {'result': 2})
+
+    def test_exception(self):
+        """Test exceptions being raised and sent to the app buffer."""
+        future = divide(1, 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            future.result(10)
+        event = self.wait_event()
+        self.assertIsInstance(event.content['exception'], ZeroDivisionError)
+
+    def test_not_picklable(self):
+        """Test arguments that cannot be pickled."""
+        with self.assertRaises((AttributeError, pickle.PicklingError)):
+            get_pid(lambda: None)
+
+    def test_not_forked(self):
+        """Test the processes not being forked from the controller."""
+        self.assertNotEqual(_get_context().get_start_method(), 'fork')
+
+    @patch('kytos.core.process_pool.ProcessPoolExecutor')
+    @patch('kytos.core.process_pool.multiprocessing')
+    def test_create_executor__no_mp_context(self, multiprocessing, executor):
+        """Test the start method being set where there is no mp_context."""
+        multiprocessing.get_start_method.return_value = None
+        method = _get_context().get_start_method()
+        multiprocessing.get_context.return_value = _get_context()
+
+        with patch('kytos.core.process_pool._HAS_MP_CONTEXT', False):
+            self.assertIs(_create_executor(2), executor.return_value)
+
+        executor.assert_called_once_with(2)
+        multiprocessing.set_start_method.assert_called_once_with(method)
+
+    @patch('kytos.core.process_pool.ProcessPoolExecutor')
+    @patch('kytos.core.process_pool.multiprocessing')
+    def test_create_executor__start_method_set(self, multiprocessing,
+                                               executor):
+        """Test a start method set before the pool being kept."""
+        multiprocessing.get_start_method.return_value = 'fork'
+        multiprocessing.get_context.return_value = _get_context()
+
+        with patch('kytos.core.process_pool._HAS_MP_CONTEXT', False), \
+                self.assertLogs('kytos.core.process_pool', 'WARNING'):
+            _create_executor(2)
+
+        executor.assert_called_once_with(2)
+        multiprocessing.set_start_method.assert_not_called()
+
+    def test_shutdown(self):
+        """Test the processes being started again after a shutdown."""
+        pool = ProcessPool()
+        pool.configure(self.controller, max_workers=1)
+        pool.submit(get_pid.__wrapped__, ('value',)).result(10)
+
+        pool.shutdown()
+
+        self.assertIsNone(pool._executor)  # pylint: disable=protected-access
+        self.assertEqual(pool.submit(get_pid.__wrapped__, (1,)).result(10)[1],
+                         1)
+        pool.shutdown()
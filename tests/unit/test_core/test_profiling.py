@@ -0,0 +1,159 @@
+"""Test kytos.core.profiling module."""
+import json
+import tempfile
+from threading import Event
+from unittest import TestCase
+from unittest.mock import Mock
+
+from kytos.core.helpers import run_on_thread, running_handlers
+from kytos.core.profiling import ListenerProfiler, StartupProfiler
+
+
+class TestStartupProfiler(TestCase):
+    """StartupProfiler tests."""
+
+    def setUp(self):
+        """Instantiate a StartupProfiler."""
+        self.profiler = StartupProfiler()
+
+    def test_phase(self):
+        """Test phase method records the phases in order."""
+        with self.profiler.phase('config'):
+            pass
+        with self.profiler.phase('napps'):
+            pass
+
+        names = [name for name, _ in self.profiler.phases]
+        self.assertEqual(names, ['config', 'napps'])
+
+    def test_phase__disabled(self):
+        """Test phase method when the profiler is disabled."""
+        profiler = StartupProfiler(enabled=False)
+        with profiler.phase('config'):
+            pass
+        profiler.add('imports', 1.0)
+
+        self.assertEqual(profiler.phases, [])
+
+    def test_report(self):
+        """Test report method."""
+        self.profiler.add('imports', 1.5)
+        self.profiler.add('napps', 0.5)
+        self.profiler.napps = {'kytos/of_core': 0.1, 'kytos/topology': 0.3}
+
+        report = self.profiler.report()
+
+        self.assertIn('imports', report)
+        self.assertIn('75.0%', report)
+        self.assertLess(report.index('kytos/topology'),
+                        report.index('kytos/of_core'))
+
+    def test_save(self):
+        """Test save method."""
+        self.profiler.add('imports', 1.0)
+        with tempfile.NamedTemporaryFile('r') as profile_file:
+            self.assertTrue(self.profiler.save(profile_file.name))
+            profile = json.load(profile_file)
+
+        self.assertEqual(profile['phases'],
+                         [{'name': 'imports', 'seconds': 1.0}])
+        self.assertEqual(profile['total'], 1.0)
+
+    def test_save__error(self):
+        """Test save method when the file can not be written."""
+        self.assertFalse(self.profiler.save('/nonexistent/profile.json'))
+
+
+class FakeNApp:
+    """NApp with a threaded and an inline listener."""
+
+    napp_id = 'kytos/fake'
+
+    def __init__(self):
+        """Create the events set by the listeners."""
+        self.handled = Event()
+
+    @run_on_thread
+    def threaded(self, event):
+        """Handle an event in a new thread."""
+        self.handled.set()
+        if event == 'error':
+            raise ValueError('error event')
+
+    def inline(self, event):
+        """Handle an event in the caller thread."""
+        if event == 'error':
+            raise ValueError('error event')
+
+
+class TestListenerProfiler(TestCase):
+    """ListenerProfiler tests."""
+
+    def setUp(self):
+        """Instantiate a ListenerProfiler and a NApp."""
+        self.profiler = ListenerProfiler()
+        self.napp = FakeNApp()
+        self.events_listeners = {'.*': [self.napp.inline],
+                                 'kytos/.*': [self.napp.threaded]}
+
+    def get_stats(self, pattern, name):
+        """Return the stats of a FakeNApp listener."""
+        napps = self.profiler.as_dict()['napps']
+        return napps['kytos/fake'][pattern][f'FakeNApp.{name}']
+
+    def test_enable(self):
+        """Test enable wrapping listeners that compare equal."""
+        self.profiler.enable(self.events_listeners)
+
+        listener = self.events_listeners['.*'][0]
+        self.assertIsNot(listener, self.napp.inline)
+        self.assertEqual(listener, self.napp.inline)
+        self.events_listeners['.*'].remove(self.napp.inline)
+        self.assertEqual(self.events_listeners['.*'], [])
+
+    def test_disable(self):
+        """Test disable restoring the original listeners."""
+        self.profiler.enable(self.events_listeners)
+        self.profiler.disable(self.events_listeners)
+
+        self.assertIs(self.events_listeners['.*'][0].__self__, self.napp)
+        self.assertFalse(self.profiler.as_dict()['enabled'])
+
+    def test_inline_listener(self):
+        """Test calls and errors of an inline listener."""
+        self.profiler.enable(self.events_listeners)
+        listener = self.events_listeners['.*'][0]
+
+        listener('event')
+        with self.assertRaises(ValueError):
+            listener('error')
+
+        stats = self.get_stats('.*', 'inline')
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertIn('error event', stats['last_error'])
+        self.assertIsNotNone(stats['p99_seconds'])
+
+    def test_threaded_listener(self):
+        """Test threaded listeners timed inside their thread."""
+        self.profiler.enable(self.events_listeners)
+
+        self.events_listeners['kytos/.*'][0]('event')
+
+        self.assertTrue(self.napp.handled.wait(1))
+        # The timed thread is waited for when draining at shutdown
+        for thread in running_handlers():
+            thread.join(1)
+        stats = self.get_stats('kytos/.*', 'threaded')
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(stats['max_in_flight'], 1)
+
+    def test_reset(self):
+        """Test reset discarding the stats."""
+        listener = self.profiler.wrap(Mock(__qualname__='listener'), '.*')
+        listener('event')
+
+        self.profiler.reset()
+
+        self.assertEqual(self.profiler.as_dict()['napps'], {})
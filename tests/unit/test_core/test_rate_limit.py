@@ -0,0 +1,212 @@
+"""Test kytos.core.rate_limit module."""
+import asyncio
+import struct
+from unittest import TestCase
+from unittest.mock import Mock
+
+from kytos.core.atcp_server import KytosServer, KytosServerProtocol
+from kytos.core.buffers import KytosBuffers
+from kytos.core.capture import _ReplayTransport
+from kytos.core.rate_limit import RateLimits, TokenBucket
+
+
+def message(message_type, body=b''):
+    """Return an OpenFlow 1.3 message."""
+    return struct.pack('!BBHI', 4, message_type, 8 + len(body), 0) + body
+
+
+PACKET_IN = message(10, bytes(24))
+ECHO_REQUEST = message(2)
+
+
+class FakeClock:
+    """Clock advanced by the tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(TestCase):
+    """Test the token bucket."""
+
+    def setUp(self):
+        """Create a bucket of 10 tokens per second."""
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(10, 5, self.clock)
+
+    def test_consume(self):
+        """Test the burst being consumed and refilled over time."""
+        self.assertEqual(sum(self.bucket.consume() for _ in range(10)), 5)
+
+        self.clock.now = 0.2
+
+        self.assertTrue(self.bucket.consume(2))
+        self.assertFalse(self.bucket.consume())
+
+    def test_borrow(self):
+        """Test the seconds until a bucket in debt has tokens."""
+        for _ in range(5):
+            self.assertEqual(self.bucket.borrow(), 0)
+
+        self.assertAlmostEqual(self.bucket.borrow(3), 0.3)
+
+
+class TestRateLimiter(TestCase):
+    """Test the rate limiter of a connection."""
+
+    def setUp(self):
+        """Create a fake clock."""
+        self.clock = FakeClock()
+
+    def limiter(self, **kwargs):
+        """Return a limiter of a connection."""
+        return RateLimits(clock=self.clock, **kwargs).limiter()
+
+    def test_invalid(self):
+        """Test invalid options."""
+        with self.assertRaises(ValueError):
+            RateLimits(10, action='block')
+        with self.assertRaises(ValueError):
+            RateLimits(message_rates={'packet_out_storm': 10})
+
+    def test_from_options(self):
+        """Test the limits being disabled by default."""
+        options = Mock(ingress_rate_limit=0, ingress_rate_burst=0,
+                       ingress_message_rate_limits={},
+                       ingress_rate_limit_action='drop',
+                       ingress_rate_limit_sample=0.1)
+        self.assertIsNone(RateLimits.from_options(options))
+
+        options.ingress_message_rate_limits = {'packet_in': 10, '12': 1}
+        limits = RateLimits.from_options(options)
+        self.assertEqual(limits.message_rates, {10: 10, 12: 1})
+
+    def test_filter__split_messages(self):
+        """Test messages split among segments being returned whole."""
+        limiter = self.limiter(rate=100)
+        data = PACKET_IN + ECHO_REQUEST
+
+        self.assertEqual(limiter.filter(data[:10]), b'')
+        self.assertEqual(limiter.filter(data[10:36]), PACKET_IN)
+        self.assertEqual(limiter.filter(data[36:]), ECHO_REQUEST)
+
+    def test_filter__drop(self):
+        """Test the messages over the limit of their type being dropped."""
+        limiter = self.limiter(message_rates={'packet_in': 2})
+
+        data = limiter.filter(PACKET_IN * 3 + ECHO_REQUEST + PACKET_IN)
+
+        self.assertEqual(data, PACKET_IN * 2 + ECHO_REQUEST)
+        self.assertEqual(limiter.pop_report(), {10: 2})
+
+        self.clock.now = 0.5
+
+        self.assertEqual(limiter.filter(PACKET_IN * 2), PACKET_IN)
+        self.assertIsNone(limiter.pop_report())
+
+    def test_filter__control_messages(self):
+        """Test echo requests not being dropped during a PacketIn storm."""
+        limiter = self.limiter(rate=2)
+
+        data = limiter.filter(PACKET_IN * 3 + ECHO_REQUEST + PACKET_IN)
+
+        self.assertEqual(data, PACKET_IN * 2 + ECHO_REQUEST)
+        self.assertEqual(limiter.pop_report(), {10: 2})
+
+        limiter = self.limiter(rate=2, message_rates={'echo_request': 1})
+
+        data = limiter.filter(PACKET_IN * 3 + ECHO_REQUEST * 2)
+
+        self.assertEqual(data, PACKET_IN * 2 + ECHO_REQUEST)
+
+    def test_filter__sample(self):
+        """Test one of every N limited messages being kept."""
+        limiter = self.limiter(rate=1, action='sample', sample=0.25)
+
+        data = limiter.filter(PACKET_IN * 9)
+
+        self.assertEqual(data, PACKET_IN * 3)
+        self.assertEqual(limiter.limited, {10: 8})
+
+    def test_filter__pause(self):
+        """Test every message being kept with the time to pause reading."""
+        limiter = self.limiter(rate=10, action='pause')
+
+        self.assertEqual(limiter.filter(PACKET_IN * 10), PACKET_IN * 10)
+        self.assertEqual(limiter.delay, 0)
+
+        self.assertEqual(limiter.filter(PACKET_IN * 5), PACKET_IN * 5)
+        self.assertAlmostEqual(limiter.delay, 0.5)
+
+
+class TestIsolation(TestCase):
+    """Test a noisy switch not affecting a quiet one."""
+
+    def setUp(self):
+        """Create a server with rate limits and two connections."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.buffers = KytosBuffers(loop=self.loop)
+        self.protocols = {}
+
+    def connect(self, rate_limits):
+        """Connect a noisy and a quiet switch to a new server."""
+        KytosServer(('127.0.0.1', 0), KytosServerProtocol,
+                    Mock(buffers=self.buffers), 'openflow', loop=self.loop,
+                    rate_limits=rate_limits)
+        for index, name in enumerate(('noisy', 'quiet')):
+            protocol = KytosServerProtocol()
+            protocol.connection_made(
+                _ReplayTransport(f'10.0.0.{index + 1}', 40000, 6653))
+            self.protocols[name] = protocol
+
+    def drain(self, buffer):
+        """Return the events of ``buffer``."""
+        self.loop.run_until_complete(asyncio.sleep(0))
+        events = []
+        while buffer.qsize():
+            events.append(buffer.get())
+        return events
+
+    def test_drop(self):
+        """Test the noisy switch being limited and the quiet one not."""
+        self.connect(RateLimits(message_rates={'packet_in': 10}))
+        self.drain(self.buffers.raw)
+
+        for _ in range(10):
+            self.protocols['noisy'].data_received(PACKET_IN * 20)
+            self.protocols['quiet'].data_received(PACKET_IN)
+        quiet = self.protocols['quiet'].connection
+        self.loop.run_until_complete(asyncio.sleep(0))
+        raw_events = self.drain(self.buffers.raw)
+        app_events = self.drain(self.buffers.app)
+
+        received = {name: sum(len(event.content['new_data'])
+                              for event in raw_events
+                              if event.source is protocol.connection)
+                    for name, protocol in self.protocols.items()}
+        self.assertEqual(received['quiet'], 10 * len(PACKET_IN))
+        self.assertLess(received['noisy'], 12 * len(PACKET_IN))
+        self.assertEqual([event.name for event in app_events],
+                         ['kytos/core.connection.rate_limited'])
+        self.assertIsNot(app_events[0].source, quiet)
+        self.assertEqual(app_events[0].content['action'], 'drop')
+
+    def test_pause(self):
+        """Test only the noisy switch not being read for a while."""
+        self.connect(RateLimits(rate=100, burst=10, action='pause'))
+
+        self.protocols['noisy'].data_received(PACKET_IN * 20)
+        self.protocols['quiet'].data_received(PACKET_IN * 5)
+
+        noisy = self.protocols['noisy'].transport
+        self.assertFalse(noisy.is_reading())
+        self.assertTrue(self.protocols['quiet'].transport.is_reading())
+
+        self.loop.run_until_complete(asyncio.sleep(0.15))
+
+        self.assertTrue(noisy.is_reading())
@@ -0,0 +1,169 @@
+"""Test kytos.core.tracing module."""
+import json
+import os
+import tempfile
+from threading import Event
+from unittest import TestCase
+
+from kytos.core.events import KytosEvent
+from kytos.core.helpers import run_on_thread
+from kytos.core.tracing import EventTracer
+
+
+class FakeNApp:
+    """NApp with one inline and one threaded listener."""
+
+    napp_id = 'kytos/fake'
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.done = Event()
+        self.child = None
+
+    def inline(self, event):
+        """Create a new event, as of_core does with raw events."""
+        self.child = KytosEvent('kytos/fake.child')
+        self.tracer.enqueued(self.child, 'app_event')
+        if event.name == 'error':
+            raise ValueError('error')
+
+    @run_on_thread
+    def threaded(self, event):
+        """Notify the test that the listener was called."""
+        self.done.set()
+
+
+class TestEventTracer(TestCase):
+    """EventTracer tests."""
+
+    def setUp(self):
+        """Create a tracer sampling all events."""
+        self.tracer = EventTracer(sample_rate=1)
+        self.napp = FakeNApp(self.tracer)
+
+    def trace(self, name='kytos/fake.event'):
+        """Return an event that was added to and removed from a buffer."""
+        event = KytosEvent(name)
+        self.tracer.enqueued(event, 'raw_event')
+        self.tracer.dequeued(event, 'raw_event')
+        return event
+
+    def test_set_sample_rate(self):
+        """Test the tracer being disabled with a sample rate of 0."""
+        self.assertTrue(self.tracer.enabled)
+
+        self.tracer.set_sample_rate(0)
+
+        self.assertFalse(self.tracer.enabled)
+        with self.assertRaises(ValueError):
+            self.tracer.set_sample_rate(2)
+
+    def test_not_sampled(self):
+        """Test events not traced when they are not sampled."""
+        self.tracer.set_sample_rate(0)
+        event = KytosEvent('kytos/fake.event')
+
+        self.tracer.enqueued(event, 'raw_event')
+        self.tracer.dequeued(event, 'raw_event')
+
+        self.assertIsNone(event.trace)
+        self.assertEqual(self.tracer.get_spans(), [])
+
+    def test_queue_span(self):
+        """Test the span of an event waiting in a buffer."""
+        event = self.trace()
+
+        span, = self.tracer.get_spans()
+        self.assertEqual(span['name'], 'queue raw_event')
+        self.assertEqual(span['attributes'],
+                         {'event': 'kytos/fake.event', 'buffer': 'raw_event'})
+        self.assertIsNone(span['parent_id'])
+        self.assertEqual(event.trace.parent_id, span['span_id'])
+        self.assertLessEqual(span['started_at'], span['finished_at'])
+
+    def test_dispatch(self):
+        """Test child events being part of the trace of their parent."""
+        event = self.trace()
+
+        self.tracer.dispatch(self.napp.inline, event)
+
+        queue_span, listener_span = self.tracer.get_spans()
+        self.assertEqual(listener_span['name'], 'FakeNApp.inline')
+        self.assertEqual(listener_span['attributes']['napp'], 'kytos/fake')
+        self.assertEqual(listener_span['parent_id'], queue_span['span_id'])
+        child_trace = self.napp.child.trace
+        self.assertEqual(child_trace.trace_id, event.trace.trace_id)
+        self.assertEqual(child_trace.parent_id, listener_span['span_id'])
+
+    def test_dispatch__error(self):
+        """Test exceptions being recorded in the listener span."""
+        event = self.trace('error')
+
+        with self.assertRaises(ValueError):
+            self.tracer.dispatch(self.napp.inline, event)
+
+        listener_span = self.tracer.get_spans()[-1]
+        self.assertEqual(listener_span['attributes']['error'],
+                         "ValueError('error')")
+
+    def test_dispatch__threaded(self):
+        """Test threaded listeners being traced inside their thread."""
+        event = self.trace()
+
+        self.tracer.dispatch(self.napp.threaded, event)
+
+        self.assertTrue(self.napp.done.wait(1))
+        for _ in range(100):
+            if len(self.tracer.get_spans()) == 2:
+                break
+            self.napp.done.wait(0.01)
+        self.assertEqual(self.tracer.get_spans()[-1]['name'],
+                         'FakeNApp.threaded')
+
+    def test_to_chrome(self):
+        """Test the Chrome trace event format."""
+        event = self.trace()
+
+        trace_events = self.tracer.to_chrome()['traceEvents']
+
+        self.assertEqual([trace_event['ph'] for trace_event in trace_events],
+                         ['b', 'e'])
+        self.assertEqual(trace_events[0]['id'],
+                         f'{event.trace.trace_id:032x}')
+        self.assertEqual(trace_events[0]['args']['buffer'], 'raw_event')
+
+    def test_to_otlp(self):
+        """Test the OpenTelemetry JSON format."""
+        self.tracer.dispatch(self.napp.inline, self.trace())
+
+        spans = self.tracer.to_otlp()['resourceSpans'][0]['scopeSpans'][0][
+            'spans']
+
+        self.assertEqual(len(spans), 2)
+        self.assertNotIn('parentSpanId', spans[0])
+        self.assertEqual(spans[1]['parentSpanId'], spans[0]['spanId'])
+        self.assertEqual(len(spans[1]['traceId']), 32)
+        self.assertIn({'key': 'kytos.napp',
+                       'value': {'stringValue': 'kytos/fake'}},
+                      spans[1]['attributes'])
+
+    def test_export(self):
+        """Test the spans being written to a file."""
+        self.trace()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'trace.json')
+
+            self.tracer.export(filename, 'otlp')
+
+            with open(filename) as trace_file:
+                self.assertIn('resourceSpans', json.load(trace_file))
+            with self.assertRaises(ValueError):
+                self.tracer.export(filename, 'xml')
+
+    def test_reset(self):
+        """Test reset method."""
+        self.trace()
+
+        self.tracer.reset()
+
+        self.assertEqual(self.tracer.get_spans(), [])
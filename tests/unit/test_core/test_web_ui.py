@@ -0,0 +1,352 @@
+"""Test kytos.core.web_ui module."""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError, URLError
+
+from kytos.core.web_ui import UIAsset, UIAssets, WebUIUpdater
+
+
+# pylint: disable=protected-access
+class TestWebUIUpdater(TestCase):
+    """WebUIUpdater tests."""
+
+    def setUp(self):
+        """Create a temporary dir for the web UI and its cache."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.web_ui_dir = os.path.join(self.tmp_dir.name, 'web-ui')
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        self.updater = WebUIUpdater(self.web_ui_dir, self.cache_dir,
+                                    bundles_dir=self.tmp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary dir."""
+        self.tmp_dir.cleanup()
+
+    def create_bundle(self, name='bundle.zip', content=b'<html></html>'):
+        """Create a web UI bundle with an index.html file."""
+        path = os.path.join(self.tmp_dir.name, name)
+        with zipfile.ZipFile(path, 'w') as bundle:
+            bundle.writestr('index.html', content)
+        return path
+
+    def read_index(self):
+        """Return the installed index.html content."""
+        with open(os.path.join(self.web_ui_dir, 'index.html'), 'rb') as index:
+            return index.read()
+
+    @staticmethod
+    def mock_latest_release(mock_urlopen, version='1.0'):
+        """Make urlopen return a latest release response."""
+        response = MagicMock()
+        response.readlines.return_value = [json.dumps({'tag_name': version})]
+        mock_urlopen.return_value = response
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    @patch('kytos.core.web_ui.urlopen')
+    def test_update(self, *args):
+        """Test update method downloading and caching a bundle."""
+        (mock_urlopen, mock_urlretrieve) = args
+        self.mock_latest_release(mock_urlopen)
+        mock_urlretrieve.return_value = (self.create_bundle(), None)
+
+        response = self.updater.update()
+
+        url = 'https://github.com/kytos/ui/releases/download/1.0/latest.zip'
+        mock_urlretrieve.assert_called_with(url)
+        self.assertEqual(response, 'updated the web ui')
+        self.assertEqual(self.read_index(), b'<html></html>')
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir,
+                                                    '1.0.zip.sha256')))
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    def test_update__cached(self, mock_urlretrieve):
+        """Test update method using a cached bundle."""
+        mock_urlretrieve.return_value = (self.create_bundle(), None)
+        self.updater.update('1.0')
+        os.rename(self.web_ui_dir, self.web_ui_dir + '-old')
+
+        response = self.updater.update('1.0')
+
+        self.assertEqual(response, 'updated the web ui')
+        mock_urlretrieve.assert_called_once()
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    def test_update__corrupted_cache(self, mock_urlretrieve):
+        """Test update method discarding a cached bundle."""
+        mock_urlretrieve.side_effect = [(self.create_bundle(), None),
+                                        (self.create_bundle(), None)]
+        self.updater.update('1.0')
+        with open(os.path.join(self.cache_dir, '1.0.zip'), 'ab') as bundle:
+            bundle.write(b'garbage')
+
+        self.updater.update('1.0')
+
+        self.assertEqual(mock_urlretrieve.call_count, 2)
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    def test_update__replace(self, mock_urlretrieve):
+        """Test update method swapping an installed web UI."""
+        os.mkdir(self.web_ui_dir)
+        mock_urlretrieve.return_value = (self.create_bundle(), None)
+
+        self.updater.update('1.0')
+
+        backups = [name for name in os.listdir(self.tmp_dir.name)
+                   if name.startswith('web-ui-')]
+        self.assertEqual(len(backups), 1)
+        self.assertEqual(self.read_index(), b'<html></html>')
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    def test_update__on_installed(self, mock_urlretrieve):
+        """Test update method calling on_installed after installing."""
+        self.updater.on_installed = MagicMock()
+        mock_urlretrieve.return_value = (self.create_bundle(), None)
+
+        self.updater.update('1.0')
+
+        self.updater.on_installed.assert_called_once_with()
+
+    def test_update__installed(self):
+        """Test update method when not forced and UI is installed."""
+        os.mkdir(self.web_ui_dir)
+
+        response = self.updater.update(force=False)
+
+        self.assertEqual(response, 'web ui already installed')
+
+    def test_update__bundle(self):
+        """Test update method installing a local bundle."""
+        bundle = self.create_bundle(content=b'local')
+        with open(bundle, 'rb') as data:
+            sha256 = hashlib.sha256(data.read()).hexdigest()
+
+        response = self.updater.update(bundle=bundle, sha256=sha256)
+
+        self.assertEqual(response, 'updated the web ui')
+        self.assertEqual(self.read_index(), b'local')
+
+    def test_update__bundle_checksum_mismatch(self):
+        """Test update method with a local bundle and a wrong checksum."""
+        bundle = self.create_bundle()
+
+        response = self.updater.update(bundle=bundle, sha256='0' * 64)
+
+        self.assertEqual(response, f'Bundle {bundle} checksum mismatch.')
+        self.assertFalse(os.path.exists(self.web_ui_dir))
+
+    def test_update__bundle_without_checksum(self):
+        """Test update method with a local bundle and no checksum."""
+        bundle = self.create_bundle()
+
+        response = self.updater.update(bundle=bundle)
+
+        self.assertEqual(response,
+                         f'Bundle {bundle} requires its sha256 checksum.')
+        self.assertFalse(os.path.exists(self.web_ui_dir))
+
+    def test_update__bundle_outside_bundles_dir(self):
+        """Test update method with a local bundle in another directory."""
+        bundle = os.path.join(self.tmp_dir.name, '..', 'bundle.zip')
+
+        response = self.updater.update(bundle=bundle, sha256='0' * 64)
+
+        self.assertEqual(response, f'Bundle {bundle} is not in '
+                                   f'{self.tmp_dir.name}.')
+        self.updater.bundles_dir = None
+        self.assertEqual(self.updater.update(bundle=bundle, sha256='0' * 64),
+                         'Local bundles are not accepted.')
+
+    def test_update__invalid_version(self):
+        """Test update method with a version that is not a release tag."""
+        response = self.updater.update('../../etc')
+
+        self.assertEqual(response, 'Invalid version ../../etc.')
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    @patch('kytos.core.web_ui.urlopen')
+    def test_update__http_error(self, *args):
+        """Test update method to http error case."""
+        (mock_urlopen, mock_urlretrieve) = args
+        self.mock_latest_release(mock_urlopen)
+        mock_urlretrieve.side_effect = HTTPError('url', 123, 'msg', 'hdrs',
+                                                 MagicMock())
+
+        response = self.updater.update()
+
+        expected_response = 'Uri not found https://github.com/kytos/ui/' + \
+                            'releases/download/1.0/latest.zip.'
+        self.assertEqual(response, expected_response)
+
+    @patch('kytos.core.web_ui.urlretrieve')
+    @patch('kytos.core.web_ui.urlopen')
+    def test_update__zip_error(self, *args):
+        """Test update method to error case in zip file."""
+        (mock_urlopen, mock_urlretrieve) = args
+        self.mock_latest_release(mock_urlopen)
+        path = os.path.join(self.tmp_dir.name, 'broken.zip')
+        with open(path, 'wb') as broken:
+            broken.write(b'not a zip file')
+        mock_urlretrieve.return_value = (path, None)
+
+        response = self.updater.update()
+
+        expected_response = 'Zip file from https://github.com/kytos/ui/' + \
+                            'releases/download/1.0/latest.zip is corrupted.'
+        self.assertEqual(response, expected_response)
+
+    @patch('kytos.core.web_ui.urlopen', side_effect=URLError('offline'))
+    @patch('kytos.core.web_ui.urlretrieve', side_effect=URLError('offline'))
+    def test_start(self, *_):
+        """Test start method running the update in background."""
+        self.assertTrue(self.updater.start())
+        self.updater.join()
+
+        self.assertEqual(self.updater.status['state'], 'failed')
+        self.assertEqual(self.updater.status['version'], '1.1.1')
+        self.assertIsNotNone(self.updater.status['finished_at'])
+
+    def test_start__running(self):
+        """Test start method when an update is already running."""
+        self.updater._thread = MagicMock()
+        self.updater._thread.is_alive.return_value = True
+
+        self.assertFalse(self.updater.start())
+
+
+class TestUIAsset(TestCase):
+    """UIAsset tests."""
+
+    def setUp(self):
+        """Create a temporary file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'main.js')
+
+    def tearDown(self):
+        """Remove the temporary dir."""
+        self.tmp_dir.cleanup()
+
+    def create_asset(self, content):
+        """Write ``content`` to the asset file and return an UIAsset."""
+        with open(self.path, 'wb') as asset_file:
+            asset_file.write(content)
+        return UIAsset(self.path)
+
+    def test_get(self):
+        """Test get method returning the gzip version."""
+        asset = self.create_asset(b'console.log(1);' * 100)
+
+        content, encoding, etag = asset.get(['gzip'])
+
+        self.assertEqual(gzip.decompress(content), b'console.log(1);' * 100)
+        self.assertEqual(encoding, 'gzip')
+        self.assertTrue(etag.endswith('-gzip'))
+        self.assertIn(asset.mimetype, ('application/javascript',
+                                       'text/javascript'))
+
+    def test_get__identity(self):
+        """Test get method when the client accepts no encoding."""
+        asset = self.create_asset(b'console.log(1);' * 100)
+
+        content, encoding, etag = asset.get()
+
+        self.assertEqual(content, b'console.log(1);' * 100)
+        self.assertIsNone(encoding)
+        self.assertNotEqual(etag, asset.get(['gzip'])[2])
+
+    def test_get__small_file(self):
+        """Test get method not compressing small files."""
+        asset = self.create_asset(b'1;')
+
+        self.assertEqual(asset.get(['br', 'gzip'])[:2], (b'1;', None))
+
+    def test_get__cached(self):
+        """Test get method reading the file only once."""
+        asset = self.create_asset(b'1;')
+        asset.get()
+        os.remove(self.path)
+
+        self.assertEqual(asset.get()[0], b'1;')
+
+
+class TestUIAssets(TestCase):
+    """UIAssets tests."""
+
+    def setUp(self):
+        """Create a web UI and NApps UI files in a temporary dir."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.web_ui_dir = os.path.join(self.tmp_dir.name, 'web-ui')
+        self.napps_dir = os.path.join(self.tmp_dir.name, 'napps')
+        os.makedirs(self.web_ui_dir)
+        self.create_file(self.web_ui_dir, 'index.html')
+        self.create_file(self.web_ui_dir, 'dist', 'js', 'app.js')
+        installed = os.path.join(self.napps_dir, '.installed', 'kytos')
+        self.create_file(installed, 'topology', 'ui', 'k-info-panel',
+                         'main.kytos')
+        self.create_file(installed, 'topology', 'ui', 'k-info-panel',
+                         'images', 'logo.png')
+        os.makedirs(os.path.join(self.napps_dir, 'kytos'))
+        os.symlink(os.path.join(installed, 'topology'),
+                   os.path.join(self.napps_dir, 'kytos', 'topology'))
+        self.create_file(self.napps_dir, 'kytos', 'of_core', 'ui',
+                         'k-toolbar', 'main.kytos')
+        self.assets = UIAssets(self.web_ui_dir, self.napps_dir)
+
+    def tearDown(self):
+        """Remove the temporary dir."""
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def create_file(*path):
+        """Create an empty file and its parent dirs."""
+        filename = os.path.join(*path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'w'):
+            pass
+        return filename
+
+    def test_build(self):
+        """Test build method listing enabled NApps UI files."""
+        assets = self.assets.build()
+
+        self.assertEqual(sorted(assets), [
+            'dist/js/app.js',
+            'index.html',
+            'kytos/of_core/k-toolbar/main.kytos',
+            'kytos/topology/k-info-panel/images/logo.png',
+            'kytos/topology/k-info-panel/main.kytos'])
+
+    def test_get(self):
+        """Test get method building the manifest on the first lookup."""
+        asset = self.assets.get('kytos/of_core/k-toolbar/main.kytos')
+
+        self.assertTrue(asset.path.endswith('k-toolbar/main.kytos'))
+        self.assertIsNone(self.assets.get('kytos/of_core/kytos.json'))
+
+    def test_get_components(self):
+        """Test get_components method."""
+        components = self.assets.get_components('all')
+
+        self.assertEqual(components, [
+            {'name': 'kytos-of_core-k-toolbar-main',
+             'url': 'ui/kytos/of_core/k-toolbar/main.kytos'},
+            {'name': 'kytos-topology-k-info-panel-main',
+             'url': 'ui/kytos/topology/k-info-panel/main.kytos'}])
+        self.assertEqual(len(self.assets.get_components('k-toolbar')), 1)
+        self.assertEqual(self.assets.get_components('k-menu-bar'), [])
+
+    def test_invalidate(self):
+        """Test invalidate method rebuilding the manifest."""
+        self.assets.build()
+        self.create_file(self.napps_dir, 'kytos', 'of_core', 'ui',
+                         'k-menu-bar', 'main.kytos')
+        self.assertEqual(self.assets.get_components('k-menu-bar'), [])
+
+        self.assets.invalidate()
+
+        self.assertEqual(len(self.assets.get_components('k-menu-bar')), 1)
@@ -2,9 +2,10 @@
 import logging
 from copy import copy
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 from kytos.core.logs import LogManager
+from kytos.core.websocket import WebSocketHandler
 
 
 class TestWebSocketLog(TestCase):
@@ -20,15 +21,99 @@ class TestWebSocketLog(TestCase):
 
         logging.root.handlers = []
         socket = Mock()
-        LogManager.enable_websocket(socket)
+        handler = LogManager.enable_websocket(socket)
         # Lower logger level simulating logging.ini config
         web_logger = logging.getLogger('werkzeug')
         web_logger.setLevel(logging.DEBUG)
 
         web_logger.info('should not log')
-        self.assertEqual(0, socket.call_count)
+        handler.flush()
+        self.assertEqual(0, socket.emit.call_count)
         web_logger.warning('should log')
-        self.assertEqual(1, socket.emit.call_count)
+        handler.flush()
+        socket.emit.assert_any_call('show logs', ['should log'], room='log')
 
         # Restore original state
+        handler.close()
         logging.root.handlers = handlers_bak
+
+
+# pylint: disable=protected-access
+class TestWebSocketHandler(TestCase):
+    """Test the WebSocketHandler class."""
+
+    def setUp(self):
+        """Create a handler that is only flushed by the tests."""
+        self.socket = Mock()
+        self.handler = WebSocketHandler(self.socket, interval=60,
+                                        max_queue=2)
+        self.addCleanup(self.handler.close)
+
+    @staticmethod
+    def get_record(msg, level=logging.INFO):
+        """Return a log record."""
+        return logging.LogRecord('kytos', level, __file__, 1, msg, None,
+                                 None)
+
+    def test_emit(self):
+        """Test emit not sending the record before the batch is flushed."""
+        self.handler.emit(self.get_record('line'))
+
+        self.socket.emit.assert_not_called()
+        self.assertTrue(self.handler._thread.daemon)
+
+    def test_emit__mutable_argument(self):
+        """Test the message having the arguments of the logging call."""
+        switches = ['00:01']
+        record = logging.LogRecord('kytos', logging.INFO, __file__, 1,
+                                   'switches: %s', (switches,), None)
+        self.handler.emit(record)
+        switches.append('00:02')
+
+        self.handler.flush()
+
+        self.socket.emit.assert_any_call('show logs', ["switches: ['00:01']"],
+                                         room='log')
+
+    def test_flush(self):
+        """Test records being sent in one message per room."""
+        self.handler.emit(self.get_record('first\nsecond', logging.DEBUG))
+        self.handler.emit(self.get_record('third', logging.ERROR))
+
+        self.handler.flush()
+
+        self.socket.emit.assert_has_calls([
+            call('show logs', ['first', 'second', 'third'], room='log'),
+            call('show logs', ['first', 'second', 'third'],
+                 room='log:DEBUG'),
+            call('show logs', ['third'], room='log:INFO'),
+            call('show logs', ['third'], room='log:WARNING'),
+            call('show logs', ['third'], room='log:ERROR')])
+        self.assertEqual(self.socket.emit.call_count, 5)
+
+    def test_flush__empty(self):
+        """Test flush not sending empty batches."""
+        self.handler.flush()
+
+        self.socket.emit.assert_not_called()
+
+    def test_dropped(self):
+        """Test records being dropped when the queue is full."""
+        for index in range(5):
+            self.handler.emit(self.get_record(f'line {index}'))
+
+        self.handler.flush()
+
+        self.assertEqual(self.handler.dropped, 3)
+        self.socket.emit.assert_any_call(
+            'show logs', ['line 0', 'line 1', '3 log records were dropped.'],
+            room='log')
+
+    def test_close(self):
+        """Test close sending the remaining records."""
+        self.handler.emit(self.get_record('last'))
+
+        self.handler.close()
+
+        self.socket.emit.assert_any_call('show logs', ['last'], room='log')
+        self.assertFalse(self.handler._thread.is_alive())
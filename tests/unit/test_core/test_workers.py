@@ -0,0 +1,217 @@
+"""Test kytos.core.workers module."""
+import pickle
+import time
+from argparse import Namespace
+from queue import Queue
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock
+
+from kytos.core.connection import Connection, ConnectionState
+from kytos.core.events import EventListeners, KytosEvent
+from kytos.core.workers import (APP_EVENTS, RAW_EVENTS, WorkerChannel,
+                                WorkerConnection, WorkerPool)
+
+
+class EchoConnection(Connection):
+    """Connection of a worker that forwards back what it is sent."""
+
+    def __init__(self, channel):
+        super().__init__('10.0.0.1', 40000, None)
+        self.protocol.name = 'openflow'
+        self.channel = channel
+
+    def send(self, buffer):
+        self.channel.forward_raw(KytosEvent(
+            'kytos/core.openflow.raw.in',
+            {'source': self, 'new_data': buffer}))
+
+
+def echo_worker(options, channel):
+    """Worker target with one connection echoing what it is sent."""
+    channel.attach(MagicMock(events_listeners=EventListeners()))
+    channel.forward_raw(KytosEvent('kytos/core.openflow.connection.new',
+                                   {'source': EchoConnection(channel)}))
+    time.sleep(options.seconds)
+
+
+def connection_event(name, connection, **content):
+    """Return an event of ``connection``."""
+    return KytosEvent(name, {'source': connection, **content})
+
+
+class TestWorkerChannel(TestCase):
+    """WorkerChannel tests."""
+
+    def setUp(self):
+        """Create a channel with queues in this process."""
+        self.events = Queue()
+        self.commands = Queue()
+        self.channel = WorkerChannel(1, self.events, self.commands)
+        self.connection = Connection('10.0.0.1', 40000, None)
+        self.connection.protocol.name = 'openflow'
+
+    def forwarded(self):
+        """Return the next event forwarded to the coordinator."""
+        return pickle.loads(self.events.get_nowait())
+
+    def test_attach(self):
+        """Test the southbound events being listened to."""
+        controller = MagicMock(events_listeners=EventListeners())
+
+        self.channel.attach(controller)
+        self.addCleanup(self.commands.put, None)
+
+        for pattern in RAW_EVENTS:
+            self.assertEqual(controller.events_listeners[pattern],
+                             [self.channel.forward_raw])
+        for pattern in APP_EVENTS:
+            self.assertEqual(controller.events_listeners[pattern],
+                             [self.channel.forward_app])
+        self.assertTrue(controller.events_listeners.has_listeners(
+            'kytos/core.openflow.raw.in'))
+
+    def test_forward(self):
+        """Test events being forwarded with the id of their connection."""
+        self.channel.forward_raw(connection_event(
+            'kytos/core.openflow.connection.new', self.connection))
+        self.channel.forward_raw(connection_event(
+            'kytos/core.openflow.raw.in', self.connection, new_data=b'a'))
+
+        self.assertEqual(self.channel.connections,
+                         {('10.0.0.1', 40000): self.connection})
+        self.forwarded()
+        self.assertEqual(self.forwarded(),
+                         (1, 'raw', 'kytos/core.openflow.raw.in',
+                          ('10.0.0.1', 40000), 'openflow',
+                          {'new_data': b'a'}))
+
+        self.channel.forward_app(connection_event(
+            'kytos/core.openflow.connection.lost', self.connection))
+
+        self.assertEqual(self.channel.connections, {})
+        self.assertEqual(self.forwarded()[1], 'app')
+
+    def test_forward__not_picklable(self):
+        """Test events with content that cannot be pickled being dropped."""
+        with self.assertLogs('kytos.core.workers', 'WARNING'):
+            self.channel.forward_app(connection_event(
+                'kytos/core.connection.rate_limited', self.connection,
+                limited=lambda: None))
+
+        self.assertTrue(self.events.empty())
+
+    def test_receive(self):
+        """Test the coordinator messages being sent to the connections."""
+        connection = Mock()
+        self.channel.connections[('10.0.0.1', 40000)] = connection
+        self.commands.put(('send', ('10.0.0.1', 40000), b'hello'))
+        self.commands.put(('send', ('10.0.0.2', 40000), b'unknown'))
+        self.commands.put(('close', ('10.0.0.1', 40000), None))
+        self.commands.put(None)
+
+        self.channel._receive()  # pylint: disable=protected-access
+
+        connection.send.assert_called_once_with(b'hello')
+        connection.close.assert_called_once_with()
+
+
+class TestWorkerConnection(TestCase):
+    """WorkerConnection tests."""
+
+    def setUp(self):
+        """Create a connection of worker 1."""
+        self.pool = Mock()
+        self.connection = WorkerConnection('10.0.0.1', 40000, self.pool, 1)
+
+    def test_send(self):
+        """Test messages being routed to the worker."""
+        self.connection.send(b'hello')
+
+        self.pool.send.assert_called_once_with(1, ('10.0.0.1', 40000),
+                                               b'hello')
+
+    def test_close(self):
+        """Test the worker closing the connection."""
+        self.connection.switch = Mock()
+        self.connection.switch.connection = self.connection
+
+        self.connection.close()
+        self.connection.send(b'hello')
+
+        self.pool.close.assert_called_once_with(1, ('10.0.0.1', 40000))
+        self.pool.send.assert_not_called()
+        self.assertEqual(self.connection.state, ConnectionState.FINISHED)
+        self.assertIsNone(self.connection.switch.connection)
+
+
+class TestWorkerPool(TestCase):
+    """WorkerPool tests."""
+
+    def setUp(self):
+        """Create a pool with one worker."""
+        self.pool = WorkerPool(2, echo_worker)
+        self.options = Namespace(foreground=True, seconds=60)
+        self.controller = MagicMock()
+        self.controller.has_listeners.return_value = True
+
+    def put_event(self, name, **content):
+        """Put an event forwarded by worker 1 in the buffers."""
+        # pylint: disable=protected-access
+        self.pool._put_event(self.controller, 1, 'raw', name,
+                             ('10.0.0.1', 40000), 'openflow', content)
+
+    def test_put_event(self):
+        """Test forwarded events having the same connection as source."""
+        self.put_event('kytos/core.openflow.connection.new')
+        self.put_event('kytos/core.openflow.raw.in', new_data=b'a')
+
+        put = self.controller.buffers.raw.put
+        new, raw_in = [call[0][0] for call in put.call_args_list]
+        self.assertIsInstance(new.source, WorkerConnection)
+        self.assertEqual(new.source.protocol.name, 'openflow')
+        self.assertIs(raw_in.source, new.source)
+        self.assertEqual(raw_in.content['new_data'], b'a')
+
+        self.put_event('kytos/core.openflow.connection.lost')
+
+        self.assertFalse(new.source.is_alive())
+        self.assertEqual(self.pool.connections, {})
+
+    def test_put_event__closed(self):
+        """Test events of connections that are not open being dropped."""
+        self.put_event('kytos/core.openflow.raw.in', new_data=b'a')
+
+        self.controller.buffers.raw.put.assert_not_called()
+
+    def test_round_trip(self):
+        """Test messages to a worker connection reaching the worker."""
+        self.pool.attach(self.controller)
+        self.pool.start(self.options)
+        self.addCleanup(self.pool.stop, 5)
+
+        put = self.controller.buffers.raw.put
+        for _ in range(3000):
+            if put.call_count == 1:
+                break
+            time.sleep(0.01)
+        connection = put.call_args[0][0].source
+        connection.send(b'hello')
+        for _ in range(3000):
+            if put.call_count == 2:
+                break
+            time.sleep(0.01)
+
+        event = put.call_args[0][0]
+        self.assertEqual(event.name, 'kytos/core.openflow.raw.in')
+        self.assertEqual(event.content['new_data'], b'hello')
+        self.assertIs(event.source, connection)
+        self.assertTrue(self.options.foreground)
+
+    def test_stop(self):
+        """Test workers being terminated."""
+        self.pool.start(self.options)
+        self.assertEqual(self.pool.alive(), 1)
+
+        self.pool.stop(timeout=5)
+
+        self.assertEqual(self.pool.alive(), 0)
@@ -0,0 +1,147 @@
+"""Test kytos.lib.switch_emulator module."""
+import asyncio
+import struct
+from unittest import TestCase
+
+from kytos.lib import switch_emulator
+from kytos.lib.switch_emulator import (HEADER, EmulatedSwitch, LatencyStats,
+                                       SwitchEmulator, message)
+
+
+class FakeController(asyncio.Protocol):
+    """Controller side of the handshake, answering echo requests."""
+
+    received = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.rest = b''
+        transport.write(message(switch_emulator.OFPT_HELLO, 1) +
+                        message(switch_emulator.OFPT_FEATURES_REQUEST, 2) +
+                        message(switch_emulator.OFPT_ECHO_REQUEST, 3))
+
+    def data_received(self, data):
+        data = self.rest + data
+        while len(data) >= HEADER.size:
+            _, msg_type, length, xid = HEADER.unpack_from(data)
+            if len(data) < length:
+                break
+            self.received.append(msg_type)
+            if msg_type == switch_emulator.OFPT_ECHO_REQUEST:
+                self.transport.write(
+                    message(switch_emulator.OFPT_ECHO_REPLY, xid))
+            data = data[length:]
+        self.rest = data
+
+
+class TestMessages(TestCase):
+    """Test the OpenFlow messages built by the emulator."""
+
+    def assert_length(self, data, msg_type, length):
+        """Assert the header type and length of a message."""
+        version, header_type, header_length, _ = HEADER.unpack_from(data)
+        self.assertEqual((version, header_type), (4, msg_type))
+        self.assertEqual(header_length, length)
+        self.assertEqual(len(data), length)
+
+    def test_lengths(self):
+        """Test the message lengths defined by the specification."""
+        self.assert_length(switch_emulator.hello(), 0, 16)
+        self.assert_length(switch_emulator.features_reply(1, 1), 6, 32)
+        self.assert_length(switch_emulator.port_status(1, 1, 1), 12, 80)
+        self.assertEqual(len(switch_emulator.port(1, 1)), 64)
+
+    def test_packet_in(self):
+        """Test the PacketIn match and data."""
+        data = switch_emulator.packet_in(1, 3)
+
+        self.assert_length(data, 10, 42 + len(switch_emulator.PACKET_IN_DATA))
+        oxm_header, in_port = struct.unpack_from('!II', data, 28)
+        self.assertEqual((oxm_header, in_port), (0x80000004, 3))
+        self.assertTrue(data.endswith(switch_emulator.PACKET_IN_DATA))
+
+
+class TestEmulatedSwitch(TestCase):
+    """Test the replies of an emulated switch."""
+
+    def setUp(self):
+        """Create a switch with a fake transport."""
+        self.sent = []
+        self.switch = EmulatedSwitch(SwitchEmulator(ports=2), 5)
+        self.switch.transport = type('Transport', (), {
+            'write': lambda _, data: self.sent.append(data)})()
+        self.switch.connected_at = 0
+
+    def test_data_received__partial(self):
+        """Test messages split across reads."""
+        data = (message(switch_emulator.OFPT_BARRIER_REQUEST, 7) +
+                message(switch_emulator.OFPT_FEATURES_REQUEST, 8))
+
+        self.switch.data_received(data[:5])
+        self.switch.data_received(data[5:12])
+        self.switch.data_received(data[12:])
+
+        self.assertEqual([HEADER.unpack_from(sent)[1:4:2]
+                          for sent in self.sent], [(21, 7), (6, 8)])
+        self.assertTrue(self.switch.handshake_done)
+
+    def test_multipart_port_desc(self):
+        """Test the port description reply."""
+        request = message(switch_emulator.OFPT_MULTIPART_REQUEST, 9,
+                          struct.pack('!HH4x', 13, 0))
+
+        self.switch.data_received(request)
+
+        self.assertEqual(len(self.sent[0]), 16 + 2 * 64)
+
+
+class TestSwitchEmulator(TestCase):
+    """Run the emulator against a fake controller."""
+
+    def test_run(self):
+        """Test the handshake, echoes and PacketIns of two switches."""
+        FakeController.received = []
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(
+            loop.create_server(FakeController, '127.0.0.1', 0))
+        port = server.sockets[0].getsockname()[1]
+        emulator = SwitchEmulator(port=port, switches=2, packet_in_rate=200,
+                                  echo_interval=0.05)
+
+        report = loop.run_until_complete(emulator.run(0.3))
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+
+        self.assertEqual(report['switches_connected'], 2)
+        self.assertEqual(report['switches_handshaken'], 2)
+        self.assertEqual(report['connect_latency']['count'], 2)
+        self.assertGreater(report['echo_latency']['count'], 0)
+        self.assertIn(switch_emulator.OFPT_PACKET_IN, FakeController.received)
+        self.assertGreater(report['messages_sent_per_second'], 0)
+
+    def test_run__refused(self):
+        """Test connection errors being counted."""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        emulator = SwitchEmulator(port=1, switches=1)
+
+        report = loop.run_until_complete(emulator.run(0))
+
+        self.assertEqual(report['connect_errors'], 1)
+        self.assertEqual(report['switches_connected'], 0)
+
+
+class TestLatencyStats(TestCase):
+    """Test LatencyStats."""
+
+    def test_as_dict(self):
+        """Test the percentiles in milliseconds."""
+        stats = LatencyStats()
+        for sample in range(1, 101):
+            stats.add(sample / 1000)
+
+        self.assertEqual(stats.as_dict(), {'count': 100, 'p50_ms': 50,
+                                           'p99_ms': 99, 'max_ms': 100})
+        self.assertIsNone(LatencyStats().as_dict()['p50_ms'])